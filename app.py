@@ -1,85 +1,418 @@
 #!/usr/bin/env python3
 
 import sys
+import threading
 from contextlib import ExitStack
 from audio import AudioManager
+from logs import get_logger, set_session
 from text_typing import TypeController
+from timeline import SessionTimeline, TimelineWriter
 from transcription import TranscriptionHandler
+from typing_worker import TypingWorker
+
+CUE_TIMEOUT = 1.0  # seconds to wait at most for the start cue to finish playing
+
+log = get_logger("app")
 
 
 class WhisperTyperApp:
     """Main application class with proper resource management"""
     
-    def __init__(self, model_name="base", silence_threshold=4, server_mode=False):
+    def __init__(self, model_name="base", silence_threshold=4, server_mode=False,
+                 audio_source=None, output=None, timeline_path=None, warmup=False, wait_for_cue=True,
+                 recording_mode="auto", endpointer=None, autotune_path=None, adaptive_realtime=False,
+                 realtime_mode="full", long_dictation=False, spill_dir=None, compute_type=None):
         self.model_name = model_name
         self.silence_threshold = silence_threshold
         self.server_mode = server_mode
+        self.audio_source = audio_source  # None captures the microphone
+        self.output = output  # Output backend or backend name; None types into the focused window
+        self.timeline_path = timeline_path  # JSONL file for session timelines, None to disable
+        self.timeline_writer = None
+        self.timeline = None  # Timeline of the current (or last) session
+        self.warmup = warmup  # Run a synthetic pass through all models before the first session
+        self.warmup_timeline = None
+        self.wait_for_cue = wait_for_cue  # Start capturing the microphone only after the start cue
+        self.recording_mode = recording_mode  # How sessions end (auto, toggle, push); recorded on timelines
+        self.endpointer = endpointer  # AdaptiveEndpointer choosing the silence threshold, None for fixed
+        self.autotune_path = autotune_path  # Calibration profile file; its choice overrides model_name
+        self.adaptive_realtime = adaptive_realtime  # Pace realtime passes by inference time and load
+        self.pacer = None
+        self.realtime_mode = realtime_mode  # full or tail (decode only the uncommitted tail window)
+        self.tail_transcriber = None
+        self.long_dictation = long_dictation  # Finalize long sessions segment by segment at pauses
+        self.spill_dir = spill_dir  # Keep finalized long-dictation audio here as FLAC, None to release it
+        self.segmenter = None
+        self.compute_type = compute_type  # None uses the device default (or the calibration profile's)
+        self.session_lock = threading.Lock()
+        self.recording_started = False
+        self.stop_requested = False
+        self.session_count = 0
         self.audio_manager = None
         self.type_controller = None
+        self.typing_worker = None  # Output thread that applies realtime updates
         self.transcription_handler = None
         self.recorder = None  # Always create persistent recorder
+        self.aborted = False
     
     def __enter__(self):
         """Initialize all components as context manager"""
         self.audio_manager = AudioManager()
-        self.type_controller = TypeController()
+        if self.timeline_path:
+            self.timeline_writer = TimelineWriter(self.timeline_path)
+        self.type_controller = TypeController(output=self.output)
+        self.typing_worker = TypingWorker(self.type_controller)
         self.transcription_handler = TranscriptionHandler(
             self.model_name, 
-            self.silence_threshold
+            self.silence_threshold,
+            adaptive_realtime=self.adaptive_realtime,
+            realtime_mode=self.realtime_mode,
+            compute_type=self.compute_type
         )
+        if self.autotune_path:
+            self._apply_tuned_profile()
         
         # Always initialize persistent recorder (unified architecture)
-        print("Initializing persistent recorder...")
-        self.recorder = self.transcription_handler.create_recorder(
-            on_realtime_transcription_callback=self.type_controller.type_text_realtime,
-            on_recording_stop_callback=self.on_recording_stop
-        )
-        print(f"✅ {self.model_name} model loaded")
-        # Pre-initialize the recorder's model
-        self.recorder.__enter__()
+        log.info("Initializing persistent recorder...")
+        self._create_recorder()
+        log.info("✅ %s model loaded", self.model_name)
+        
+        if self.warmup:
+            self.warm_up()
+        
+        if self.audio_source:
+            self.audio_source.attach(self.recorder)
             
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Clean up all resources"""
+        if self.audio_source:
+            self.audio_source.close()
+        
+        if self.tail_transcriber:
+            self.tail_transcriber.close()
+        if self.segmenter:
+            self.segmenter.close()
+        
         # Clean up persistent recorder (always present now)
         if self.recorder:
             try:
                 self.recorder.__exit__(exc_type, exc_val, exc_tb)
             except Exception as e:
-                print(f"⚠️ Recorder cleanup error: {e}")
+                log.warning("⚠️ Recorder cleanup error: %s", e)
         
         if self.audio_manager:
             self.audio_manager.cleanup()
+        
+        if self.typing_worker:
+            self.typing_worker.close()
+        
+        if self.type_controller:
+            self.type_controller.output.close()
+        
+        if self.timeline_writer:
+            self.timeline_writer.close()
         return False
     
+    def _create_recorder(self):
+        """Create the recorder and load its models"""
+        self.recorder = self.transcription_handler.create_recorder(
+            on_realtime_transcription_callback=self.on_realtime_transcription,
+            on_recording_stop_callback=self.on_recording_stop,
+            use_microphone=self.audio_source is None,
+            on_vad_start_callback=self.on_voice_start,
+            on_vad_stop_callback=self.on_voice_stop
+        )
+        self.pacer = self.transcription_handler.pacer if self.adaptive_realtime else None
+        # Pre-initialize the recorder's model
+        self.recorder.__enter__()
+        if self.realtime_mode == "tail":
+            self.tail_transcriber = self.transcription_handler.create_tail_transcriber(
+                self.recorder, self.on_realtime_transcription)
+        if self.long_dictation:
+            self.segmenter = self.transcription_handler.create_segment_committer(
+                self.recorder, self.typing_worker.submit, spill_dir=self.spill_dir,
+                on_cut=self.tail_transcriber.restart if self.tail_transcriber else None)
+    
+    @property
+    def loaded(self):
+        """Whether the models are resident"""
+        return self.recorder is not None
+    
+    def unload(self):
+        """Release the recorder and its models while idle; the next session loads them again"""
+        if not self.recorder:
+            return
+        import gc
+        from process_stats import rss_mb  # Deferred: only needed with idle unloading
+        
+        timeline = SessionTimeline(kind="unload", model=self.model_name)
+        rss_before = rss_mb()
+        with timeline.span("model_unload"):
+            if self.audio_source:
+                self.audio_source.suspend()
+            try:
+                self.recorder.__exit__(None, None, None)  # Also ends the transcription worker process
+            except Exception as e:
+                log.warning("⚠️ Recorder cleanup error: %s", e)
+            self.recorder = None
+            if self.tail_transcriber:
+                self.tail_transcriber.close()
+                self.tail_transcriber = None
+            if self.segmenter:
+                self.segmenter.close()
+                self.segmenter = None
+            gc.collect()
+            if self.transcription_handler.device == "cuda":
+                import torch
+                torch.cuda.empty_cache()
+        rss_after = rss_mb()
+        timeline.mark("unloaded", rss_before_mb=round(rss_before, 1), rss_after_mb=round(rss_after, 1))
+        log.info("💤 Model unloaded (RSS %.0fMB → %.0fMB)", rss_before, rss_after, extra={"event": "model_unload"})
+        
+        if self.timeline_writer:
+            self.timeline_writer.write(timeline)
+    
+    def _reload(self):
+        """Load the models again after unload(), timed on the session timeline"""
+        from process_stats import rss_mb  # Deferred: only needed with idle unloading
+        
+        log.info("⏳ Reloading model...")
+        self.timeline.attributes["reloaded"] = True
+        with self.timeline.span("model_reload"):
+            self._create_recorder()
+            if self.audio_source:
+                self.audio_source.attach(self.recorder)
+        self.timeline.mark("model_loaded", rss_mb=round(rss_mb(), 1))
+        reload_ms = self.timeline.metrics()["model_reload_ms"]
+        log.info("✅ %s model reloaded in %.0fms", self.model_name, reload_ms,
+                 extra={"event": "model_reload", "duration_ms": reload_ms})
+    
+    def warm_up(self):
+        """Pay first-use initialization costs before the first real session"""
+        from warmup import synthetic_audio, warm_up_recorder  # Deferred: pulls in numpy
+        
+        log.info("🔥 Warming up models...")
+        self.warmup_timeline = SessionTimeline(kind="warmup", model=self.model_name)
+        stages = warm_up_recorder(self.recorder, self.warmup_timeline)
+        if self.tail_transcriber:
+            with self.warmup_timeline.span("warmup_tail"):
+                self.tail_transcriber.warm_up(synthetic_audio().astype("float32") / 32768)
+            stages.append("warmup_tail")
+        self.warmup_timeline.mark("warmup_done", stages=stages)
+        warmup_ms = self.warmup_timeline.last("warmup_done")
+        log.info("✅ Warm-up complete in %.0fms", warmup_ms, extra={"event": "warmup", "duration_ms": warmup_ms})
+        
+        if self.timeline_writer:
+            self.timeline_writer.write(self.warmup_timeline)
+    
+    def _apply_tuned_profile(self):
+        """Use the configuration whisper-typer-calibrate.py chose for this machine"""
+        from autotune import load_profile  # Deferred: only needed with a profile
+        choice = load_profile(self.autotune_path, self.transcription_handler.device)
+        if not choice:
+            log.info("💡 No calibration profile for this machine, run whisper-typer-calibrate.py")
+            return
+        if self.compute_type:
+            choice = dict(choice, compute_type=self.compute_type)  # An explicit compute type wins
+        if choice["model"] != self.model_name:
+            log.warning("⚙️ Calibration profile overrides the configured model %s "
+                        "(set AUTOTUNE_PROFILE = None to keep it)", self.model_name)
+        self.transcription_handler.apply_profile(choice)
+        self.model_name = choice["model"]
+        log.info("⚙️ Tuned profile: %s (%s, %s threads, beam %s, RTF %.2f)", choice["model"], choice["compute_type"],
+                 choice["cpu_threads"] or "auto", choice["beam_size"], choice["rtf"])
+    
+    def _mark(self, event, **fields):
+        """Record an event on the current session timeline"""
+        if self.timeline:
+            self.timeline.mark(event, **fields)
+    
+    def on_realtime_transcription(self, text):
+        """Callback for stabilized realtime transcription updates"""
+        if self.segmenter:
+            # The recorder only sees the current segment; prepend the ones already cut
+            text = self.segmenter.on_realtime_text(text)
+            if text is None:
+                return
+        self._mark("realtime_stabilized", chars=len(text) if text else 0)
+        if self.endpointer and self.endpointer.on_realtime_text(text):
+            self._mark("endpoint", threshold=self.endpointer.current_threshold)
+        self.typing_worker.submit(text)
+    
+    def on_voice_start(self):
+        """Callback when the VAD detects the first voiced frame"""
+        self._mark("voice_start")
+        if self.endpointer:
+            self.endpointer.on_voice_start()
+        if self.pacer:
+            self.pacer.on_voice_start()
+        if self.segmenter:
+            self.segmenter.on_voice_start()
+    
+    def on_voice_stop(self):
+        """Callback when the VAD detects the end of voice activity"""
+        self._mark("voice_stop")
+        if self.endpointer:
+            self.endpointer.on_voice_stop()
+        if self.pacer:
+            self.pacer.on_voice_stop()
+        if self.segmenter:
+            self.segmenter.on_voice_stop()
+    
     def on_recording_stop(self):
         """Callback when recording stops"""  
-        print("\n🔇 Recording stopped")
+        self._mark("recording_stop")
+        if self.pacer:
+            self.pacer.on_final_pending()
+        log.info("\n🔇 Recording stopped", extra={"event": "recording_stop"})
         self.audio_manager.play_audio_file("off.wav")
     
-    def record_once(self):
-        """Record a single session using the persistent recorder"""
-        if not self.recorder:
+    def record_once(self, hotkey_time=None):
+        """Record a single session using the persistent recorder
+
+        hotkey_time is the time.perf_counter() value at which the session was
+        requested; session timeline offsets are measured from it.
+        """
+        if not self.transcription_handler:
             raise RuntimeError("record_once() called before recorder initialization")
         
+        self.session_count += 1
+        self.timeline = SessionTimeline(
+            hotkey_time,
+            model=self.model_name,
+            silence_threshold=self.silence_threshold,
+            server_mode=self.server_mode,
+            session_index=self.session_count,
+            recording_mode=self.recording_mode,
+            adaptive_endpointing=self.endpointer is not None,
+            warmed_up=self.warmup_timeline is not None,
+        )
+        self.timeline.mark("hotkey")
+        set_session(self.timeline.session_id)
+        if not self.recorder and self.audio_source:
+            # Start capturing before the models are back, so speech during the reload is kept
+            self.audio_source.resume()
+        
         # Reset typing state for new session
-        self.type_controller.reset()
+        self.type_controller.reset(self.timeline)
+        self.typing_worker.begin_session()
+        self.aborted = False
+        with self.session_lock:
+            self.recording_started = False
+            self.stop_requested = False
+        endpointing = False
         
         try:
-            print(f"🎤 Recording... (will auto-stop after {self.silence_threshold}s of silence)")
-            self.audio_manager.play_audio_file("on.wav")
+            if self.recording_mode == "push":
+                log.info("🎤 Recording... (release the hotkey to finish)")
+            elif self.recording_mode == "toggle":
+                log.info("🎤 Recording... (press the hotkey again to finish)")
+            else:
+                log.info("🎤 Recording... (will auto-stop after %ss of silence)", self.silence_threshold)
+            self.timeline.mark("cue_start")
+            cue_done = self.audio_manager.play_audio_file("on.wav")
+            if not self.recorder:
+                self._reload()
+            if self.pacer:
+                self.pacer.begin_session(self.timeline)
+            if self.endpointer:
+                truncated = self.endpointer.begin_session(self.recorder)
+                endpointing = True
+                self.timeline.attributes["silence_threshold"] = self.endpointer.base_threshold
+                self.timeline.mark("endpoint", threshold=self.endpointer.base_threshold,
+                                   previous_truncated=truncated)
+            if self.wait_for_cue and not getattr(self.audio_source, "preroll_seconds", 0):
+                # Keep the cue out of the recording (and out of the VAD); a pre-roll
+                # source is already capturing, so it keeps what was said over the cue
+                cue_done.wait(CUE_TIMEOUT)
+                self.timeline.mark("cue_done")
             
             # Start recording using persistent recorder
+            self.timeline.mark("recording_start")
             self.recorder.start()
-            final_text = self.recorder.text()
+            with self.session_lock:
+                self.recording_started = True
+                if self.stop_requested:
+                    self.recorder.stop()  # Stop arrived while the start cue was playing
+            if self.audio_source:
+                self.audio_source.start_session()
+            if self.tail_transcriber:
+                self.tail_transcriber.begin_session(self.timeline)
+            if self.segmenter:
+                self.segmenter.begin_session(self.timeline)
+            
+            try:
+                with self.transcription_handler.final_pass():
+                    final_text = self.recorder.text()
+                if self.segmenter:
+                    final_text = self.segmenter.finish(final_text)
+            finally:
+                if self.tail_transcriber:
+                    self.tail_transcriber.end_session()
+                if self.segmenter:
+                    self.timeline.mark("segment_stats", **self.segmenter.session_stats())
+                    self.segmenter.end_session()
+                if self.audio_source:
+                    self.audio_source.stop_session()
+            
+            scheduler = self.transcription_handler.scheduler
+            self.timeline.mark(
+                "final_text",
+                chars=len(final_text) if final_text else 0,
+                scheduler_wait_ms=round(scheduler.stats["last_final_wait_ms"], 2) if scheduler else None,
+            )
             
-            # Ensure final text is typed
-            self.type_controller.type_text_realtime(final_text)
+            if self.aborted:
+                self.typing_worker.discard()
+                self.timeline.mark("aborted")
+                log.info("\n🛑 Recording aborted", extra={"event": "aborted"})
+                return
             
-            print(f"\n✅ Complete transcription: '{final_text}'")
+            # Ensure final text is typed, superseding any realtime update still pending
+            self.typing_worker.submit_final(final_text)
+            self.typing_worker.flush()
+            self.timeline.mark("final_typed")
+            
+            log.info("\n✅ Complete transcription: '%s'", final_text,
+                     extra={"event": "final_text", "duration_ms": self.timeline.metrics().get("stop_to_typed_ms")})
             
         except Exception as e:
-            print(f"⚠️ Recording error: {e}")
+            self.timeline.mark("error", message=str(e))
+            log.error("⚠️ Recording error: %s", e, extra={"event": "error"})
             self.audio_manager.play_audio_file("off.wav")
             raise
+        finally:
+            self.typing_worker.flush()
+            self.timeline.mark("typing_stats", **self.typing_worker.stats)
+            if self.pacer:
+                self.timeline.mark("realtime_stats", **self.pacer.session_stats())
+            self.type_controller.finish_session()
+            if endpointing:
+                self.timeline.attributes["endpoint_threshold"] = self.endpointer.current_threshold
+                self.endpointer.end_session()
+            if self.timeline_writer:
+                self.timeline_writer.write(self.timeline)
+            set_session(None)
+    
+    def stop_recording(self, source="control"):
+        """Finalize the current session now instead of waiting for silence
+        
+        `source` (e.g. hotkey, release, control) is recorded on the timeline.
+        """
+        if not self.transcription_handler:
+            return
+        with self.session_lock:
+            if self.stop_requested:
+                return
+            self.stop_requested = True
+            self._mark("stop_requested", source=source)
+            if self.recording_started and self.recorder:
+                self.recorder.stop()
+    
+    def abort_recording(self):
+        """Abort the current session without typing the final transcription"""
+        if self.recorder:
+            self.aborted = True
+            self.recorder.abort()
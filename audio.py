@@ -1,18 +1,48 @@
 #!/usr/bin/env python3
 
-import pyaudio
-import wave
+import queue
 import threading
+import time
+import wave
+from logs import get_logger
+
+log = get_logger(__name__)
+
+CUE_FILES = ("on.wav", "off.wav")
+FRAMES_PER_BUFFER = 256  # ~6ms at 44.1 kHz; the cue starts within one buffer of being requested
+
+
+class _PlayingCue:
+    """A cue being mixed into the output stream"""
+    
+    def __init__(self, samples, done):
+        self.samples = samples
+        self.position = 0
+        self.done = done
 
 
 class AudioManager:
-    """Manages audio playback with pre-initialization and non-blocking operations"""
+    """Plays preloaded cues through one output stream that stays open
+    
+    Opening an output device costs tens of milliseconds, so the stream is
+    opened once at startup in callback mode. Cues are queued to the audio
+    callback, which mixes everything that is playing into each buffer (or
+    silence when nothing is). play_audio_file() returns an event that is set
+    once the cue's last sample has left the speaker.
+    """
     
     def __init__(self):
         self.audio = None
+        self.stream = None
         self.audio_data = {}
+        self.rate = None
+        self.channels = None
+        self.requests = queue.SimpleQueue()  # Cues waiting for the next audio callback
+        self.active = []  # Only touched by the audio callback
+        self.finishing = []  # (monotonic deadline, done event) of cues that were fully written
         self._init_audio_system()
         self._preload_audio_files()
+        self._open_stream()
     
     def __enter__(self):
         """Context manager entry"""
@@ -26,56 +56,132 @@ class AudioManager:
     def _init_audio_system(self):
         """Initialize PyAudio once at startup"""
         try:
+            import pyaudio  # Deferred so importing the app stays cheap
+            self.pyaudio = pyaudio
             self.audio = pyaudio.PyAudio()
         except Exception as e:
-            print(f"Warning: Could not initialize audio system: {e}")
+            log.warning("Warning: Could not initialize audio system: %s", e)
             self.audio = None
     
     def _preload_audio_files(self):
-        """Preload audio files into memory"""
-        for filename in ["on.wav", "off.wav"]:
+        """Preload cues as int16 samples in the format of the first cue"""
+        import numpy as np  # Deferred so importing the app stays cheap
+        self.np = np
+        
+        for filename in CUE_FILES:
             try:
                 with wave.open(filename, 'rb') as wf:
-                    self.audio_data[filename] = {
-                        'frames': wf.readframes(wf.getnframes()),
-                        'format': self.audio.get_format_from_width(wf.getsampwidth()) if self.audio else None,
-                        'channels': wf.getnchannels(),
-                        'rate': wf.getframerate()
-                    }
+                    if wf.getsampwidth() != 2:
+                        raise ValueError("only 16-bit cues are supported")
+                    samples = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+                    channels, rate = wf.getnchannels(), wf.getframerate()
+                
+                if self.rate is None:
+                    self.rate, self.channels = rate, channels
+                self.audio_data[filename] = self._convert(samples, channels, rate)
             except Exception as e:
-                print(f"Warning: Could not preload audio file {filename}: {e}")
+                log.warning("Warning: Could not preload audio file %s: %s", filename, e)
     
-    def play_audio_file(self, filename):
-        """Play audio file non-blocking using threading"""
-        if not self.audio or filename not in self.audio_data:
-            return
-        
-        # Start playback in a separate thread to avoid blocking
-        thread = threading.Thread(target=self._play_audio_thread, args=(filename,))
-        thread.daemon = True
-        thread.start()
+    def _convert(self, samples, channels, rate):
+        """Convert interleaved int16 samples to the stream's channels and rate"""
+        np = self.np
+        frames = samples.reshape(-1, channels).astype(np.float32)
+        if channels != self.channels:
+            frames = np.repeat(frames.mean(axis=1, keepdims=True), self.channels, axis=1)
+        if rate != self.rate:
+            positions = np.arange(int(len(frames) * self.rate / rate)) * rate / self.rate
+            frames = np.stack([np.interp(positions, np.arange(len(frames)), frames[:, c])
+                               for c in range(self.channels)], axis=1)
+        return frames.astype(np.int16).reshape(-1)
     
-    def _play_audio_thread(self, filename):
-        """Internal method to play audio in a separate thread"""
+    def _open_stream(self):
+        """Open the shared output stream; cues are silent if this fails"""
+        if not self.audio or not self.audio_data:
+            return
         try:
-            audio_info = self.audio_data[filename]
-            
-            stream = self.audio.open(
-                format=audio_info['format'],
-                channels=audio_info['channels'],
-                rate=audio_info['rate'],
-                output=True
+            self.stream = self.audio.open(
+                format=self.pyaudio.paInt16,
+                channels=self.channels,
+                rate=self.rate,
+                output=True,
+                frames_per_buffer=FRAMES_PER_BUFFER,
+                stream_callback=self._callback,
             )
-            
-            # Play the preloaded audio data
-            stream.write(audio_info['frames'])
-            
-            stream.stop_stream()
-            stream.close()
+            self.stream.start_stream()
         except Exception as e:
-            print(f"Warning: Could not play audio file {filename}: {e}")
+            log.warning("Warning: Could not open audio output: %s", e)
+            self.stream = None
+    
+    def play_audio_file(self, filename):
+        """Start playing a preloaded cue without blocking
+        
+        Returns a threading.Event that is set once the cue has finished
+        playing (immediately if it cannot be played).
+        """
+        done = threading.Event()
+        if not self.stream or filename not in self.audio_data:
+            done.set()
+            return done
+        
+        self.requests.put(_PlayingCue(self.audio_data[filename], done))
+        return done
+    
+    def _callback(self, in_data, frame_count, time_info, status):
+        """Mix all playing cues into the next output buffer (audio thread)"""
+        np = self.np
+        now = time.monotonic()
+        while True:
+            try:
+                self.active.append(self.requests.get_nowait())
+            except queue.Empty:
+                break
+        
+        # Time until this buffer reaches the speaker, if the host API reports it
+        latency = time_info.get("output_buffer_dac_time", 0) - time_info.get("current_time", 0)
+        if not 0 <= latency < 1:
+            latency = self.stream.get_output_latency() if self.stream else 0
+        
+        mix = np.zeros(frame_count * self.channels, dtype=np.int32)
+        playing = []
+        for cue in self.active:
+            chunk = cue.samples[cue.position:cue.position + len(mix)]
+            mix[:len(chunk)] += chunk
+            cue.position += len(chunk)
+            if cue.position < len(cue.samples):
+                playing.append(cue)
+            else:
+                end_offset = len(chunk) / self.channels / self.rate
+                self.finishing.append((now + latency + end_offset, cue.done))
+        self.active = playing
+        
+        finished = [entry for entry in self.finishing if entry[0] <= now]
+        for entry in finished:
+            entry[1].set()
+            self.finishing.remove(entry)
+        
+        return np.clip(mix, -32768, 32767).astype(np.int16).tobytes(), self.pyaudio.paContinue
     
     def cleanup(self):
         """Clean up audio resources"""
+        if self.stream:
+            try:
+                self.stream.stop_stream()
+                self.stream.close()
+            except Exception as e:
+                log.warning("Warning: Could not close audio output: %s", e)
+            self.stream = None
+        
+        # Nobody should keep waiting for cues that will never finish now
+        for cue in self.active:
+            cue.done.set()
+        for _, done in self.finishing:
+            done.set()
+        while True:
+            try:
+                self.requests.get_nowait().done.set()
+            except queue.Empty:
+                break
+        
         if self.audio:
-            self.audio.terminate()
\ No newline at end of file
+            self.audio.terminate()
+            self.audio = None
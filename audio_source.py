@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+
+import threading
+import time
+import numpy as np
+from batch_transcription import SAMPLE_RATE, load_audio
+from logs import get_logger
+
+log = get_logger(__name__)
+
+CHUNK_SAMPLES = 512      # Matches the recorder's buffer size (32 ms at 16 kHz)
+
+
+class WavFileSource:
+    """Replays an audio file into the recorder in place of the microphone
+
+    The file is fed at `speed` times real time (0 feeds it as fast as
+    possible), followed by digital silence paced in real time so the
+    recorder's VAD can end the session exactly as it would on a live mic.
+    """
+
+    def __init__(self, path, speed=1.0, chunk_samples=CHUNK_SAMPLES):
+        self.path = path
+        self.speed = speed
+        self.chunk_samples = chunk_samples
+        self.recorder = None
+        self.thread = None
+        self.stop_event = threading.Event()
+        self.finished_event = threading.Event()  # Set once the whole file has been fed
+        self.audio = (load_audio(path) * 32767).clip(-32768, 32767).astype(np.int16)
+
+    @property
+    def duration(self):
+        """Duration of the replayed audio in seconds"""
+        return len(self.audio) / SAMPLE_RATE
+
+    def attach(self, recorder):
+        """Bind the source to the recorder it feeds"""
+        self.recorder = recorder
+
+    def start_session(self):
+        """Start replaying the file from the beginning"""
+        self.stop_session()
+        self.stop_event.clear()
+        self.finished_event.clear()
+        self.thread = threading.Thread(target=self._feed_thread, name="audio-feed", daemon=True)
+        self.thread.start()
+
+    def stop_session(self):
+        """Stop feeding audio to the recorder"""
+        self.stop_event.set()
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(timeout=1.0)
+        self.thread = None
+
+    def suspend(self):
+        """Stop feeding while the recorder is unloaded"""
+        self.stop_session()
+
+    def resume(self):
+        """Nothing to reopen; the file is replayed from the beginning each session"""
+
+    def close(self):
+        """Release the source"""
+        self.stop_session()
+
+    def _feed_thread(self):
+        """Feed file chunks, then silence, until the session is stopped"""
+        chunk_seconds = self.chunk_samples / SAMPLE_RATE
+        silence = np.zeros(self.chunk_samples, dtype=np.int16).tobytes()
+        next_deadline = time.perf_counter()
+
+        try:
+            for offset in range(0, len(self.audio), self.chunk_samples):
+                if self.stop_event.is_set():
+                    return
+                self.recorder.feed_audio(self.audio[offset:offset + self.chunk_samples].tobytes())
+                if self.speed > 0:
+                    next_deadline += chunk_seconds / self.speed
+                    self.stop_event.wait(max(0.0, next_deadline - time.perf_counter()))
+
+            self.finished_event.set()
+
+            # Endpointing is measured in wall-clock time, so silence is never sped up
+            next_deadline = time.perf_counter()
+            while not self.stop_event.is_set():
+                self.recorder.feed_audio(silence)
+                next_deadline += chunk_seconds
+                self.stop_event.wait(max(0.0, next_deadline - time.perf_counter()))
+        except Exception as e:
+            log.warning("Warning: Could not replay audio file %s: %s", self.path, e)
+
+
+class PrerollMicSource:
+    """Captures the microphone continuously and keeps the last moments before each session
+
+    Between sessions, captured audio goes into a fixed-size ring buffer
+    that is allocated once, so memory is bounded and the capture callback
+    only copies samples into place. When a session starts, the last
+    `preroll_seconds` are fed to the recorder first, so a word spoken right
+    after the hotkey (or over the start cue) is not clipped. During the
+    session, captured chunks are fed straight through.
+
+    With preroll_seconds=0 there is nothing to keep between sessions, so
+    the microphone is only open during sessions.
+
+    While the models are unloaded the microphone is released (suspend()).
+    resume() reopens it in a few milliseconds, before the models are loaded
+    again, and keeps everything captured until the session starts, so
+    speech during the reload is transcribed instead of lost.
+    """
+
+    def __init__(self, preroll_seconds=0.5, chunk_samples=CHUNK_SAMPLES, input_device_index=None):
+        self.chunk_samples = chunk_samples
+        self.input_device_index = input_device_index
+        self.preroll_seconds = preroll_seconds
+        self.recorder = None
+        self.audio = None
+        self.stream = None
+        self.rate = SAMPLE_RATE  # Capture rate of the device
+        self.resampler = None  # Converts other capture rates to 16 kHz
+        self.lock = threading.Lock()  # Orders the pre-roll flush against the capture callback
+        self.in_session = False
+        self.ring = None
+        self.write_index = 0
+        self.filled = 0  # Valid samples in the ring, up to its capacity
+        self.held = None  # Chunks captured since resume(), fed in full when the session starts
+
+    def attach(self, recorder):
+        """Bind the source to the recorder it feeds and start capturing"""
+        self.recorder = recorder
+        if self.stream is None and self.preroll_seconds:
+            self._start_capture()
+
+    def _start_capture(self):
+        """Open the microphone"""
+        import pyaudio  # Deferred so importing the app stays cheap
+        if self.audio is None:
+            self.audio = pyaudio.PyAudio()  # Kept until close(); PortAudio init is slow
+        self.paContinue = pyaudio.paContinue
+
+        try:
+            self.stream = self._open(pyaudio, SAMPLE_RATE)
+        except Exception:
+            # Not every device captures at 16 kHz; capture at the native rate and resample
+            info = (self.audio.get_device_info_by_index(self.input_device_index)
+                    if self.input_device_index is not None else self.audio.get_default_input_device_info())
+            self.stream = self._open(pyaudio, int(info["defaultSampleRate"]))
+
+    def _open(self, pyaudio, rate):
+        """Open the capture stream at `rate`; the ring buffer always holds 16 kHz audio"""
+        resampler = None
+        if rate != SAMPLE_RATE:
+            import soxr  # Deferred: only needed for devices without 16 kHz capture
+            resampler = soxr.ResampleStream(rate, SAMPLE_RATE, 1, dtype="int16")
+        capacity = int(self.preroll_seconds * SAMPLE_RATE)
+        with self.lock:
+            self.rate = rate
+            self.resampler = resampler
+            self.ring = np.zeros(capacity, dtype=np.int16)
+            self.write_index = 0
+            self.filled = 0
+        return self.audio.open(
+            format=pyaudio.paInt16,
+            channels=1,
+            rate=rate,
+            input=True,
+            frames_per_buffer=int(self.chunk_samples * rate / SAMPLE_RATE),
+            input_device_index=self.input_device_index,
+            stream_callback=self._callback,
+        )
+
+    def _callback(self, in_data, frame_count, time_info, status):
+        """Feed the recorder during a session, otherwise fill the ring buffer (audio thread)"""
+        with self.lock:
+            if self.resampler:
+                # Stateful, so chunk boundaries leave no artifacts; RealtimeSTT would take bytes as 16 kHz
+                in_data = self.resampler.resample_chunk(np.frombuffer(in_data, dtype=np.int16)).tobytes()
+            if self.in_session:
+                self.recorder.feed_audio(in_data, SAMPLE_RATE)
+            elif self.held is not None:
+                self.held.append(in_data)
+            else:
+                self._write_ring(np.frombuffer(in_data, dtype=np.int16))
+        return None, self.paContinue
+
+    def _write_ring(self, samples):
+        """Copy samples into the ring buffer, overwriting the oldest ones"""
+        capacity = len(self.ring)
+        if not capacity:
+            return
+        samples = samples[-capacity:]
+        first = min(len(samples), capacity - self.write_index)
+        self.ring[self.write_index:self.write_index + first] = samples[:first]
+        self.ring[:len(samples) - first] = samples[first:]
+        self.write_index = (self.write_index + len(samples)) % capacity
+        self.filled = min(capacity, self.filled + len(samples))
+
+    def _ordered_ring(self):
+        """Copy of the buffered samples, oldest first (caller holds the lock)"""
+        if not self.filled:
+            return self.ring[:0].copy()
+        start = (self.write_index - self.filled) % len(self.ring)
+        if start + self.filled <= len(self.ring):
+            return self.ring[start:start + self.filled].copy()
+        return np.concatenate([self.ring[start:], self.ring[:self.write_index]])
+
+    def preroll(self):
+        """Return the buffered samples, oldest first"""
+        with self.lock:
+            return self._ordered_ring()
+
+    def start_session(self):
+        """Feed the pre-roll and any audio held during a reload, then stream captured audio"""
+        if self.stream is None:
+            self._start_capture()
+        with self.lock:
+            ordered = self._ordered_ring()
+            # Under the lock, so no chunk captured meanwhile can overtake the pre-roll
+            for offset in range(0, len(ordered), self.chunk_samples):
+                self.recorder.feed_audio(ordered[offset:offset + self.chunk_samples].tobytes(), SAMPLE_RATE)
+            for chunk in self.held or ():
+                self.recorder.feed_audio(chunk, SAMPLE_RATE)
+            self.filled = 0
+            self.held = None
+            self.in_session = True
+
+    def stop_session(self):
+        """Go back to buffering between sessions, or release the microphone without a pre-roll"""
+        with self.lock:
+            self.in_session = False
+            self.held = None
+        if not self.preroll_seconds:
+            self._stop_capture()
+
+    def suspend(self):
+        """Release the microphone while the recorder is unloaded"""
+        self.stop_session()
+        self._stop_capture()
+
+    def _stop_capture(self):
+        """Close the microphone (the PyAudio instance stays for the next session)"""
+        if self.stream:
+            self.stream.stop_stream()
+            self.stream.close()
+            self.stream = None
+
+    def resume(self):
+        """Capture again right away and hold everything until the next session starts"""
+        with self.lock:
+            self.held = []
+        if self.stream is None:
+            self._start_capture()
+
+    def close(self):
+        """Stop capturing and release the audio device"""
+        self.suspend()
+        if self.audio:
+            self.audio.terminate()
+            self.audio = None
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+
+import hashlib
+import json
+import os
+import platform
+import time
+from datetime import datetime, timezone
+from logs import get_logger
+
+log = get_logger(__name__)
+
+CANDIDATE_MODELS = ("tiny", "base", "small")  # Smallest first; larger models are more accurate
+COMPUTE_TYPES = {"cpu": ("int8", "float32"), "cuda": ("float16", "int8_float16")}
+BEAM_SIZES = (1, 5)
+TARGET_RTF = 0.3         # Final pass may take at most 30% of the utterance duration
+REALTIME_WINDOW = 3.0    # seconds of audio a typical realtime pass decodes
+MIN_REALTIME_PAUSE = 0.05
+MAX_REALTIME_PAUSE = 0.5
+
+
+def _cpu_model():
+    """Human-readable CPU model name"""
+    try:
+        with open("/proc/cpuinfo") as cpuinfo:
+            for line in cpuinfo:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+
+def _memory_gb():
+    """Total physical memory in GB, if the platform reports it"""
+    try:
+        return round(os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / 1024 ** 3, 1)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def hardware_fingerprint(device="cpu"):
+    """Describe the machine; returns (key, description)
+
+    The key changes whenever anything that affects transcription speed
+    changes (CPU, core count, memory, GPU), which invalidates the profile.
+    """
+    description = {
+        "system": platform.system(),
+        "machine": platform.machine(),
+        "cpu": _cpu_model(),
+        "cores": os.cpu_count(),
+        "memory_gb": _memory_gb(),
+        "device": device,
+    }
+    if device == "cuda":
+        import torch
+        description["gpu"] = torch.cuda.get_device_name()
+    key = hashlib.sha1(json.dumps(description, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    return key, description
+
+
+def thread_candidates(cores=None):
+    """CPU thread counts worth trying: half the cores and all of them"""
+    cores = cores or os.cpu_count() or 1
+    return sorted({max(1, cores // 2), cores})
+
+
+def _transcribe_seconds(model, audio, beam_size, language):
+    """Wall-clock seconds for one complete transcription"""
+    start_time = time.perf_counter()
+    segments, _ = model.transcribe(audio, language=language, beam_size=beam_size)
+    list(segments)  # transcribe() is lazy; consume it to actually decode
+    return time.perf_counter() - start_time
+
+
+def calibrate(handler, audio, models=CANDIDATE_MODELS, compute_types=None, threads=None,
+              beam_sizes=BEAM_SIZES, sample_rate=16000):
+    """Measure the real-time factor of each candidate configuration
+
+    `audio` is 16 kHz float32 speech. Each model is loaded once per compute
+    type and thread count, and run once untimed to pay first-use costs.
+    Returns one result dict per configuration.
+    """
+    compute_types = compute_types or COMPUTE_TYPES.get(handler.device, (handler.compute_type,))
+    threads = threads or (thread_candidates() if handler.device == "cpu" else [0])
+    duration = len(audio) / sample_rate
+    realtime_audio = audio[:int(REALTIME_WINDOW * sample_rate)]
+
+    results = []
+    for model_name in models:
+        for compute_type in compute_types:
+            for cpu_threads in threads:
+                label = f"{model_name}/{compute_type}/{cpu_threads or 'auto'} threads"
+                try:
+                    model = handler.create_model(cpu_threads, model_name=model_name, compute_type=compute_type)
+                    _transcribe_seconds(model, realtime_audio, 1, handler.language)  # Warm-up
+                except Exception as e:
+                    log.warning("⚠️ Skipping %s: %s", label, e)
+                    continue
+
+                for beam_size in beam_sizes:
+                    seconds = _transcribe_seconds(model, audio, beam_size, handler.language)
+                    realtime_seconds = _transcribe_seconds(model, realtime_audio, 1, handler.language)
+                    result = {
+                        "model": model_name,
+                        "compute_type": compute_type,
+                        "cpu_threads": cpu_threads,
+                        "beam_size": beam_size,
+                        "rtf": round(seconds / duration, 4),
+                        "realtime_pass_seconds": round(realtime_seconds, 4),
+                    }
+                    results.append(result)
+                    log.info("  %s, beam %s: RTF %.3f, realtime pass %.0fms",
+                             label, beam_size, result["rtf"], realtime_seconds * 1000)
+                del model
+    return results
+
+
+def choose_config(results, target_rtf=TARGET_RTF, models=CANDIDATE_MODELS):
+    """Pick the configuration to run with
+
+    The largest model that has a configuration within `target_rtf` wins,
+    with that model's fastest configuration. If nothing meets the target,
+    the fastest configuration overall is used. The realtime processing
+    pause is set to one realtime pass, so realtime decoding keeps at most
+    about half the transcription time.
+    """
+    if not results:
+        return None
+
+    fastest = lambda candidates: min(candidates, key=lambda r: (r["rtf"], -r["beam_size"]))
+    choice = fastest(results)
+    for model_name in reversed(models):
+        within_target = [r for r in results if r["model"] == model_name and r["rtf"] <= target_rtf]
+        if within_target:
+            choice = fastest(within_target)
+            break
+
+    pause = min(max(choice["realtime_pass_seconds"], MIN_REALTIME_PAUSE), MAX_REALTIME_PAUSE)
+    return {
+        "model": choice["model"],
+        "compute_type": choice["compute_type"],
+        "cpu_threads": choice["cpu_threads"],
+        "beam_size": choice["beam_size"],
+        "realtime_processing_pause": round(pause, 3),
+        "rtf": choice["rtf"],
+        "meets_target": choice["rtf"] <= target_rtf,
+    }
+
+
+def save_profile(path, key, description, results, choice, target_rtf=TARGET_RTF):
+    """Store the calibration for this machine, keeping profiles of other machines"""
+    profiles = {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            profiles = json.load(f).get("profiles", {})
+    except (OSError, ValueError):
+        pass
+
+    profiles[key] = {
+        "hardware": description,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "target_rtf": target_rtf,
+        "results": results,
+        "choice": choice,
+    }
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump({"profiles": profiles}, f, indent=2)
+    os.replace(temp_path, path)
+
+
+def load_profile(path, device="cpu"):
+    """Return the chosen configuration for this machine, or None if it was never calibrated"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            profiles = json.load(f).get("profiles", {})
+    except (OSError, ValueError):
+        return None
+    key, _ = hardware_fingerprint(device)
+    profile = profiles.get(key)
+    return profile["choice"] if profile else None
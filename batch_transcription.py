@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+
+import json
+import multiprocessing
+import os
+import time
+import numpy as np
+import soundfile as sf
+from logs import get_logger
+
+log = get_logger(__name__)
+
+AUDIO_EXTENSIONS = (".wav", ".flac")
+SAMPLE_RATE = 16000      # Whisper expects 16 kHz mono float32
+BLOCK_SECONDS = 5        # Decode granularity when streaming files from disk
+
+# Per-worker state, populated once by _init_worker in each pool process
+_worker_model = None
+_worker_language = None
+
+
+def find_audio_files(inputs):
+    """Expand a list of files and directories into sorted audio file paths"""
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, files in os.walk(item):
+                paths.extend(
+                    os.path.join(root, name) for name in files
+                    if name.lower().endswith(AUDIO_EXTENSIONS)
+                )
+        else:
+            paths.append(item)
+    return sorted(paths)
+
+
+def load_audio(path, block_seconds=BLOCK_SECONDS):
+    """Decode an audio file block by block into 16 kHz mono float32"""
+    blocks = []
+    with sf.SoundFile(path) as audio_file:
+        resampler = None
+        if audio_file.samplerate != SAMPLE_RATE:
+            import soxr
+            resampler = soxr.ResampleStream(audio_file.samplerate, SAMPLE_RATE, 1, dtype="float32")
+
+        blocksize = int(audio_file.samplerate * block_seconds)
+        for block in audio_file.blocks(blocksize=blocksize, dtype="float32", always_2d=True):
+            mono = block.mean(axis=1)
+            if resampler:
+                mono = resampler.resample_chunk(mono)
+            blocks.append(mono)
+
+        if resampler:
+            blocks.append(resampler.resample_chunk(np.zeros(0, dtype=np.float32), last=True))
+
+    if not blocks:
+        return np.zeros(0, dtype=np.float32)
+    return np.concatenate(blocks).astype(np.float32, copy=False)
+
+
+def plan_batches(paths, batch_seconds):
+    """Group consecutive short files into tasks of roughly batch_seconds of audio"""
+    batches = []
+    current, current_seconds = [], 0.0
+    for path in paths:
+        try:
+            duration = sf.info(path).duration
+        except Exception:
+            duration = batch_seconds  # Unreadable files get their own task and report the error
+
+        if current and current_seconds + duration > batch_seconds:
+            batches.append(current)
+            current, current_seconds = [], 0.0
+        current.append(path)
+        current_seconds += duration
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _init_worker(transcription_handler, cpu_threads):
+    """Load the model once per worker process"""
+    global _worker_model, _worker_language
+    _worker_model = transcription_handler.create_model(cpu_threads=cpu_threads)
+    _worker_language = transcription_handler.language
+
+
+def _transcribe_batch(paths):
+    """Transcribe every file of a batch with the worker's resident model"""
+    results = []
+    for path in paths:
+        start_time = time.perf_counter()
+        try:
+            audio = load_audio(path)
+            segments, _ = _worker_model.transcribe(audio, language=_worker_language)
+            text = "".join(segment.text for segment in segments).strip()
+            error = None
+        except Exception as e:
+            audio = np.zeros(0, dtype=np.float32)
+            text = ""
+            error = str(e)
+
+        processing_seconds = time.perf_counter() - start_time
+        audio_seconds = len(audio) / SAMPLE_RATE
+        result = {
+            "path": path,
+            "text": text,
+            "audio_seconds": round(audio_seconds, 3),
+            "processing_seconds": round(processing_seconds, 3),
+            "rtf": round(processing_seconds / audio_seconds, 4) if audio_seconds else None,
+            "worker": os.getpid(),
+        }
+        if error:
+            result["error"] = error
+        results.append(result)
+    return results
+
+
+class BatchTranscriber:
+    """Transcribes recorded audio files through a pool of model-holding workers"""
+
+    def __init__(self, transcription_handler, workers=None, batch_seconds=30, cpu_threads=0):
+        self.transcription_handler = transcription_handler
+        self.workers = workers or max(1, (os.cpu_count() or 1) // 2)
+        self.batch_seconds = batch_seconds
+        # Split cores between workers so they do not oversubscribe the CPU
+        self.cpu_threads = cpu_threads or max(1, (os.cpu_count() or 1) // self.workers)
+
+    def run(self, inputs, output_path):
+        """Transcribe all inputs, stream results to a JSONL file and return a summary"""
+        paths = find_audio_files(inputs)
+        batches = plan_batches(paths, self.batch_seconds)
+
+        log.info("📂 %s files in %s batches, %s workers x %s threads",
+                 len(paths), len(batches), self.workers, self.cpu_threads)
+
+        summary = {"files": 0, "errors": 0, "audio_seconds": 0.0, "wall_seconds": 0.0}
+        start_time = time.perf_counter()
+
+        # Spawn avoids forking an already-initialized CUDA context
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(
+            self.workers,
+            initializer=_init_worker,
+            initargs=(self.transcription_handler, self.cpu_threads),
+        ) as pool, open(output_path, "w", encoding="utf-8") as output:
+            for results in pool.imap_unordered(_transcribe_batch, batches):
+                for result in results:
+                    output.write(json.dumps(result) + "\n")
+                    summary["files"] += 1
+                    summary["errors"] += 1 if "error" in result else 0
+                    summary["audio_seconds"] += result["audio_seconds"]
+                output.flush()
+                log.info("📝 %s/%s files transcribed", summary["files"], len(paths))
+
+        summary["wall_seconds"] = time.perf_counter() - start_time
+        summary["rtf"] = (
+            summary["wall_seconds"] / summary["audio_seconds"] if summary["audio_seconds"] else None
+        )
+        return summary
@@ -1,13 +1,18 @@
 #!/usr/bin/env python3
 
+import importlib.util
+import json
+import subprocess
+import sys
 import time
 import statistics
+from text_diff import IncrementalDiffEngine, sequence_matcher_diff
 from text_typing import TypeController
 
 
 def benchmark_text_diff():
     """Benchmark the text diff algorithm performance"""
-    type_controller = TypeController()
+    type_controller = TypeController(output="recording")
     
     # Test cases with varying complexity
     test_cases = [
@@ -44,9 +49,53 @@ def benchmark_text_diff():
         print()
 
 
+def _time_per_call(func, min_runs=5, max_runs=1000, time_budget=0.5):
+    """Average seconds per call, running until the time budget or max_runs is reached"""
+    runs = 0
+    start_time = time.perf_counter()
+    while runs < max_runs and (runs < min_runs or time.perf_counter() - start_time < time_budget):
+        func()
+        runs += 1
+    return (time.perf_counter() - start_time) / runs
+
+
+def benchmark_diff_scaling():
+    """Compare the SequenceMatcher diff with the incremental engine on long transcripts"""
+    print("📈 Benchmarking diff scaling on long transcripts...")
+    print("-" * 60)
+    
+    words = [f"word{i % 97}" for i in range(30000)]
+    transcript = " ".join(words)
+    
+    for size in (1_000, 10_000, 100_000):
+        old_text = transcript[:size]
+        cases = [
+            ("append", old_text, old_text + " next"),
+            ("replace last word", old_text, old_text[:old_text.rfind(" ")] + " corrected"),
+        ]
+        
+        for description, old, new in cases:
+            engines = {"sequence_matcher": lambda: sequence_matcher_diff(old, new)}
+            for mode in ("word", "char"):
+                engine = IncrementalDiffEngine(mode)
+                engine.diff("", old)  # Previous update, as during a dictation
+                
+                def incremental_update(engine=engine):
+                    # Every call starts from the same typed state
+                    engine.previous_text = old
+                    return engine.diff(old, new)
+                
+                engines[f"incremental_{mode}"] = incremental_update
+            
+            timings = {name: _time_per_call(func) for name, func in engines.items()}
+            print(f"{size:>7,} chars, {description:<17} | " + " | ".join(
+                f"{name}: {seconds * 1000:.3f}ms" for name, seconds in timings.items()))
+    print()
+
+
 def benchmark_typing_debouncing():
     """Benchmark typing with debouncing"""
-    type_controller = TypeController(debounce_delay=0.1)
+    type_controller = TypeController(debounce_delay=0.1, output="recording")
     
     print("🎯 Testing debouncing behavior...")
     print("-" * 60)
@@ -56,8 +105,7 @@ def benchmark_typing_debouncing():
     # Simulate rapid updates (should be debounced)
     for i in range(10):
         type_controller.last_typed_text = ""  # Reset to force processing attempt
-        with MockKeyboardAndClipboard():
-            type_controller.type_text_realtime(f"Hello {i}")
+        type_controller.type_text_realtime(f"Hello {i}")
         time.sleep(0.01)  # 10ms intervals (faster than debounce)
     
     end_time = time.time()
@@ -65,25 +113,42 @@ def benchmark_typing_debouncing():
     print()
 
 
-class MockKeyboardAndClipboard:
-    """Mock context manager for testing without actual keyboard/clipboard operations"""
+MODEL_STARTUP_SCRIPT = """
+import json, sys, time
+start_time = time.perf_counter()
+from process_stats import rss_mb
+from transcription import TranscriptionHandler
+handler = TranscriptionHandler(sys.argv[1], share_model=sys.argv[2] == "shared")
+recorder = handler.create_recorder(lambda text: None, lambda: None, use_microphone=False)
+recorder.__enter__()
+print(json.dumps({"startup_s": time.perf_counter() - start_time, "rss_mb": rss_mb()}))
+recorder.shutdown()
+"""
+
+
+def benchmark_model_sharing(model_name="tiny"):
+    """Compare startup time and resident memory with separate vs shared realtime model"""
+    print("🧠 Benchmarking realtime/final model sharing...")
+    print("-" * 60)
     
-    def __enter__(self):
-        import unittest.mock
-        self.clipboard_patch = unittest.mock.patch('text_typing.pyperclip.copy')
-        self.keyboard_patch = unittest.mock.patch('text_typing.keyboard.Controller')
-        self.time_patch = unittest.mock.patch('text_typing.time.sleep')
-        
-        self.clipboard_patch.start()
-        self.keyboard_patch.start() 
-        self.time_patch.start()
-        
-        return self
+    if not importlib.util.find_spec("RealtimeSTT"):
+        print("Skipped: RealtimeSTT is not installed")
+        print()
+        return
     
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        self.clipboard_patch.stop()
-        self.keyboard_patch.stop()
-        self.time_patch.stop()
+    for mode in ("separate", "shared"):
+        # A fresh interpreter per mode so memory and load time are not shared
+        result = subprocess.run(
+            [sys.executable, "-c", MODEL_STARTUP_SCRIPT, model_name, mode],
+            capture_output=True, text=True,
+        )
+        try:
+            stats = json.loads(result.stdout.strip().splitlines()[-1])
+        except (IndexError, ValueError):
+            print(f"{mode:<25} | failed: {result.stderr.strip().splitlines()[-1:]}")
+            continue
+        print(f"{mode + ' (' + model_name + ')':<25} | Startup: {stats['startup_s']:.2f}s | RSS: {stats['rss_mb']:.0f}MB")
+    print()
 
 
 def main():
@@ -93,7 +158,9 @@ def main():
     print()
     
     benchmark_text_diff()
+    benchmark_diff_scaling()
     benchmark_typing_debouncing()
+    benchmark_model_sharing()
     
     print("✅ Benchmarks completed!")
 
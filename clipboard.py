@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+
+import os
+import queue
+import select
+import sys
+import threading
+import time
+
+CLIPBOARDS = ("auto", "x11", "pyperclip")
+READY_TIMEOUT = 0.5      # seconds to wait for the owner thread to confirm a new selection
+RESTORE_TIMEOUT = 0.5    # seconds to wait for the target window to fetch the last paste
+RESTORE_SETTLE = 0.15    # seconds after the last paste before restoring, even once it was fetched
+SETTLE_DELAY = 0.01      # pyperclip gives no readiness signal, so give the copy time to land
+
+
+class PyperclipClipboard:
+    """Clipboard through pyperclip, spawning the platform tool for every copy
+
+    Used where X11 is not available (Windows, macOS, Wayland).
+    """
+
+    name = "pyperclip"
+
+    def __init__(self, restore=True):
+        self.restore = restore  # Put the user's clipboard back at the end of each session
+        self.saved = None
+        self.pasted = False
+        self.restore_timer = None
+
+    def begin_session(self):
+        """Save the user's clipboard before the first paste of a session"""
+        import pyperclip
+        self.pasted = False
+        if self.restore:
+            try:
+                self.saved = pyperclip.paste()
+            except Exception:
+                self.saved = None
+
+    def set_text(self, text):
+        """Put text on the clipboard and wait until it is likely to be pasteable"""
+        import pyperclip
+        pyperclip.copy(text)
+        self.pasted = True
+        time.sleep(SETTLE_DELAY)
+
+    def end_session(self):
+        """Restore the saved clipboard once the last paste has had time to complete"""
+        if self.restore and self.pasted and self.saved is not None:
+            import pyperclip
+            self.restore_timer = threading.Timer(RESTORE_TIMEOUT, pyperclip.copy, [self.saved])
+            self.restore_timer.daemon = True
+            self.restore_timer.start()
+        self.pasted = False
+
+    def close(self):
+        """Nothing to release; the platform tool keeps serving the last copy"""
+
+
+class XClipboard:
+    """Owns the X11 CLIPBOARD selection from a long-lived thread
+
+    Instead of spawning xclip for every paste, one hidden window owns the
+    selection for the whole process and answers paste requests itself.
+    set_text() returns as soon as the X server confirms the new owner, so
+    no fixed sleep is needed before sending Ctrl+V. The user's previous
+    clipboard is fetched at session start and put back once the last paste
+    has been fetched and RESTORE_SETTLE has passed (or after
+    RESTORE_TIMEOUT). A fetch alone is not enough: clipboard managers
+    fetch new contents as soon as ownership changes, before the target
+    window has even received Ctrl+V.
+
+    All X calls run on the owner thread; other threads post commands to it.
+    """
+
+    name = "x11"
+
+    def __init__(self, restore=True):
+        from Xlib import X, Xatom, display
+        from Xlib.protocol import event
+
+        self.X = X
+        self.Xatom = Xatom
+        self.event = event
+        self.restore = restore
+        self.display = display.Display()
+        self.window = self.display.screen().root.create_window(0, 0, 1, 1, 0, X.CopyFromParent)
+        self.CLIPBOARD = self.display.intern_atom("CLIPBOARD")
+        self.TARGETS = self.display.intern_atom("TARGETS")
+        self.UTF8_STRING = self.display.intern_atom("UTF8_STRING")
+        self.TEXT = self.display.intern_atom("TEXT")
+        self.PROPERTY = self.display.intern_atom("WHISPER_TYPER_CLIPBOARD")
+
+        self.contents = None      # Bytes served while we own the selection
+        self.serial = 0           # Bumped for every paste
+        self.served_serial = 0    # Last paste a requestor fetched
+        self.owned_at = 0.0       # time.monotonic() of the last paste
+        self.saved = None         # User's clipboard from before the session
+        self.session_pasted = False
+        self.restore_deadline = None
+
+        self.commands = queue.Queue()
+        self.wakeup_read, self.wakeup_write = os.pipe()
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="clipboard-owner", daemon=True)
+        self.thread.start()
+
+    def _call(self, function, timeout=READY_TIMEOUT):
+        """Run function on the owner thread and wait for it to finish"""
+        done = threading.Event()
+        result = {}
+
+        def command():
+            try:
+                result["value"] = function()
+            except Exception as e:
+                result["error"] = e
+            done.set()
+
+        self._post(command)
+        if not done.wait(timeout):
+            raise RuntimeError("Clipboard owner thread did not respond")
+        if "error" in result:
+            raise result["error"]
+        return result.get("value")
+
+    def _post(self, command):
+        """Queue a command for the owner thread and wake it up"""
+        self.commands.put(command)
+        os.write(self.wakeup_write, b"\0")
+
+    def begin_session(self):
+        """Start fetching the user's clipboard so it can be restored later"""
+        self._post(self._save)
+
+    def set_text(self, text):
+        """Take ownership of the selection with `text`; returns once the X server confirmed it"""
+        self._call(lambda: self._own(text.encode("utf-8")))
+
+    def end_session(self):
+        """Restore the saved clipboard once the last paste has been fetched"""
+        self._post(self._schedule_restore)
+
+    def close(self):
+        """Stop the owner thread and hand the current contents over to a persistent tool"""
+        if not self.running:
+            return
+        try:
+            self._call(self._finish_restore)
+        except RuntimeError:
+            pass
+        self.running = False
+        os.write(self.wakeup_write, b"\0")
+        self.thread.join(timeout=1)
+
+        # The selection dies with our window; let xclip/xsel keep serving it
+        if self.contents is not None:
+            try:
+                import pyperclip
+                pyperclip.copy(self.contents.decode("utf-8", errors="replace"))
+            except Exception:
+                pass
+
+        self.display.close()
+        os.close(self.wakeup_read)
+        os.close(self.wakeup_write)
+
+    # Everything below runs on the owner thread
+
+    def _run(self):
+        while self.running:
+            while True:
+                try:
+                    command = self.commands.get_nowait()
+                except queue.Empty:
+                    break
+                command()
+
+            while self.display.pending_events():
+                self._handle_event(self.display.next_event())
+            self._check_restore()
+            self.display.flush()
+
+            timeout = 0.05 if self.restore_deadline is not None else None
+            readable, _, _ = select.select([self.display.fileno(), self.wakeup_read], [], [], timeout)
+            if self.wakeup_read in readable:
+                os.read(self.wakeup_read, 512)
+
+    def _owns_selection(self):
+        owner = self.display.get_selection_owner(self.CLIPBOARD)
+        return getattr(owner, "id", owner) == self.window.id
+
+    def _own(self, data):
+        self.contents = data
+        self.serial += 1
+        self.owned_at = time.monotonic()
+        self.session_pasted = True
+        self.restore_deadline = None
+        self.window.set_selection_owner(self.CLIPBOARD, self.X.CurrentTime)
+        # get_selection_owner is a round trip: once it returns, the server has processed ownership
+        if not self._owns_selection():
+            self.contents = None
+            raise RuntimeError("Could not take ownership of the clipboard")
+
+    def _save(self):
+        self._finish_restore()  # A restore still pending from the last session happens now
+        self.session_pasted = False
+        if not self.restore:
+            return
+        if self.contents is not None:
+            self.saved = self.contents  # We already own it, e.g. restored after the last session
+            return
+        self.saved = None
+        self.window.convert_selection(self.CLIPBOARD, self.UTF8_STRING, self.PROPERTY, self.X.CurrentTime)
+
+    def _schedule_restore(self):
+        if self.restore and self.session_pasted:
+            self.restore_deadline = time.monotonic() + RESTORE_TIMEOUT
+
+    def _check_restore(self):
+        if self.restore_deadline is None:
+            return
+        now = time.monotonic()
+        if now < self.restore_deadline and (self.served_serial < self.serial
+                                            or now < self.owned_at + RESTORE_SETTLE):
+            return  # The target window may not have fetched the last paste yet
+        self._finish_restore()
+
+    def _finish_restore(self):
+        if self.restore_deadline is None:
+            return
+        self.restore_deadline = None
+        self.session_pasted = False
+        if self.saved is not None:
+            self.contents = self.saved
+            self.serial += 1
+            self.served_serial = self.serial
+        else:
+            # The clipboard was empty (or not text) before the session
+            self.contents = None
+            self.window.set_selection_owner(self.X.NONE, self.X.CurrentTime)
+
+    def _handle_event(self, e):
+        if e.type == self.X.SelectionRequest:
+            self._serve(e)
+        elif e.type == self.X.SelectionNotify and e.property == self.PROPERTY:
+            prop = self.window.get_full_property(self.PROPERTY, self.X.AnyPropertyType)
+            if prop is not None and prop.format == 8 and prop.property_type != self.display.intern_atom("INCR"):
+                self.saved = bytes(prop.value)
+            self.window.delete_property(self.PROPERTY)
+        elif e.type == self.X.SelectionClear:
+            # Someone else copied; their contents win over anything we would restore
+            self.contents = None
+            self.saved = None
+            self.restore_deadline = None
+
+    def _serve(self, e):
+        prop = e.property if e.property != self.X.NONE else e.target
+        if e.target == self.TARGETS:
+            targets = [self.TARGETS, self.UTF8_STRING, self.TEXT, self.Xatom.STRING]
+            e.requestor.change_property(prop, self.Xatom.ATOM, 32, targets)
+        elif e.target in (self.UTF8_STRING, self.TEXT, self.Xatom.STRING) and self.contents is not None:
+            target = self.Xatom.STRING if e.target == self.Xatom.STRING else self.UTF8_STRING
+            e.requestor.change_property(prop, target, 8, self.contents)
+            self.served_serial = self.serial
+        else:
+            prop = self.X.NONE
+
+        notify = self.event.SelectionNotify(
+            time=e.time, requestor=e.requestor, selection=e.selection, target=e.target, property=prop
+        )
+        e.requestor.send_event(notify)
+
+
+def create_clipboard(name="auto", restore=True):
+    """Create a clipboard by name
+
+    'auto' owns the X11 selection directly when running under X11 and uses
+    pyperclip elsewhere (or when the X connection fails).
+    """
+    if name == "pyperclip":
+        return PyperclipClipboard(restore)
+    if name == "x11":
+        return XClipboard(restore)
+    if name != "auto":
+        raise ValueError(f"Unknown clipboard: {name}")
+
+    if sys.platform.startswith("linux") and os.environ.get("DISPLAY") and not os.environ.get("WAYLAND_DISPLAY"):
+        try:
+            return XClipboard(restore)
+        except Exception:
+            pass  # No X display or python-xlib
+    return PyperclipClipboard(restore)
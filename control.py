@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+
+import getpass
+import os
+import socket
+import tempfile
+import threading
+from logs import get_logger
+
+log = get_logger(__name__)
+
+# Commands understood by the server control socket
+COMMANDS = ("start", "stop", "toggle", "abort", "status", "profile")
+
+
+def default_socket_path():
+    """Return the per-user path of the server control socket"""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(runtime_dir, f"whisper-typer-{getpass.getuser()}.sock")
+
+
+def send_command(command, socket_path=None, timeout=2.0):
+    """Send a single command to a running server and return its reply line
+
+    Raises OSError when no server is listening on the socket.
+    """
+    socket_path = socket_path or default_socket_path()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(socket_path)
+        client.sendall(f"{command}\n".encode())
+        with client.makefile("r", encoding="utf-8") as reader:
+            return reader.readline().strip()
+
+
+class ControlServer:
+    """Unix-domain socket that forwards line-based commands to a handler"""
+
+    def __init__(self, handler, socket_path=None):
+        self.handler = handler
+        self.socket_path = socket_path or default_socket_path()
+        self.server_socket = None
+        self.thread = None
+        self.is_running = False
+        self.bound = False  # Only the instance that bound the socket file may remove it
+
+    def __enter__(self):
+        """Context manager entry"""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit with cleanup"""
+        self.stop()
+        return False
+
+    def _remove_stale_socket(self):
+        """Remove a socket file left behind by a server that is no longer running"""
+        if not os.path.exists(self.socket_path):
+            return
+        try:
+            send_command("status", self.socket_path, timeout=0.5)
+        except OSError:
+            os.unlink(self.socket_path)
+            return
+        raise RuntimeError(f"Another server is already listening on {self.socket_path}")
+
+    def start(self):
+        """Bind the socket and serve commands in a background thread"""
+        self._remove_stale_socket()
+
+        self.server_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server_socket.bind(self.socket_path)
+        self.bound = True
+        os.chmod(self.socket_path, 0o600)  # Only the owning user may control the server
+        self.server_socket.listen()
+
+        self.is_running = True
+        self.thread = threading.Thread(target=self._serve, name="control-socket", daemon=True)
+        self.thread.start()
+
+    def _serve(self):
+        """Accept connections until the server is stopped"""
+        while self.is_running:
+            try:
+                connection, _ = self.server_socket.accept()
+            except OSError:
+                break  # Socket closed during shutdown
+
+            with connection:
+                self._handle_connection(connection)
+
+    def _handle_connection(self, connection):
+        """Read one command line, dispatch it and write the reply"""
+        try:
+            connection.settimeout(2.0)
+            with connection.makefile("r", encoding="utf-8") as reader:
+                command = reader.readline().strip().lower()
+
+            if command in COMMANDS:
+                reply = self.handler(command)
+            else:
+                reply = f"error unknown command '{command}'"
+
+            connection.sendall(f"{reply}\n".encode())
+        except Exception as e:
+            log.warning("⚠️ Control socket error: %s", e)
+
+    def stop(self):
+        """Stop serving and remove the socket file"""
+        self.is_running = False
+
+        if self.server_socket:
+            # Unblock accept() before closing the listening socket
+            try:
+                self.server_socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self.server_socket.close()
+            self.server_socket = None
+
+        if self.thread:
+            self.thread.join(timeout=1.0)
+            self.thread = None
+
+        if self.bound:
+            self.bound = False
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
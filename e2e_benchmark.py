@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import platform
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from logs import get_logger
+from process_stats import process_tree_cpu_seconds, rss_mb
+from timeline import percentile
+
+log = get_logger(__name__)
+
+RSS_INTERVAL = 0.05      # seconds between resident memory samples during a session
+REGRESSION_THRESHOLD = 0.10  # Relative increase of a metric that counts as a regression
+WER_THRESHOLD = 0.01     # Absolute increase of the word error rate that counts as a regression
+GATED_METRICS = ("wer", "rtf", "first_partial_p50_ms", "stop_to_final_p50_ms", "stop_to_final_p95_ms",
+                 "peak_rss_mb", "cpu_per_audio_second")  # Lower is better for all of them
+
+
+def normalize_words(text):
+    """Lower-case words without punctuation, for scoring"""
+    return re.sub(r"[^\w\s']", " ", (text or "").lower()).split()
+
+
+def word_errors(reference, hypothesis):
+    """Substitutions, deletions and insertions needed to turn the reference into the hypothesis"""
+    ref = normalize_words(reference)
+    hyp = normalize_words(hypothesis)
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ref_word != hyp_word)))
+        previous = current
+    return previous[-1]
+
+
+def load_manifest(path):
+    """Read fixtures from a JSONL manifest of {"audio": ..., "text": ...} lines
+
+    Audio paths are relative to the manifest. "name" defaults to the file name.
+    """
+    base_dir = os.path.dirname(os.path.abspath(path))
+    fixtures = []
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if "audio" not in entry or "text" not in entry:
+                raise ValueError(f"{path}:{line_number}: fixtures need 'audio' and 'text'")
+            audio = os.path.join(base_dir, entry["audio"])
+            fixtures.append({"name": entry.get("name", os.path.basename(audio)), "audio": audio,
+                             "text": entry["text"]})
+    return fixtures
+
+
+class RssSampler:
+    """Samples the resident memory of the process tree on a background thread"""
+
+    def __init__(self, interval=RSS_INTERVAL):
+        self.interval = interval
+        self.peak_mb = 0.0
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def __enter__(self):
+        self.peak_mb = rss_mb()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop_event.set()
+        self.thread.join(timeout=1.0)
+        self.peak_mb = max(self.peak_mb, rss_mb())
+        return False
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            self.peak_mb = max(self.peak_mb, rss_mb())
+
+
+def run_fixture(app, fixture, speed=1.0):
+    """Replay one fixture through the app and score the typed text"""
+    from audio_source import WavFileSource  # Deferred: pulls in numpy and soundfile
+
+    source = WavFileSource(fixture["audio"], speed=speed)
+    if app.audio_source:
+        app.audio_source.close()
+    source.attach(app.recorder)
+    app.audio_source = source  # The recorder was created without a microphone; swap in this fixture
+    output = app.type_controller.output
+    output.text = ""
+    output.events.clear()
+
+    cpu_before = process_tree_cpu_seconds()
+    with RssSampler() as sampler:
+        app.record_once()
+    cpu_seconds = process_tree_cpu_seconds() - cpu_before
+
+    timeline = app.timeline
+    recording_start = timeline.first("recording_start")
+    first_partial = timeline.first("realtime_stabilized")
+    recording_stop = timeline.first("recording_stop")
+    final_text = timeline.first("final_text")
+    errors = word_errors(fixture["text"], output.text)
+    reference_words = len(normalize_words(fixture["text"]))
+    result = {
+        "name": fixture["name"],
+        "audio_seconds": round(source.duration, 3),
+        "reference_words": reference_words,
+        "word_errors": errors,
+        "wer": round(errors / max(reference_words, 1), 4),
+        "first_partial_ms": round(first_partial - recording_start, 2) if first_partial is not None else None,
+        "stop_to_final_ms": timeline.metrics().get("stop_to_typed_ms"),
+        "final_pass_ms": round(final_text - recording_stop, 2) if None not in (final_text, recording_stop) else None,
+        "peak_rss_mb": round(sampler.peak_mb, 1),
+        "cpu_seconds": round(cpu_seconds, 3),
+        "text": output.text,
+    }
+    # Real-time factor of the final pass, as in autotune: decode time over audio duration
+    if result["final_pass_ms"] is not None and source.duration:
+        result["rtf"] = round(result["final_pass_ms"] / 1000 / source.duration, 4)
+    return result
+
+
+def summarize(results):
+    """Corpus-level metrics over the fixtures of one configuration"""
+    reference_words = sum(r["reference_words"] for r in results)
+    audio_seconds = sum(r["audio_seconds"] for r in results)
+    summary = {
+        "fixtures": len(results),
+        "audio_seconds": round(audio_seconds, 3),
+        "wer": round(sum(r["word_errors"] for r in results) / max(reference_words, 1), 4),
+        "peak_rss_mb": max((r["peak_rss_mb"] for r in results), default=0.0),
+        "cpu_seconds": round(sum(r["cpu_seconds"] for r in results), 3),
+    }
+    if audio_seconds:
+        summary["cpu_per_audio_second"] = round(summary["cpu_seconds"] / audio_seconds, 4)
+    rtfs = [r["rtf"] for r in results if r.get("rtf") is not None]
+    if rtfs:
+        summary["rtf"] = round(sum(rtfs) / len(rtfs), 4)
+    for metric in ("first_partial_ms", "stop_to_final_ms"):
+        values = [r[metric] for r in results if r.get(metric) is not None]
+        if values:
+            summary[f"{metric[:-3]}_p50_ms"] = round(percentile(values, 50), 2)
+            summary[f"{metric[:-3]}_p95_ms"] = round(percentile(values, 95), 2)
+    return summary
+
+
+def run_config(model, compute_type, fixtures, speed=1.0, silence_threshold=1):
+    """Load one model/compute type, warm it up and replay every fixture through it"""
+    from app import WhisperTyperApp  # Deferred: pulls in the audio and typing stack
+    from audio_source import WavFileSource
+
+    start_time = time.perf_counter()
+    with WhisperTyperApp(model, silence_threshold, audio_source=WavFileSource(fixtures[0]["audio"], speed=speed),
+                         output="recording", warmup=True, compute_type=compute_type) as app:
+        load_seconds = time.perf_counter() - start_time
+        compute_type = app.transcription_handler.compute_type
+        results = []
+        for fixture in fixtures:
+            result = run_fixture(app, fixture, speed)
+            results.append(result)
+            log.info("  %-30s | WER %.3f | RTF %.3f | stop→final %.0fms", fixture["name"], result["wer"],
+                     result.get("rtf", float("nan")), result["stop_to_final_ms"] or 0)
+    return {
+        "model": model,
+        "compute_type": compute_type,
+        "load_seconds": round(load_seconds, 2),
+        "summary": summarize(results),
+        "fixtures": results,
+    }
+
+
+def environment():
+    """Describe where the benchmark ran, so results from different machines are not compared blindly"""
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "host": platform.node(),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def _config_key(run):
+    return f"{run['model']}/{run['compute_type']}"
+
+
+def compare(baseline, current, threshold=REGRESSION_THRESHOLD, wer_threshold=WER_THRESHOLD):
+    """Compare two result files; returns rows of (config, metric, baseline, current, regressed)
+
+    A metric regresses when it grows by more than `threshold` (relative), or
+    for the word error rate by more than `wer_threshold` (absolute).
+    Configurations missing from either file are skipped.
+    """
+    baseline_runs = {_config_key(run): run["summary"] for run in baseline["runs"]}
+    rows = []
+    for run in current["runs"]:
+        key = _config_key(run)
+        if key not in baseline_runs:
+            continue
+        for metric in GATED_METRICS:
+            before = baseline_runs[key].get(metric)
+            after = run["summary"].get(metric)
+            if before is None or after is None:
+                continue
+            if metric == "wer":
+                regressed = after - before > wer_threshold
+            else:
+                regressed = after > before * (1 + threshold)
+            rows.append((key, metric, before, after, regressed))
+    return rows
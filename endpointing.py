@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import time
+from datetime import datetime
+from logs import get_logger
+from timeline import percentile
+
+log = get_logger(__name__)
+
+SENTENCE_END = (".", "?", "!")
+PAUSE_PERCENTILE = 95    # Pauses shorter than this percentile never end a session
+PAUSE_MARGIN = 0.3       # seconds added on top of the percentile
+MIN_THRESHOLD = 0.8      # seconds; never end a session faster than this
+MIN_PAUSES = 20          # Use the configured threshold until this many pauses were observed
+MAX_PAUSES = 500         # Most recent pauses kept in the stats file
+PUNCTUATION_FACTOR = 0.5  # Threshold multiplier while the transcript ends a sentence
+STABLE_PARTIALS = 2      # Identical consecutive partials before a sentence end counts
+RESUME_WINDOW = 5.0      # A new session this soon after the last one means it was cut off
+
+
+class AdaptiveEndpointer:
+    """Chooses each session's silence threshold from the speaker's own pauses
+
+    Pauses between a VAD stop and the next VAD start within a session are
+    intra-utterance pauses. They are kept across sessions in a small JSON
+    stats file, and the threshold for the next session is a high percentile
+    of them (clamped between MIN_THRESHOLD and the configured threshold).
+    Once the speaker is silent and the realtime transcript has ended with
+    the same sentence-final punctuation for STABLE_PARTIALS updates, the
+    threshold is shortened. Whisper punctuates almost every partial, so
+    punctuation during speech (or in a partial still changing) means
+    nothing. A session that is restarted within RESUME_WINDOW
+    of the previous one is counted as truncated, and the pause that cut it
+    off is learned as well.
+
+    The threshold is applied through the recorder's
+    post_speech_silence_duration, which RealtimeSTT reads on every chunk.
+    """
+
+    def __init__(self, stats_path, max_threshold, min_threshold=MIN_THRESHOLD, pause_percentile=PAUSE_PERCENTILE):
+        self.stats_path = stats_path
+        self.max_threshold = max_threshold  # The configured silence threshold
+        self.min_threshold = min_threshold
+        self.pause_percentile = pause_percentile
+        self.pauses = []
+        self.last_session_end = None  # time.time() when the last session ended
+        self.last_threshold = None
+        self.recorder = None
+        self.base_threshold = max_threshold
+        self.current_threshold = max_threshold
+        self.voice_stop_time = None
+        self.session_pauses = []
+        self.last_text = None
+        self.stable_count = 0  # Consecutive partials equal to last_text
+        self._load()
+
+    def _load(self):
+        """Read learned pauses from the stats file, if any"""
+        try:
+            with open(self.stats_path, encoding="utf-8") as f:
+                stats = json.load(f)
+            self.pauses = [float(p) for p in stats.get("pauses", [])][-MAX_PAUSES:]
+            self.last_session_end = stats.get("last_session_end")
+            self.last_threshold = stats.get("last_threshold")
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            log.warning("⚠️ Ignoring unreadable endpointing stats: %s", e)
+
+    def _save(self):
+        """Write learned pauses atomically"""
+        stats = {
+            "pauses": [round(p, 3) for p in self.pauses[-MAX_PAUSES:]],
+            "last_session_end": self.last_session_end,
+            "last_threshold": self.last_threshold,
+        }
+        temp_path = self.stats_path + ".tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(stats, f)
+            os.replace(temp_path, self.stats_path)
+        except OSError as e:
+            log.warning("⚠️ Could not save endpointing stats: %s", e)
+
+    def threshold(self):
+        """Silence threshold learned from the pause distribution"""
+        if len(self.pauses) < MIN_PAUSES:
+            return self.max_threshold
+        learned = percentile(self.pauses, self.pause_percentile) + PAUSE_MARGIN
+        return round(min(max(learned, self.min_threshold), self.max_threshold), 3)
+
+    def _apply(self, threshold):
+        self.current_threshold = threshold
+        if self.recorder:
+            self.recorder.post_speech_silence_duration = threshold
+
+    def begin_session(self, recorder):
+        """Set the recorder's silence threshold for a new session
+
+        Returns whether the previous session looks truncated, i.e. the user
+        started talking again right after it ended.
+        """
+        truncated = False
+        if self.last_session_end is not None and self.last_threshold is not None:
+            gap = time.time() - self.last_session_end
+            if 0 <= gap < RESUME_WINDOW:
+                # The user was still mid-utterance: that pause was at least threshold + gap long
+                truncated = True
+                self.pauses.append(self.last_threshold + gap)
+
+        self.recorder = recorder
+        self.voice_stop_time = None
+        self.session_pauses = []
+        self.last_text = None
+        self.stable_count = 0
+        self.base_threshold = self.threshold()
+        self._apply(self.base_threshold)
+        return truncated
+
+    def on_voice_stop(self):
+        """VAD reported the end of voice activity"""
+        self.voice_stop_time = time.monotonic()
+
+    def on_voice_start(self):
+        """VAD reported voice activity; a preceding pause did not end the utterance"""
+        if self.voice_stop_time is not None:
+            self.session_pauses.append(time.monotonic() - self.voice_stop_time)
+            self.voice_stop_time = None
+        self.stable_count = 0
+        if self.current_threshold != self.base_threshold:
+            self._apply(self.base_threshold)
+
+    def on_realtime_text(self, text):
+        """Shorten the threshold while the speaker is silent after a settled sentence end
+
+        Returns True if the threshold was changed.
+        """
+        if text == self.last_text:
+            self.stable_count += 1
+        else:
+            self.last_text = text
+            self.stable_count = 1
+        settled = self.voice_stop_time is not None and self.stable_count >= STABLE_PARTIALS
+        if settled and text and text.rstrip().endswith(SENTENCE_END):
+            threshold = max(self.min_threshold, round(self.base_threshold * PUNCTUATION_FACTOR, 3))
+        else:
+            threshold = self.base_threshold
+        if threshold == self.current_threshold:
+            return False
+        self._apply(threshold)
+        return True
+
+    def end_session(self):
+        """Learn the session's pauses and remember when it ended"""
+        self.pauses = (self.pauses + self.session_pauses)[-MAX_PAUSES:]
+        self.last_threshold = self.current_threshold
+        self.last_session_end = time.time()
+        self.recorder = None
+        self._save()
+
+
+def _session_bounds(record):
+    """Wall-clock start and end (final text typed) of a timeline record, in seconds"""
+    start = datetime.fromisoformat(record["started_at"]).timestamp()
+    typed = [e["t_ms"] for e in record.get("events", []) if e["event"] == "final_typed"]
+    return start, start + (typed[-1] if typed else 0) / 1000
+
+
+def endpoint_report(records, resume_window=RESUME_WINDOW):
+    """Mean silence threshold, stop latency and truncation rate per endpointing mode
+
+    A session counts as truncated when the next one started within
+    `resume_window` seconds of its final text being typed.
+    """
+    ordered = sorted(records, key=lambda r: r["started_at"])
+    groups = {}
+    for index, record in enumerate(ordered):
+        attributes = record.get("attributes", {})
+        if "silence_threshold" not in attributes:
+            continue
+        truncated = False
+        if index + 1 < len(ordered):
+            _, end = _session_bounds(record)
+            next_start, _ = _session_bounds(ordered[index + 1])
+            truncated = 0 <= next_start - end < resume_window
+        mode = "adaptive" if attributes.get("adaptive_endpointing") else "fixed"
+        group = groups.setdefault(mode, {"sessions": 0, "threshold_sum": 0.0, "truncated": 0, "stop_latencies": []})
+        group["sessions"] += 1
+        if "speech_end_to_typed_ms" in record.get("metrics", {}):
+            group["stop_latencies"].append(record["metrics"]["speech_end_to_typed_ms"])
+        # Threshold in effect when the session ended (shortened after a sentence end)
+        group["threshold_sum"] += attributes.get("endpoint_threshold", attributes["silence_threshold"])
+        group["truncated"] += truncated
+
+    return {
+        mode: {
+            "sessions": group["sessions"],
+            "mean_threshold_s": round(group["threshold_sum"] / group["sessions"], 3),
+            "mean_stop_latency_ms": (round(sum(group["stop_latencies"]) / len(group["stop_latencies"]), 2)
+                                     if group["stop_latencies"] else None),
+            "truncation_rate": round(group["truncated"] / group["sessions"], 3),
+        }
+        for mode, group in groups.items()
+    }
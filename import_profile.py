@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+
+import os
+import subprocess
+import sys
+
+# Modules the entry points defer until they are actually needed
+HEAVY_MODULES = ("torch", "RealtimeSTT", "faster_whisper", "pynput", "pyperclip", "pyaudio")
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def profile_imports(modules):
+    """Import modules in a fresh interpreter and return per-module costs
+
+    Returns (module, self_us, cumulative_us) tuples parsed from
+    `python -X importtime`, plus the names of modules that failed to import.
+    Modules are imported in order, so each cost excludes what earlier
+    modules already loaded.
+    """
+    # __import__ goes through the C import path that -X importtime reports on
+    code = (
+        f"for name in {list(modules)!r}:\n"
+        "    try:\n"
+        "        __import__(name)\n"
+        "    except Exception:\n"
+        "        print(name)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=PROJECT_DIR, capture_output=True, text=True,
+    )
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        # Nested imports keep their indentation (two spaces per level)
+        entries.append((name[1:].rstrip(), int(self_us), int(cumulative_us)))
+
+    failed = result.stdout.split()
+    return entries, failed
+
+
+def top_level_costs(entries):
+    """Keep only the outermost import of each top-level package"""
+    return [(name, self_us, cumulative_us) for name, self_us, cumulative_us in entries
+            if not name.startswith(" ")]
+
+
+def print_import_profile(entry_modules, top=15):
+    """Report what the entry point imports eagerly and what deferred imports cost"""
+    print("📦 Import profile")
+    print("-" * 60)
+
+    # Modules the interpreter loads before running any code are not ours to defer
+    startup, _ = profile_imports([])
+    startup_names = {name.strip() for name, _, _ in startup}
+    entries, failed = profile_imports(entry_modules)
+
+    total_us = sum(cumulative_us for name, _, cumulative_us in entries if name in entry_modules)
+    print(f"Entry point imports: {total_us / 1000:.1f}ms")
+
+    # Outermost and second-level imports, i.e. what the entry modules pull in directly
+    direct = [entry for entry in entries
+              if entry[0].strip() not in startup_names and not entry[0].startswith("    ")]
+    for name, _, cumulative_us in sorted(direct, key=lambda entry: -entry[2])[:top]:
+        print(f"  {name.strip():<40} {cumulative_us / 1000:8.1f}ms")
+    for name in failed:
+        print(f"  ⚠️ {name} failed to import")
+
+    print()
+    print("Deferred imports (paid when first used, in this order):")
+    entries, failed = profile_imports(HEAVY_MODULES)
+    costs = {name: cumulative_us for name, _, cumulative_us in top_level_costs(entries)}
+    for name in HEAVY_MODULES:
+        if name in failed:
+            print(f"  {name:<40} {'not installed':>10}")
+        elif name in costs:
+            print(f"  {name:<40} {costs[name] / 1000:8.1f}ms")
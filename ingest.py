@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+
+import asyncio
+import hmac
+import ipaddress
+import json
+import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from batch_transcription import SAMPLE_RATE
+from logs import get_logger
+
+log = get_logger("ingest")
+
+DEFAULT_PORT = 47810
+TOKEN_ENV = "WHISPER_TYPER_INGEST_TOKEN"  # Shared secret clients send as their first frame
+AUTH_TIMEOUT = 5.0       # seconds a client has to send the token
+FRAME_HEADER = struct.Struct(">I")  # Big-endian payload length; an empty frame ends the utterance
+MAX_FRAME_BYTES = 1024 * 1024
+MAX_UTTERANCE_SECONDS = 600  # Longer utterances are rejected instead of buffered without bound
+WINDOW_SECONDS = 30      # Whisper decodes at most 30 seconds per batch item
+REALTIME_INTERVAL = 0.5  # seconds between realtime passes of one stream
+MAX_BATCH = 16           # Windows decoded per shared inference call
+BATCH_WAIT = 0.02        # seconds to let concurrent streams join a batch
+
+
+async def read_frame(reader):
+    """Read one length-prefixed frame; returns None when the peer closed the connection"""
+    try:
+        header = await reader.readexactly(FRAME_HEADER.size)
+    except asyncio.IncompleteReadError:
+        return None
+    (length,) = FRAME_HEADER.unpack(header)
+    if length > MAX_FRAME_BYTES:
+        raise ValueError(f"Frame of {length} bytes exceeds {MAX_FRAME_BYTES}")
+    return await reader.readexactly(length)
+
+
+def write_frame(writer, payload):
+    """Queue one length-prefixed frame"""
+    writer.write(FRAME_HEADER.pack(len(payload)) + payload)
+
+
+def is_loopback(host):
+    """Whether `host` only accepts connections from this machine"""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False  # Wildcards ("") and hostnames may resolve to any interface
+
+
+def _windows(pcm, window_samples):
+    """Split int16 PCM bytes into float32 windows Whisper can decode"""
+    audio = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768
+    return [audio[offset:offset + window_samples] for offset in range(0, len(audio), window_samples)]
+
+
+class BatchDecoder:
+    """Transcribes windows of several streams in one encoder/decoder call
+
+    faster-whisper's transcribe() handles one audio at a time. Here the
+    log-mel features of every window are stacked into one batch and passed
+    to the CTranslate2 Whisper model directly, so concurrent streams share
+    each inference call instead of queueing for it.
+    """
+
+    def __init__(self, model, language="en", beam_size=1):
+        from faster_whisper.tokenizer import Tokenizer
+        self.model = model
+        self.beam_size = beam_size
+        self.tokenizer = Tokenizer(model.hf_tokenizer, model.model.is_multilingual,
+                                   task="transcribe", language=language)
+        self.prompt = list(self.tokenizer.sot_sequence) + [self.tokenizer.no_timestamps]
+        self.frames = model.feature_extractor.nb_max_frames
+
+    def _features(self, audio):
+        """Log-mel features padded (or trimmed) to a full 30-second window"""
+        features = self.model.feature_extractor(audio)[:, :self.frames]
+        return np.pad(features, ((0, 0), (0, self.frames - features.shape[1])))
+
+    def decode(self, windows):
+        """Return the text of each float32 window, decoded as one batch"""
+        import ctranslate2
+        features = np.ascontiguousarray(np.stack([self._features(w) for w in windows]), dtype=np.float32)
+        results = self.model.model.generate(
+            ctranslate2.StorageView.from_array(features),
+            [self.prompt] * len(windows),
+            beam_size=self.beam_size,
+            suppress_blank=True,
+        )
+        return [self.tokenizer.decode(result.sequences_ids[0]).strip() for result in results]
+
+
+class _StreamSession:
+    """Audio and decoding state of one connected client"""
+
+    def __init__(self, writer, session_id):
+        self.writer = writer
+        self.session_id = session_id
+        self.pcm = bytearray()       # Current utterance, int16 at 16 kHz
+        self.realtime_samples = 0    # Utterance length at the last realtime pass
+        self.last_realtime = 0.0     # time.monotonic() of the last realtime pass
+        self.finals = []             # (pcm, end time) of utterances waiting for their final pass
+        self.utterance = 0           # Bumped per ended utterance, so stale realtime results are dropped
+        self.unanswered = 0          # Ended utterances whose final text was not sent yet
+
+    def send(self, message):
+        """Queue a JSON line for the client"""
+        if not self.writer.is_closing():
+            self.writer.write((json.dumps(message) + "\n").encode("utf-8"))
+
+    def end_utterance(self):
+        """Hand the utterance to the final pass and start a new one"""
+        self.finals.append((bytes(self.pcm), time.monotonic()))
+        self.pcm = bytearray()
+        self.realtime_samples = 0
+        self.utterance += 1
+        self.unanswered += 1
+
+    def realtime_due(self, now, interval):
+        """Whether there is new audio and the last realtime pass is old enough"""
+        return len(self.pcm) // 2 > self.realtime_samples and now - self.last_realtime >= interval
+
+
+class IngestServer:
+    """Accepts PCM streams over TCP and returns realtime and final text
+
+    Each client streams 16 kHz mono int16 PCM in length-prefixed frames and
+    sends an empty frame to end an utterance. The server replies with JSON
+    lines: {"type": "realtime", "text": ...} while audio arrives and
+    {"type": "final", "text": ...} after each utterance ends. Endpointing is
+    the client's job.
+
+    With a `token`, a client's first frame must hold that token (UTF-8);
+    other clients get {"type": "error", "message": "unauthorized"} and are
+    disconnected before any audio is read. Binding to anything but a
+    loopback address requires a token.
+
+    One batch loop serves all clients. It waits BATCH_WAIT for concurrent
+    streams to line up, then decodes final passes first and due realtime
+    passes after them, up to MAX_BATCH windows per call, on a single
+    inference thread. A realtime pass is skipped while a stream has no new
+    audio.
+    """
+
+    def __init__(self, decoder, host="127.0.0.1", port=DEFAULT_PORT, max_batch=MAX_BATCH,
+                 realtime_interval=REALTIME_INTERVAL, batch_wait=BATCH_WAIT, token=None):
+        if not token and not is_loopback(host):
+            raise ValueError(f"Refusing to serve {host or 'all interfaces'} without a token "
+                             f"(set {TOKEN_ENV})")
+        self.decoder = decoder  # decode(list of float32 windows) -> list of texts
+        self.host = host
+        self.port = port
+        self.max_batch = max_batch
+        self.realtime_interval = realtime_interval
+        self.batch_wait = batch_wait
+        self.token = token.encode("utf-8") if token else None
+        self.window_samples = WINDOW_SECONDS * SAMPLE_RATE
+        self.sessions = set()
+        self.server = None
+        self.batch_task = None
+        self.work = None
+        self.executor = ThreadPoolExecutor(1)  # The model decodes one batch at a time
+        self.session_count = 0
+        self.stats = {"clients": 0, "batches": 0, "windows": 0, "max_batch": 0, "decode_ms": 0.0}
+
+    async def start(self):
+        """Bind the socket and start the batch loop"""
+        self.work = asyncio.Event()
+        self.server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]  # Resolves port 0
+        self.batch_task = asyncio.create_task(self._batch_loop())
+
+    async def serve_forever(self):
+        """Serve until cancelled, starting first if needed"""
+        if not self.server:
+            await self.start()
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self):
+        """Stop accepting clients and stop the batch loop"""
+        if self.batch_task:
+            self.batch_task.cancel()
+            try:
+                await self.batch_task
+            except asyncio.CancelledError:
+                pass
+            self.batch_task = None
+        if self.server:
+            self.server.close()
+            for session in list(self.sessions):
+                session.writer.close()
+            await self.server.wait_closed()  # Also waits for client handlers on Python 3.12+
+            self.server = None
+        self.executor.shutdown(wait=True)
+
+    async def _authenticate(self, reader, writer):
+        """Read the client's token frame; False (after telling the client) if it does not match"""
+        try:
+            payload = await asyncio.wait_for(read_frame(reader), AUTH_TIMEOUT)
+        except (asyncio.TimeoutError, ConnectionError, ValueError, asyncio.IncompleteReadError):
+            payload = None
+        if payload is not None and hmac.compare_digest(payload, self.token):
+            return True
+        peer = writer.get_extra_info("peername")
+        log.warning("🔒 Rejected unauthenticated client %s", peer[0] if peer else "?")
+        writer.write(json.dumps({"type": "error", "message": "unauthorized"}).encode("utf-8") + b"\n")
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        writer.close()
+        return False
+
+    async def _handle_client(self, reader, writer):
+        """Collect a client's audio until it disconnects"""
+        if self.token and not await self._authenticate(reader, writer):
+            return
+        self.session_count += 1
+        self.stats["clients"] += 1
+        session = _StreamSession(writer, self.session_count)
+        self.sessions.add(session)
+        try:
+            while True:
+                payload = await read_frame(reader)
+                if payload is None:
+                    break
+                if payload:
+                    session.pcm.extend(payload)
+                    if len(session.pcm) > MAX_UTTERANCE_SECONDS * SAMPLE_RATE * 2:
+                        session.send({"type": "error", "message": "utterance too long"})
+                        break
+                else:
+                    session.end_utterance()
+                self.work.set()
+            # Answer utterances that ended before the client stopped sending
+            while session.unanswered and not writer.is_closing():
+                await asyncio.sleep(self.batch_wait)
+            await writer.drain()
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError) as e:
+            log.warning("⚠️ Stream %s dropped: %s", session.session_id, e)
+        finally:
+            self.sessions.discard(session)
+            writer.close()
+
+    def _collect(self):
+        """Choose the windows of the next batch: final passes first, then due realtime passes"""
+        now = time.monotonic()
+        batch = []  # (session, kind, window) in decode order
+        for session in sorted(self.sessions, key=lambda s: s.finals[0][1] if s.finals else now):
+            if not session.finals or len(batch) >= self.max_batch:
+                continue
+            # All windows of an utterance go together, even past max_batch
+            pcm, end_time = session.finals.pop(0)
+            windows = _windows(pcm, self.window_samples) or [np.zeros(0, dtype=np.float32)]
+            batch.extend((session, ("final", end_time, len(windows)), window) for window in windows)
+
+        due = [s for s in self.sessions if s.realtime_due(now, self.realtime_interval)]
+        for session in sorted(due, key=lambda s: s.last_realtime):
+            if len(batch) >= self.max_batch:
+                break
+            samples = len(session.pcm) // 2
+            tail = session.pcm[max(0, samples - self.window_samples) * 2:]
+            session.realtime_samples = samples
+            session.last_realtime = now
+            batch.append((session, ("realtime", session.utterance), _windows(tail, self.window_samples)[0]))
+        return batch
+
+    def _next_due(self):
+        """Seconds until the next realtime pass is due, or None if no stream has new audio"""
+        waiting = [s.last_realtime + self.realtime_interval for s in self.sessions
+                   if len(s.pcm) // 2 > s.realtime_samples]
+        return max(0.0, min(waiting) - time.monotonic()) if waiting else None
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self.work.wait()
+            self.work.clear()
+            await asyncio.sleep(self.batch_wait)  # Let concurrent streams join the batch
+
+            batch = self._collect()
+            if not batch:
+                delay = self._next_due()
+                if delay is not None:
+                    loop.call_later(delay, self.work.set)
+                continue
+
+            # Empty windows (an utterance without audio) need no inference
+            windows = [window for _, _, window in batch if len(window)]
+            start_time = time.perf_counter()
+            try:
+                texts = iter(await loop.run_in_executor(self.executor, self.decoder.decode, windows)
+                             if windows else [])
+            except Exception as e:
+                log.warning("⚠️ Batch decode failed: %s", e)
+                for session, job, _ in batch:
+                    if job[0] == "final":
+                        session.unanswered = 0
+                for session in {session for session, _, _ in batch}:
+                    session.send({"type": "error", "message": str(e)})
+                self.work.set()
+                continue
+            decode_ms = round((time.perf_counter() - start_time) * 1000, 2)
+            self.stats["batches"] += 1
+            self.stats["windows"] += len(windows)
+            self.stats["max_batch"] = max(self.stats["max_batch"], len(windows))
+            self.stats["decode_ms"] += decode_ms
+
+            final_parts = []
+            for session, job, window in batch:
+                text = next(texts) if len(window) else ""
+                if job[0] == "realtime":
+                    # A realtime result for an utterance that has ended meanwhile is stale
+                    if job[1] == session.utterance and text:
+                        session.send({"type": "realtime", "text": text})
+                    continue
+                final_parts.append(text)
+                if len(final_parts) == job[2]:
+                    session.send({
+                        "type": "final",
+                        "text": " ".join(part for part in final_parts if part),
+                        "server_ms": round((time.monotonic() - job[1]) * 1000, 2),  # End of utterance to reply
+                        "decode_ms": decode_ms,
+                        "batch_size": len(windows),
+                    })
+                    final_parts = []
+                    session.unanswered -= 1
+            self.work.set()  # More passes may be due already
+
+
+async def stream_audio(host, port, audio, speed=1.0, chunk_samples=512, token=None):
+    """Stream int16 samples as one utterance and wait for its final text
+
+    Audio is sent at `speed` times real time (0 sends it all at once),
+    after the `token` frame when the server requires one.
+    Returns the final text with client-side latencies in milliseconds:
+    first_realtime_ms (from the first chunk) and final_ms (from the end of
+    the utterance).
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    start_time = time.perf_counter()
+    first_realtime = None
+    realtime_updates = 0
+
+    async def send():
+        if token:
+            write_frame(writer, token.encode("utf-8"))
+        next_deadline = time.perf_counter()
+        for offset in range(0, len(audio), chunk_samples):
+            write_frame(writer, audio[offset:offset + chunk_samples].tobytes())
+            await writer.drain()
+            if speed > 0:
+                next_deadline += chunk_samples / SAMPLE_RATE / speed
+                await asyncio.sleep(max(0.0, next_deadline - time.perf_counter()))
+        write_frame(writer, b"")
+        await writer.drain()
+        return time.perf_counter()
+
+    sender = asyncio.create_task(send())
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                raise ConnectionError("Server closed the stream before the final text")
+            message = json.loads(line)
+            if message["type"] == "realtime":
+                realtime_updates += 1
+                if first_realtime is None:
+                    first_realtime = time.perf_counter()
+            elif message["type"] == "final":
+                end_time = await sender
+                final_time = time.perf_counter()
+                break
+            else:
+                raise RuntimeError(message.get("message", "stream error"))
+    finally:
+        sender.cancel()
+        writer.close()
+
+    return {
+        "text": message["text"],
+        "audio_seconds": round(len(audio) / SAMPLE_RATE, 3),
+        "first_realtime_ms": round((first_realtime - start_time) * 1000, 2) if first_realtime else None,
+        "final_ms": round((final_time - end_time) * 1000, 2),
+        "realtime_updates": realtime_updates,
+        "server_decode_ms": message["decode_ms"],
+        "server_batch_size": message["batch_size"],
+    }
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from timeline import percentile
+
+PATTERNS = ("append", "delete_suffix", "replace_suffix", "replace_all")
+WORDS = ("alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel", "india", "juliett",
+         "kilo", "lima", "mike", "november", "oscar", "papa", "quebec", "romeo", "sierra", "tango",
+         "uniform", "victor", "whiskey", "xray", "yankee", "zulu")
+XVFB_SCREEN = "1280x720x24"
+START_TIMEOUT = 10.0     # seconds to wait for Xvfb and the capture window
+SETTLE_TIMEOUT = 2.0     # seconds to wait for the window to show the intended text
+
+CAPTURE_SCRIPT = """
+import json, sys, threading, time, tkinter as tk
+root = tk.Tk()
+root.title("whisper-typer capture")
+root.geometry("1000x300+0+0")
+field = tk.Text(root)
+field.pack(fill="both", expand=True)
+commands = []
+
+def report(event=None):
+    print(json.dumps({"t": time.monotonic(), "text": field.get("1.0", "end-1c")}), flush=True)
+    field.edit_modified(False)
+
+def read_commands():
+    for line in sys.stdin:
+        commands.append(line.strip())
+    commands.append("quit")
+
+def poll():
+    while commands:
+        command = commands.pop(0)
+        if command == "clear":
+            field.delete("1.0", "end")
+            report()
+        elif command == "focus":
+            field.focus_force()
+            print(json.dumps({"t": time.monotonic(), "ready": True}), flush=True)
+        elif command == "quit":
+            root.destroy()
+            return
+    root.after(5, poll)
+
+field.bind("<<Modified>>", report)
+threading.Thread(target=read_commands, daemon=True).start()
+root.after(5, poll)
+root.mainloop()
+"""
+
+
+def _word(index):
+    return WORDS[index % len(WORDS)]
+
+
+def pattern_steps(pattern, steps):
+    """Texts whose consecutive updates each produce one `pattern` correction
+
+    The first text is the starting state; it is typed before measuring.
+    """
+    if pattern == "append":
+        return [""] + [" ".join(_word(i) for i in range(n + 1)) for n in range(steps)]
+    if pattern == "delete_suffix":
+        words = [_word(i) for i in range(steps + 1)]
+        return [" ".join(words[:len(words) - n]) for n in range(steps + 1)]
+    if pattern == "replace_suffix":
+        return [f"the quick brown {_word(n)}" for n in range(steps + 1)]
+    if pattern == "replace_all":
+        return [f"{_word(n)} {_word(n + 1)} {_word(n + 2)}" for n in range(steps + 1)]
+    raise ValueError(f"Unknown correction pattern: {pattern}")
+
+
+class VirtualDisplay:
+    """Runs a private Xvfb server and points DISPLAY at it"""
+
+    def __init__(self, screen=XVFB_SCREEN):
+        self.screen = screen
+        self.process = None
+        self.previous_display = None
+
+    def __enter__(self):
+        if not shutil.which("Xvfb"):
+            raise RuntimeError("Xvfb is not installed (e.g. apt install xvfb)")
+        number = next(n for n in range(90, 200) if not os.path.exists(f"/tmp/.X11-unix/X{n}"))
+        self.process = subprocess.Popen(["Xvfb", f":{number}", "-screen", "0", self.screen, "-nolisten", "tcp"],
+                                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        deadline = time.monotonic() + START_TIMEOUT
+        while not os.path.exists(f"/tmp/.X11-unix/X{number}"):
+            if self.process.poll() is not None or time.monotonic() > deadline:
+                self.process.kill()
+                raise RuntimeError(f"Xvfb did not start on :{number}")
+            time.sleep(0.05)
+        self.previous_display = os.environ.get("DISPLAY")
+        os.environ["DISPLAY"] = f":{number}"
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.previous_display is None:
+            os.environ.pop("DISPLAY", None)
+        else:
+            os.environ["DISPLAY"] = self.previous_display
+        self.process.terminate()
+        self.process.wait(timeout=5)
+        return False
+
+
+class CaptureWindow:
+    """A Tk text field in a child process that reports every change with a timestamp
+
+    Timestamps are time.monotonic() values, which are comparable across
+    processes on Linux.
+    """
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.text = ""
+        self.changed_at = 0.0
+        self.ready = False
+        self.process = subprocess.Popen([sys.executable, "-c", CAPTURE_SCRIPT], stdin=subprocess.PIPE,
+                                        stdout=subprocess.PIPE, text=True, bufsize=1)
+        self.reader = threading.Thread(target=self._read, daemon=True)
+        self.reader.start()
+        self._send("focus")
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.ready, START_TIMEOUT):
+                self.close()
+                raise RuntimeError("Capture window did not start")
+
+    def _read(self):
+        for line in self.process.stdout:
+            record = json.loads(line)
+            with self.condition:
+                if record.get("ready"):
+                    self.ready = True
+                else:
+                    self.text = record["text"]
+                    self.changed_at = record["t"]
+                self.condition.notify_all()
+
+    def _send(self, command):
+        self.process.stdin.write(command + "\n")
+        self.process.stdin.flush()
+
+    def clear(self):
+        """Empty the field and give it the keyboard focus again"""
+        self._send("clear")
+        self._send("focus")
+        self.wait_for("")
+
+    def wait_for(self, expected, timeout=SETTLE_TIMEOUT):
+        """Return the time the field first showed `expected`, or None on timeout"""
+        with self.condition:
+            if self.condition.wait_for(lambda: self.text == expected, timeout):
+                return self.changed_at
+            return None
+
+    def close(self):
+        if self.process.poll() is None:
+            try:
+                self._send("quit")
+            except OSError:
+                pass
+            try:
+                self.process.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+
+def run_pattern(controller, window, pattern, steps, burst=False):
+    """Type one correction pattern into the window and check what arrived
+
+    With burst=False every update waits for the window to show it, which
+    measures the round trip of each correction. With burst=True updates are
+    sent back to back, as during fast dictation, and only the end result is
+    checked; that is where target apps drop keystrokes.
+    """
+    texts = pattern_steps(pattern, steps)
+    window.clear()
+    controller.reset()
+    if texts[0]:
+        controller.apply_text(texts[0])
+        window.wait_for(texts[0])
+    controller.output.reset_stats()
+
+    round_trips = []
+    errors = 0
+    start_time = time.monotonic()
+    for text in texts[1:]:
+        sent_at = time.monotonic()
+        controller.apply_text(text)
+        if not burst:
+            arrived_at = window.wait_for(text)
+            if arrived_at is None:
+                errors += 1
+                # Start the next update from what is actually on screen
+                controller.last_typed_text = window.text
+                controller.diff_engine.reset()
+            else:
+                round_trips.append(max(arrived_at - sent_at, 0.0) * 1000)
+    settled_at = window.wait_for(texts[-1])
+    if burst:
+        errors = int(settled_at is None)
+    elapsed = (settled_at or time.monotonic()) - start_time
+
+    stats = controller.output.stats()
+    result = {
+        "pattern": pattern,
+        "mode": "burst" if burst else "paced",
+        "updates": len(texts) - 1,
+        "errors": errors,
+        "error_rate": round(errors / (1 if burst else len(texts) - 1), 4),
+        "key_events": stats["events"],
+        "keystrokes_per_second": round(stats["events"] / elapsed, 1) if elapsed > 0 else 0.0,
+        "final_text_ok": window.text == texts[-1],
+    }
+    if round_trips:
+        result["round_trip_p50_ms"] = round(percentile(round_trips, 50), 2)
+        result["round_trip_p95_ms"] = round(percentile(round_trips, 95), 2)
+    return result
+
+
+def run_benchmark(controller, window, steps=20, repeats=3, patterns=PATTERNS):
+    """Run every pattern paced and in bursts, `repeats` times each"""
+    results = []
+    for pattern in patterns:
+        for burst in (False, True):
+            for _ in range(repeats):
+                results.append(run_pattern(controller, window, pattern, steps, burst))
+    return results
+
+
+def summarize(results):
+    """Merge repeats per pattern and mode"""
+    summary = []
+    for pattern in dict.fromkeys(r["pattern"] for r in results):
+        for mode in ("paced", "burst"):
+            runs = [r for r in results if r["pattern"] == pattern and r["mode"] == mode]
+            if not runs:
+                continue
+            trials = sum(1 if mode == "burst" else r["updates"] for r in runs)
+            entry = {
+                "pattern": pattern,
+                "mode": mode,
+                "runs": len(runs),
+                "error_rate": round(sum(r["errors"] for r in runs) / trials, 4),
+                "keystrokes_per_second": round(sum(r["keystrokes_per_second"] for r in runs) / len(runs), 1),
+            }
+            p50s = [r["round_trip_p50_ms"] for r in runs if "round_trip_p50_ms" in r]
+            if p50s:
+                entry["round_trip_p50_ms"] = round(percentile(p50s, 50), 2)
+                entry["round_trip_p95_ms"] = round(max(r["round_trip_p95_ms"] for r in runs), 2)
+            summary.append(entry)
+    return summary
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+from datetime import datetime, timezone
+
+LOGGER_NAME = "whisper_typer"
+LOG_FORMATS = ("text", "json")
+
+# LogRecord attributes that are not structured fields passed through `extra`
+_RECORD_ATTRIBUTES = frozenset(logging.makeLogRecord({}).__dict__) | {"message", "asctime", "session"}
+
+_session_id = None  # Stamped on every record; set by the app for the duration of a session
+_listener = None
+
+
+def get_logger(name):
+    """Return a logger below the whisper-typer root, e.g. get_logger("typing")"""
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
+
+
+def set_session(session_id):
+    """Tag records from any thread with `session_id` (None outside sessions)"""
+    global _session_id
+    _session_id = session_id
+
+
+class _SessionFilter(logging.Filter):
+    def filter(self, record):
+        record.session = _session_id
+        return True
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Hands enabled records to the writer thread without formatting them
+
+    The queue never leaves the process, so the record (and its arguments)
+    can be passed as is; merging the message happens on the writer thread.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, session, message and any `extra` fields"""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "session": getattr(record, "session", None),
+            "message": record.getMessage().strip(),
+        }
+        entry.update((key, value) for key, value in record.__dict__.items() if key not in _RECORD_ATTRIBUTES)
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+def setup_logging(level="INFO", fmt="text", stream=None):
+    """Write whisper-typer log records to `stream` (stdout) from a background thread
+
+    Callers only pay for a level check and, for enabled records, a queue
+    put; formatting and the (possibly blocking) write to a pipe or journald
+    happen on the writer thread. "text" prints the message alone, as the
+    console output always looked; "json" prints one structured record per
+    line. Calling it again replaces the previous configuration.
+    """
+    global _listener
+    if fmt not in LOG_FORMATS:
+        raise ValueError(f"Unknown log format: {fmt}")
+    stop_logging()
+
+    handler = logging.StreamHandler(stream or sys.stdout)
+    handler.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter("%(message)s"))
+    records = queue.SimpleQueue()
+    queue_handler = _QueueHandler(records)
+    queue_handler.addFilter(_SessionFilter())
+
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.handlers[:] = [queue_handler]
+    logger.setLevel(level)
+    logger.propagate = False
+    _listener = logging.handlers.QueueListener(records, handler)
+    _listener.start()
+    atexit.unregister(stop_logging)
+    atexit.register(stop_logging)
+
+
+def stop_logging():
+    """Write out the queued records and stop the writer thread"""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.flush()
+    _listener = None
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.handlers.clear()
+    logger.setLevel(logging.NOTSET)
+    logger.propagate = True
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+
+import os
+import queue
+import re
+import threading
+import time
+import numpy as np
+from logs import get_logger
+from process_stats import rss_mb
+
+log = get_logger(__name__)
+
+SAMPLE_RATE = 16000
+MIN_SEGMENT_SECONDS = 30   # A pause only ends a segment once it is at least this long
+MAX_SEGMENT_SECONDS = 120  # Cut here even without a pause, so the buffer stays bounded
+MIN_PAUSE_SECONDS = 0.5    # Silence needed before a segment is cut at a pause
+POLL_INTERVAL = 0.1        # seconds between checks of the recorder's buffer
+STALE_SECONDS = 1.0        # Realtime text this soon after a cut may still cover the old segment
+PROMPT_CHARS = 200         # Finalized text passed to the model as context for the next segment
+
+
+def _join(texts):
+    """Join segment texts with single spaces"""
+    return re.sub(r"\s+", " ", " ".join(t.strip() for t in texts if t)).strip()
+
+
+class SegmentCommitter:
+    """Finalizes a long dictation segment by segment while recording continues
+
+    The recorder keeps the whole recording in its frame list and decodes
+    all of it once recording stops, so memory and the final pass grow with
+    the length of the dictation. Once the buffered audio is at least
+    min_segment_seconds long, the next pause of MIN_PAUSE_SECONDS cuts it:
+    the frames are taken out of the recorder's list and decoded on a
+    background thread with the previous segments' text as the prompt. The
+    recorder's realtime and final passes then only see the current segment.
+
+    Finalized audio is released, or appended to a FLAC file when spill_dir
+    is set. Until a segment's final text is ready, the last realtime text
+    of that segment stands in for it.
+    """
+
+    def __init__(self, model, recorder, on_text=None, language="en", beam_size=5, spill_dir=None,
+                 min_segment_seconds=MIN_SEGMENT_SECONDS, max_segment_seconds=MAX_SEGMENT_SECONDS,
+                 min_pause_seconds=MIN_PAUSE_SECONDS, on_cut=None):
+        self.model = model
+        self.recorder = recorder
+        self.on_text = on_text  # Called with the full text when a segment's final text replaces its preview
+        self.on_cut = on_cut  # Called after frames were taken from the recorder, e.g. to restart tail passes
+        self.language = language
+        self.beam_size = beam_size
+        self.spill_dir = spill_dir  # Directory for FLAC files of finalized audio, None to release it
+        self.min_segment_seconds = min_segment_seconds
+        self.max_segment_seconds = max_segment_seconds
+        self.min_pause_seconds = min_pause_seconds
+        self.condition = threading.Condition()
+        self.cut_lock = threading.Lock()
+        self.segments = queue.Queue()
+        self.timeline = None
+        self.active = False
+        self.running = True
+        self.session = 0
+        self._reset()
+        self.cut_thread = threading.Thread(target=self._cut_loop, name="segment-cutter", daemon=True)
+        self.cut_thread.start()
+        self.decode_thread = threading.Thread(target=self._decode_loop, name="segment-decoder", daemon=True)
+        self.decode_thread.start()
+
+    def _reset(self):
+        self.texts = []            # Final text per cut segment, None while it is decoded
+        self.previews = []         # Last realtime text of each cut segment
+        self.preview = ""          # Last realtime text of the current segment
+        self.pending = 0
+        self.speaking = False
+        self.pause_start = None
+        self.last_cut = None
+        self.voice_since_cut = True
+        self.spill_file = None
+        self.spill_path = None
+        self.stats = {"segments": 0, "forced": 0, "max_buffer_ms": 0, "decode_ms": 0.0,
+                      "flush_wait_ms": 0.0, "spilled_seconds": 0.0}
+
+    def begin_session(self, timeline=None):
+        """Start watching a new recording"""
+        with self.condition:
+            self.session += 1
+            self._reset()
+            self.timeline = timeline
+            self.active = True
+
+    def finish(self, last_text):
+        """Wait for cut segments to be decoded and return the text of the whole session"""
+        self.active = False
+        start_time = time.perf_counter()
+        with self.condition:
+            self.condition.wait_for(lambda: self.pending == 0)
+            texts = [t if t is not None else p for t, p in zip(self.texts, self.previews)]
+        self.stats["flush_wait_ms"] = round((time.perf_counter() - start_time) * 1000, 2)
+        if self.spill_file:
+            # The last segment was decoded by the recorder, which keeps its audio
+            audio = getattr(self.recorder, "audio", None)
+            if isinstance(audio, np.ndarray):
+                self._spill((audio * 32768).clip(-32768, 32767).astype(np.int16))
+        if self.timeline and self.texts:
+            self.timeline.mark("segments_flushed", wait_ms=self.stats["flush_wait_ms"], segments=len(self.texts))
+        return _join(texts + [last_text])
+
+    def end_session(self):
+        """Stop watching; results of segments still being decoded are discarded"""
+        with self.condition:
+            self.active = False
+            self.session += 1
+            self.pending = 0
+            self.condition.notify_all()
+        self._close_spill()
+
+    def close(self):
+        """Stop the worker threads"""
+        self.end_session()
+        self.running = False
+        self.segments.put(None)
+        self.cut_thread.join(timeout=2)
+        self.decode_thread.join(timeout=2)
+
+    def on_voice_start(self):
+        """VAD callback; segments are only cut in pauses"""
+        self.speaking = True
+        self.voice_since_cut = True
+
+    def on_voice_stop(self):
+        """VAD callback; a pause starts"""
+        self.speaking = False
+        self.pause_start = time.monotonic()
+
+    def on_realtime_text(self, text):
+        """Return the session text for a realtime update of the current segment, or None if it is stale"""
+        if self.last_cut is not None and (not self.voice_since_cut or
+                                          time.monotonic() - self.last_cut < STALE_SECONDS):
+            # A pass that started before the cut decoded the old segment
+            return None
+        self.preview = text or ""
+        return self.text()
+
+    def text(self):
+        """Finalized text, previews of segments still being decoded, and the current segment"""
+        with self.condition:
+            texts = [t if t is not None else p for t, p in zip(self.texts, self.previews)]
+        return _join(texts + [self.preview])
+
+    def session_stats(self):
+        """Summary of the session's cuts for the timeline"""
+        return dict(self.stats, spill_path=self.spill_path)
+
+    def _cut_loop(self):
+        while self.running:
+            time.sleep(POLL_INTERVAL)
+            if self.active:
+                try:
+                    self._check()
+                except Exception as e:
+                    log.warning("⚠️ Segment cut failed: %s", e)
+
+    def _check(self):
+        """Cut the buffered audio at a pause, or when it gets too long"""
+        with self.cut_lock:
+            if not self.active or not getattr(self.recorder, "is_recording", True):
+                return
+            buffered_ms = sum(len(frame) for frame in self.recorder.frames) // 2 * 1000 // SAMPLE_RATE
+            self.stats["max_buffer_ms"] = max(self.stats["max_buffer_ms"], buffered_ms)
+            if buffered_ms >= self.max_segment_seconds * 1000:
+                self._cut(forced=True)
+            elif (buffered_ms >= self.min_segment_seconds * 1000 and not self.speaking and self.pause_start
+                  and time.monotonic() - self.pause_start >= self.min_pause_seconds):
+                self._cut(forced=False)
+
+    def _cut(self, forced):
+        frames = self.recorder.frames
+        count = len(frames)
+        # Slicing then deleting the first `count` frames is safe against the recorder appending more
+        pcm = b"".join(frames[:count])
+        del frames[:count]
+        self.last_cut = time.monotonic()
+        self.voice_since_cut = self.speaking
+        with self.condition:
+            self.texts.append(None)
+            self.previews.append(self.preview)
+            self.preview = ""
+            self.pending += 1
+            index = len(self.texts) - 1
+        self.segments.put((self.session, index, pcm))
+        self.stats["segments"] += 1
+        self.stats["forced"] += forced
+        if self.on_cut:
+            self.on_cut()
+        if self.timeline:
+            self.timeline.mark("segment_cut", index=index, audio_ms=len(pcm) // 2 * 1000 // SAMPLE_RATE,
+                               forced=forced, queued=self.pending, rss_mb=rss_mb())
+
+    def _decode_loop(self):
+        while True:
+            item = self.segments.get()
+            if item is None:
+                return
+            session, index, pcm = item
+            if session != self.session:
+                continue
+            try:
+                self._decode(session, index, pcm)
+            except Exception as e:
+                log.warning("⚠️ Segment transcription failed: %s", e)
+                self._finalize(session, index, None)
+
+    def _decode(self, session, index, pcm):
+        samples = np.frombuffer(pcm, dtype=np.int16)
+        with self.condition:
+            prompt = _join(self.texts[:index])[-PROMPT_CHARS:] or None
+        start_time = time.perf_counter()
+        segments, _ = self.model.transcribe(
+            samples.astype(np.float32) / 32768,
+            language=self.language,
+            beam_size=self.beam_size,
+            initial_prompt=prompt,
+            condition_on_previous_text=False,
+        )
+        text = "".join(segment.text for segment in segments)
+        decode_ms = (time.perf_counter() - start_time) * 1000
+        if session == self.session and self.spill_dir:
+            self._spill(samples)
+        self.stats["decode_ms"] += round(decode_ms, 2)
+        if self.timeline:
+            self.timeline.mark("segment_final", index=index, audio_ms=len(samples) * 1000 // SAMPLE_RATE,
+                               decode_ms=round(decode_ms, 2), chars=len(text.strip()))
+        self._finalize(session, index, text)
+
+    def _finalize(self, session, index, text):
+        with self.condition:
+            if session != self.session:
+                return
+            # Keep the realtime preview if decoding failed
+            self.texts[index] = text if text is not None else self.previews[index]
+            self.pending -= 1
+            self.condition.notify_all()
+        if self.active and self.on_text:
+            self.on_text(self.text())
+
+    def _spill(self, samples):
+        """Append finalized audio to this session's FLAC file"""
+        if not self.spill_file:
+            import soundfile as sf  # Deferred: only needed when spilling
+            os.makedirs(self.spill_dir, exist_ok=True)
+            self.spill_path = os.path.join(self.spill_dir, time.strftime("dictation-%Y%m%d-%H%M%S.flac"))
+            self.spill_file = sf.SoundFile(self.spill_path, "w", samplerate=SAMPLE_RATE, channels=1,
+                                           format="FLAC", subtype="PCM_16")
+        self.spill_file.write(samples)
+        self.stats["spilled_seconds"] = round(self.stats["spilled_seconds"] + len(samples) / SAMPLE_RATE, 2)
+
+    def _close_spill(self):
+        if self.spill_file:
+            self.spill_file.close()
+            self.spill_file = None
@@ -0,0 +1,11 @@
+#!/usr/bin/env python3
+
+import os
+
+
+def cache_path(filename):
+    """Return a path inside the per-user whisper-typer cache directory, creating it if needed"""
+    cache_root = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    directory = os.path.join(cache_root, "whisper-typer")
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, filename)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def _child_pids(pid):
+    """Return the direct children of a process (Linux only)"""
+    children = []
+    task_dir = f"/proc/{pid}/task"
+    for task in os.listdir(task_dir):
+        try:
+            with open(f"{task_dir}/{task}/children") as children_file:
+                children.extend(int(child) for child in children_file.read().split())
+        except OSError:
+            pass
+    return children
+
+
+def _process_rss_kb(pid):
+    """Read the resident set size of one process from /proc"""
+    with open(f"/proc/{pid}/status") as status_file:
+        for line in status_file:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def rss_mb(include_children=True):
+    """Current resident memory in MB, including worker processes when requested
+
+    RealtimeSTT runs the final transcription model in a child process, so
+    its memory only shows up when children are included. Falls back to the
+    peak RSS of this process on platforms without /proc.
+    """
+    if not os.path.exists("/proc/self/status"):
+        return peak_rss_mb()
+
+    pids = [os.getpid()]
+    total_kb = 0
+    while pids:
+        pid = pids.pop()
+        try:
+            total_kb += _process_rss_kb(pid)
+            if include_children:
+                pids.extend(_child_pids(pid))
+        except OSError:
+            pass  # Process exited while we were walking the tree
+    return total_kb / 1024
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB"""
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def cpu_seconds():
+    """User plus system CPU time of this process and its reaped children"""
+    if resource is None:
+        times = os.times()
+        return times.user + times.system
+    usage_self = resource.getrusage(resource.RUSAGE_SELF)
+    usage_children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return (usage_self.ru_utime + usage_self.ru_stime
+            + usage_children.ru_utime + usage_children.ru_stime)
+
+
+def system_cpu_ticks():
+    """Busy and total CPU time of the whole system in clock ticks, or None without /proc/stat"""
+    try:
+        with open("/proc/stat") as stat_file:
+            fields = [int(value) for value in stat_file.readline().split()[1:]]
+    except (OSError, ValueError):
+        return None
+    idle = fields[3] + (fields[4] if len(fields) > 4 else 0)  # idle + iowait
+    total = sum(fields[:8])  # guest time is already counted in user time
+    return total - idle, total
+
+
+def _process_cpu_ticks(pid):
+    """User plus system CPU time of one process from /proc, in clock ticks"""
+    with open(f"/proc/{pid}/stat") as stat_file:
+        # The command name may contain spaces; the fields after it are fixed
+        fields = stat_file.read().rsplit(")", 1)[1].split()
+    return int(fields[11]) + int(fields[12])  # utime, stime
+
+
+def process_tree_cpu_seconds():
+    """CPU time of this process and its running children, such as the transcription worker
+
+    Falls back to cpu_seconds() (reaped children only) on platforms without /proc.
+    """
+    if not os.path.exists("/proc/self/stat"):
+        return cpu_seconds()
+
+    pids = [os.getpid()]
+    total_ticks = 0
+    while pids:
+        pid = pids.pop()
+        try:
+            total_ticks += _process_cpu_ticks(pid)
+            pids.extend(_child_pids(pid))
+        except (OSError, IndexError, ValueError):
+            pass  # Process exited while we were walking the tree
+    return total_ticks / os.sysconf("SC_CLK_TCK")
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from logs import get_logger
+
+log = get_logger(__name__)
+
+PROFILE_SESSIONS = 3     # Sessions profiled per request
+SAMPLE_INTERVAL = 0.005  # seconds between stack samples of all threads
+TRACEMALLOC_FRAMES = 10  # Stack depth recorded per allocation
+TOP_ENTRIES = 40         # Lines in the human-readable reports
+
+
+class ThreadSampler:
+    """Samples the Python stacks of all threads from a background thread
+
+    Stacks are counted in the collapsed format of flamegraph.pl and
+    speedscope ("thread;outer;...;inner count"). Threads blocked in C code
+    (e.g. waiting on a lock) show the Python frame that made the call.
+    """
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        """Start sampling"""
+        self.thread = threading.Thread(target=self._run, name="profiler-sampler", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop sampling and wait for the sampler thread"""
+        self.stop_event.set()
+        self.thread.join(timeout=1.0)
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self.stop_event.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_code.co_name}")
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, f"thread-{thread_id}"))
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def thread_totals(self):
+        """Samples per thread name"""
+        totals = Counter()
+        for stack, count in self.stacks.items():
+            totals[stack.split(";", 1)[0]] += count
+        return totals
+
+    def write(self, path):
+        """Write the stacks in collapsed format, most frequent first"""
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class SessionProfiler:
+    """Profiles the next few sessions on request, at the cost of one check per session otherwise
+
+    request() is safe to call from a signal handler: it only sets a
+    counter. Each profiled session gets a directory under a timestamped
+    directory per request, containing:
+      profile.pstats / profile.txt  cProfile of the session thread
+      allocations.txt / .snapshot   tracemalloc growth during the session
+      stacks.txt                    sampled stacks of all threads (collapsed format)
+      summary.json                  duration, samples per thread, memory growth
+    """
+
+    def __init__(self, output_root, sessions=PROFILE_SESSIONS, sample_interval=SAMPLE_INTERVAL):
+        self.output_root = output_root
+        self.sessions = sessions
+        self.sample_interval = sample_interval
+        self.remaining = 0
+        self.directory = None  # Directory of the current request
+        self.profiled = 0
+
+    def request(self, sessions=None):
+        """Profile the next `sessions` sessions"""
+        self.remaining = sessions or self.sessions
+        self.directory = None
+
+    @contextlib.contextmanager
+    def session(self, label="session"):
+        """Context around one session; profiles it if a request is pending"""
+        if not self.remaining:
+            yield None
+            return
+        self.remaining -= 1
+        if self.directory is None:
+            self.directory = os.path.join(self.output_root, time.strftime("profile-%Y%m%d-%H%M%S"))
+        self.profiled += 1
+        directory = os.path.join(self.directory, f"{self.profiled:03d}-{label}")
+        os.makedirs(directory, exist_ok=True)
+        log.info("🔬 Profiling this session to %s", directory)
+
+        import cProfile
+        import tracemalloc
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        before = tracemalloc.take_snapshot()
+        sampler = ThreadSampler(self.sample_interval)
+        sampler.start()
+        profiler = cProfile.Profile()
+        start_time = time.perf_counter()
+        profiler.enable()
+        try:
+            yield directory
+        finally:
+            profiler.disable()
+            duration = time.perf_counter() - start_time
+            sampler.stop()
+            after = tracemalloc.take_snapshot()
+            traced, peak = tracemalloc.get_traced_memory()
+            if started_tracing:
+                tracemalloc.stop()
+            try:
+                self._write(directory, profiler, before, after, sampler, duration, traced, peak)
+            except OSError as e:
+                log.warning("⚠️ Could not write the profile: %s", e)
+            if not self.remaining:
+                log.info("🔬 Profiling finished: %s", self.directory)
+
+    def _write(self, directory, profiler, before, after, sampler, duration, traced, peak):
+        import pstats
+
+        profiler.dump_stats(os.path.join(directory, "profile.pstats"))
+        with open(os.path.join(directory, "profile.txt"), "w", encoding="utf-8") as f:
+            pstats.Stats(profiler, stream=f).sort_stats("cumulative").print_stats(TOP_ENTRIES)
+
+        after.dump(os.path.join(directory, "allocations.snapshot"))
+        growth = after.compare_to(before, "lineno")
+        with open(os.path.join(directory, "allocations.txt"), "w", encoding="utf-8") as f:
+            for stat in growth[:TOP_ENTRIES]:
+                f.write(f"{stat}\n")
+
+        sampler.write(os.path.join(directory, "stacks.txt"))
+        summary = {
+            "duration_s": round(duration, 3),
+            "samples": sampler.samples,
+            "sample_interval_s": sampler.interval,
+            "thread_samples": dict(sampler.thread_totals().most_common()),
+            "allocated_growth_kb": round(sum(stat.size_diff for stat in growth) / 1024, 1),
+            "traced_kb": round(traced / 1024, 1),
+            "traced_peak_kb": round(peak / 1024, 1),
+        }
+        with open(os.path.join(directory, "summary.json"), "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
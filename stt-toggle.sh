@@ -6,5 +6,6 @@ eval "$(pyenv init -)"
 
 echo "Starting dictation..."
 cd "$(dirname "${BASH_SOURCE[0]}")"
-uv run whisper-typer-tool.py &
+# Hands off to a running server, or falls back to one-off mode
+uv run whisper-typer-client.py toggle &
 disown
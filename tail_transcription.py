@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+
+import contextlib
+import re
+import threading
+import time
+import numpy as np
+from logs import get_logger
+
+log = get_logger(__name__)
+
+SAMPLE_RATE = 16000
+OVERLAP_SECONDS = 1.0    # Audio before the commit point that is decoded again, for context
+HOLDBACK_SECONDS = 0.5   # Words ending this close to the live edge are never committed
+MAX_TAIL_SECONDS = 20    # Beyond this the oldest words are committed even if they still change
+FORCE_KEEP_SECONDS = 5   # Seconds left uncommitted when a commit is forced
+PROMPT_CHARS = 200       # Committed text passed to the model as context
+
+
+def _normalize(word):
+    """Compare words without case and punctuation"""
+    return re.sub(r"[^\w']", "", word.lower())
+
+
+class TailWindowTranscriber:
+    """Realtime transcription that only re-decodes the uncommitted tail
+
+    Replaces the recorder's own realtime passes, which decode the whole
+    recording every time. Words are committed once two consecutive passes
+    agree on them, and later passes decode only the audio after the last
+    committed word (plus OVERLAP_SECONDS), with the committed text as the
+    prompt. The window stays a few seconds long however long the dictation
+    runs, so per-pass cost stays flat, and updates mostly append.
+
+    Audio is read from the recorder's frame list. Passes run on a
+    dedicated thread every recorder.realtime_processing_pause seconds
+    (steered by the RealtimePacer when enabled), holding `lock` so the
+    final pass can take precedence.
+    """
+
+    def __init__(self, model, recorder, on_text, language="en", lock=None):
+        self.model = model
+        self.recorder = recorder
+        self.on_text = on_text
+        self.language = language
+        self.lock = lock or contextlib.nullcontext()
+        self.timeline = None
+        self.active = False
+        self.running = True
+        self.wakeup = threading.Event()
+        self.reset()
+        self.thread = threading.Thread(target=self._run, name="tail-realtime", daemon=True)
+        self.thread.start()
+
+    def reset(self):
+        """Forget the committed text, e.g. for a new session"""
+        self.committed = ""
+        self.commit_sample = 0     # Absolute sample where the committed words end
+        self.frame_index = 0       # First recorder frame of the decode window
+        self.frame_sample = 0      # Absolute sample of that frame
+        self.decoded_samples = 0   # Recording length at the last pass
+        self.previous_words = []   # Uncommitted words of the last pass
+        self.passes = 0
+        self.restart_pending = False
+
+    def begin_session(self, timeline=None):
+        """Start transcribing a new recording"""
+        self.reset()
+        self.timeline = timeline
+        self.active = True
+        self.wakeup.set()
+
+    def restart(self):
+        """Start over on the next pass, e.g. after the recorder's frames were cut"""
+        self.restart_pending = True
+
+    def end_session(self):
+        """Stop transcribing; the final pass takes over"""
+        self.active = False
+
+    def close(self):
+        """Stop the worker thread"""
+        self.active = False
+        self.running = False
+        self.wakeup.set()
+        self.thread.join(timeout=2)
+
+    def warm_up(self, audio):
+        """Decode float32 audio once to pay first-use costs"""
+        segments, _ = self.model.transcribe(audio, language=self.language, beam_size=1)
+        list(segments)
+
+    def _run(self):
+        last_start = 0.0
+        while self.running:
+            if not self.active:
+                self.wakeup.wait()
+                self.wakeup.clear()
+                continue
+            # The pause counts from the start of the last pass, like the recorder's own passes
+            delay = last_start + self.recorder.realtime_processing_pause - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            if not self.active or not getattr(self.recorder, "is_recording", True):
+                time.sleep(0.01)
+                continue
+            last_start = time.monotonic()
+            try:
+                self._pass()
+            except Exception as e:
+                log.warning("⚠️ Realtime pass failed: %s", e)
+
+    def _window(self):
+        """PCM from the first frame of the window to the live edge, or None without new audio"""
+        frames = self.recorder.frames
+        count = len(frames)
+        # Skip whole frames that lie before the overlap, so copying stays proportional to the tail
+        start = max(0, self.commit_sample - int(OVERLAP_SECONDS * SAMPLE_RATE))
+        while self.frame_index < count and self.frame_sample + len(frames[self.frame_index]) // 2 <= start:
+            self.frame_sample += len(frames[self.frame_index]) // 2
+            self.frame_index += 1
+        pcm = b"".join(frames[self.frame_index:count])
+        end = self.frame_sample + len(pcm) // 2
+        if end <= self.decoded_samples:
+            return None
+        self.decoded_samples = end
+        return pcm
+
+    def _pass(self):
+        """Decode the tail window, commit stable words and report the text"""
+        if self.restart_pending:
+            self.reset()
+        pcm = self._window()
+        if pcm is None:
+            return
+        audio = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768
+        offset = self.frame_sample
+        start_time = time.perf_counter()
+        with self.lock:
+            segments, _ = self.model.transcribe(
+                audio,
+                language=self.language,
+                beam_size=1,
+                initial_prompt=self.committed[-PROMPT_CHARS:] or None,
+                condition_on_previous_text=False,
+                word_timestamps=True,
+            )
+            # transcribe() is lazy; decode while holding the lock
+            words = [(offset + int(w.start * SAMPLE_RATE), offset + int(w.end * SAMPLE_RATE), w.word)
+                     for segment in segments for w in (segment.words or [])]
+        decode_ms = (time.perf_counter() - start_time) * 1000
+        if self.restart_pending:
+            return  # The window was cut away while it was decoded
+
+        # Words in the overlap were committed by an earlier pass
+        words = [w for w in words if (w[0] + w[1]) // 2 >= self.commit_sample]
+        self._commit(words, offset + len(audio))
+        self.passes += 1
+
+        text = (self.committed + "".join(w[2] for w in self.previous_words)).strip()
+        if self.timeline:
+            self.timeline.mark("tail_pass", window_ms=round(len(audio) / SAMPLE_RATE * 1000),
+                               decode_ms=round(decode_ms, 2), committed_chars=len(self.committed.strip()))
+        if self.active and text:
+            self.on_text(text)
+
+    def _commit(self, words, end_sample):
+        """Commit the words this pass agrees on with the last one"""
+        agreed = 0
+        for word, previous in zip(words, self.previous_words):
+            if _normalize(word[2]) != _normalize(previous[2]):
+                break
+            agreed += 1
+        # Words at the live edge may still be cut off mid-word
+        while agreed and words[agreed - 1][1] > end_sample - HOLDBACK_SECONDS * SAMPLE_RATE:
+            agreed -= 1
+        skip_to = 0
+        # Keep the window bounded even if the transcript keeps changing
+        if end_sample - self.commit_sample > MAX_TAIL_SECONDS * SAMPLE_RATE:
+            keep_from = end_sample - FORCE_KEEP_SECONDS * SAMPLE_RATE
+            while agreed < len(words) and words[agreed][1] <= keep_from:
+                agreed += 1
+            # Silence before the first kept word need not be decoded again either
+            skip_to = min(keep_from, words[agreed][0] if agreed < len(words) else keep_from)
+
+        if agreed:
+            self.committed += "".join(w[2] for w in words[:agreed])
+            self.commit_sample = words[agreed - 1][1]
+        self.commit_sample = max(self.commit_sample, skip_to)
+        self.previous_words = words[agreed:]
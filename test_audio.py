@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+
+import sys
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+import numpy as np
+from audio import AudioManager
+
+
+class TestAudioManager(unittest.TestCase):
+    """Test cases for the pre-opened cue player"""
+    
+    def setUp(self):
+        self.pyaudio = MagicMock()
+        self.pyaudio.paContinue = 0
+        self.stream = self.pyaudio.PyAudio.return_value.open.return_value
+        self.stream.get_output_latency.return_value = 0.0
+        patcher = patch.dict(sys.modules, {"pyaudio": self.pyaudio})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.manager = AudioManager()
+        self.addCleanup(self.manager.cleanup)
+    
+    def _render(self, frames=256, latency=0.0):
+        """Run one audio callback and return the buffer it produced"""
+        time_info = {"current_time": 1.0, "output_buffer_dac_time": 1.0 + latency}
+        data, flag = self.manager._callback(None, frames, time_info, 0)
+        return np.frombuffer(data, dtype=np.int16)
+    
+    def test_stream_opened_once(self):
+        """Test that one output stream is opened at startup and reused for every cue"""
+        self.manager.play_audio_file("on.wav")
+        self.manager.play_audio_file("off.wav")
+        self.manager.play_audio_file("on.wav")
+        
+        self.pyaudio.PyAudio.return_value.open.assert_called_once()
+        self.assertIsNotNone(self.pyaudio.PyAudio.return_value.open.call_args.kwargs["stream_callback"])
+    
+    def test_silence_when_idle(self):
+        """Test that the stream plays silence while no cue is playing"""
+        buffer = self._render()
+        self.assertEqual(len(buffer), 256 * self.manager.channels)
+        self.assertFalse(buffer.any())
+    
+    def test_cue_played_and_finished(self):
+        """Test that a cue is written in full and signals when it has finished"""
+        cue = self.manager.audio_data["on.wav"]
+        done = self.manager.play_audio_file("on.wav")
+        
+        rendered = []
+        deadline = time.monotonic() + 2
+        while not done.is_set() and time.monotonic() < deadline:
+            rendered.append(self._render())
+        
+        played = np.concatenate(rendered)
+        self.assertTrue(done.is_set())
+        np.testing.assert_array_equal(played[:len(cue)], cue)
+        self.assertFalse(played[len(cue):].any())
+    
+    def test_cues_are_mixed(self):
+        """Test that overlapping cues are summed with clipping"""
+        self.manager.audio_data["a"] = np.full(512, 20000, dtype=np.int16)
+        self.manager.audio_data["b"] = np.full(256, 20000, dtype=np.int16)
+        self.manager.play_audio_file("a")
+        self.manager.play_audio_file("b")
+        
+        buffer = self._render(frames=512 // self.manager.channels)
+        self.assertEqual(buffer[0], 32767)
+        self.assertEqual(buffer[-1], 20000)
+    
+    def test_missing_cue(self):
+        """Test that an unknown cue is reported as finished immediately"""
+        self.assertTrue(self.manager.play_audio_file("missing.wav").is_set())
+    
+    def test_cleanup_releases_waiters(self):
+        """Test that pending cues are released on cleanup"""
+        done = self.manager.play_audio_file("on.wav")
+        self.manager.cleanup()
+        self.assertTrue(done.is_set())
+        self.stream.close.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
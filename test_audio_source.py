@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+
+import sys
+import time
+import unittest
+from unittest.mock import MagicMock, Mock, patch
+import numpy as np
+import soxr  # Loaded before setUp patches sys.modules, whose restore would unload the native module
+from audio_source import PrerollMicSource, WavFileSource
+from batch_transcription import SAMPLE_RATE
+
+
+class TestWavFileSource(unittest.TestCase):
+    """Test cases for replaying audio files into the recorder"""
+    
+    def test_feeds_whole_file_then_silence(self):
+        """Test that the file is fed in 16-bit chunks followed by silence"""
+        source = WavFileSource("on.wav", speed=0)
+        recorder = Mock()
+        source.attach(recorder)
+        
+        source.start_session()
+        self.assertTrue(source.finished_event.wait(timeout=5))
+        source.stop_session()
+        
+        chunks = [call.args[0] for call in recorder.feed_audio.call_args_list]
+        fed_samples = sum(len(chunk) for chunk in chunks) // 2
+        self.assertGreaterEqual(fed_samples, len(source.audio))
+        self.assertEqual(source.audio.tobytes(), b"".join(chunks)[:len(source.audio) * 2])
+    
+    def test_paced_replay(self):
+        """Test that speed=4 replays the file in about a quarter of its duration"""
+        source = WavFileSource("on.wav", speed=4)
+        source.attach(Mock())
+        
+        start_time = time.perf_counter()
+        source.start_session()
+        self.assertTrue(source.finished_event.wait(timeout=5))
+        elapsed = time.perf_counter() - start_time
+        source.stop_session()
+        
+        self.assertEqual(len(source.audio), round(14785 / 44100 * SAMPLE_RATE))
+        self.assertGreaterEqual(elapsed, source.duration / 4 * 0.8)
+        self.assertLess(elapsed, source.duration)
+    
+    def test_stop_session_stops_feeding(self):
+        """Test that no audio is fed after the session stops"""
+        source = WavFileSource("on.wav", speed=1)
+        recorder = Mock()
+        source.attach(recorder)
+        
+        source.start_session()
+        source.stop_session()
+        fed_calls = recorder.feed_audio.call_count
+        
+        source.finished_event.wait(timeout=0.1)
+        self.assertEqual(recorder.feed_audio.call_count, fed_calls)
+
+
+
+class TestPrerollMicSource(unittest.TestCase):
+    """Test cases for the always-on microphone with a pre-roll ring buffer"""
+    
+    def setUp(self):
+        self.pyaudio = MagicMock()
+        self.pyaudio.paContinue = 0
+        patcher = patch.dict(sys.modules, {"pyaudio": self.pyaudio})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.recorder = Mock()
+        self.source = PrerollMicSource(preroll_seconds=0.1)
+        self.source.attach(self.recorder)
+        self.addCleanup(self.source.close)
+    
+    def _capture(self, start, count):
+        """Deliver one capture callback with consecutive sample values"""
+        chunk = np.arange(start, start + count, dtype=np.int16).tobytes()
+        self.source._callback(chunk, count, {}, 0)
+    
+    def test_ring_buffer_is_bounded(self):
+        """Test that only the last preroll_seconds are kept between sessions"""
+        ring = self.source.ring
+        for start in range(0, 16000, 512):
+            self._capture(start, 512)
+        
+        self.assertIs(self.source.ring, ring)  # Never reallocated
+        np.testing.assert_array_equal(self.source.preroll(), np.arange(16384 - 1600, 16384, dtype=np.int16))
+        self.recorder.feed_audio.assert_not_called()
+    
+    def test_session_starts_with_preroll(self):
+        """Test that the pre-roll is fed first and live audio follows without gaps"""
+        self._capture(0, 1000)
+        self.source.start_session()
+        self._capture(1000, 512)
+        self.source.stop_session()
+        self._capture(1512, 512)
+        
+        fed = b"".join(call.args[0] for call in self.recorder.feed_audio.call_args_list)
+        np.testing.assert_array_equal(np.frombuffer(fed, dtype=np.int16), np.arange(0, 1512, dtype=np.int16))
+        self.assertTrue(all(call.args[1] == 16000 for call in self.recorder.feed_audio.call_args_list))
+    
+    def test_resume_holds_audio_until_session(self):
+        """Test that audio captured while the models reload is fed in full when the session starts"""
+        self.source.suspend()
+        self.assertIsNone(self.source.stream)
+        
+        self.source.resume()
+        self.assertIsNotNone(self.source.stream)
+        for start in range(0, 4096, 512):  # Longer than the pre-roll
+            self._capture(start, 512)
+        self.source.start_session()
+        
+        fed = b"".join(call.args[0] for call in self.recorder.feed_audio.call_args_list)
+        np.testing.assert_array_equal(np.frombuffer(fed, dtype=np.int16), np.arange(0, 4096, dtype=np.int16))
+    
+    def test_no_preroll_opens_microphone_per_session(self):
+        """Test that without a pre-roll the microphone is closed between sessions"""
+        self.pyaudio.PyAudio.reset_mock()  # Ignore the pre-roll source of setUp
+        source = PrerollMicSource(preroll_seconds=0)
+        source.attach(self.recorder)
+        self.addCleanup(source.close)
+        self.assertIsNone(source.stream)
+        
+        source.start_session()
+        self.assertIsNotNone(source.stream)
+        source.stop_session()
+        self.assertIsNone(source.stream)
+        
+        # PortAudio is initialized once, not on every hotkey press
+        source.start_session()
+        source.stop_session()
+        self.pyaudio.PyAudio.assert_called_once()
+        self.pyaudio.PyAudio.return_value.terminate.assert_not_called()
+        source.close()
+        self.pyaudio.PyAudio.return_value.terminate.assert_called_once()
+    
+    def test_falls_back_to_native_rate(self):
+        """Test that devices without 16 kHz capture are opened at their default rate"""
+        audio = self.pyaudio.PyAudio.return_value
+        audio.open.side_effect = [OSError("Invalid sample rate"), Mock()]
+        audio.get_default_input_device_info.return_value = {"defaultSampleRate": 48000.0}
+        
+        source = PrerollMicSource(preroll_seconds=0.1)
+        source.attach(self.recorder)
+        
+        self.assertEqual(source.rate, 48000)
+        self.assertEqual(len(source.ring), 1600)  # Holds resampled 16 kHz audio
+        source.close()
+    
+    def test_native_rate_is_fed_as_16k(self):
+        """Test that the recorder only ever receives 16 kHz audio from a 48 kHz device"""
+        audio = self.pyaudio.PyAudio.return_value
+        audio.open.side_effect = [OSError("Invalid sample rate"), Mock()]
+        audio.get_default_input_device_info.return_value = {"defaultSampleRate": 48000.0}
+        source = PrerollMicSource(preroll_seconds=0.1)
+        source.attach(self.recorder)
+        self.addCleanup(source.close)
+        
+        t = np.arange(48000) / 48000
+        tone = (8000 * np.sin(2 * np.pi * 440 * t)).astype(np.int16)
+        for offset in range(0, 24000, 1536):  # Half a second before the session (pre-roll)
+            source._callback(tone[offset:offset + 1536].tobytes(), 1536, {}, 0)
+        source.start_session()
+        for offset in range(24000, 48000, 1536):
+            source._callback(tone[offset:offset + 1536].tobytes(), 1536, {}, 0)
+        
+        calls = self.recorder.feed_audio.call_args_list
+        self.assertTrue(all(call.args[1] == 16000 for call in calls))
+        fed = np.frombuffer(b"".join(call.args[0] for call in calls), dtype=np.int16)
+        # 0.1s of pre-roll plus the live half second, minus what the resampler still holds
+        self.assertAlmostEqual(len(fed), 1600 + 8000, delta=200)
+        spectrum = np.abs(np.fft.rfft(fed))
+        self.assertAlmostEqual(np.argmax(spectrum) * 16000 / len(fed), 440, delta=5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+import numpy as np
+from autotune import (calibrate, choose_config, hardware_fingerprint, load_profile, save_profile,
+                      thread_candidates)
+
+
+def _result(model, rtf, beam_size=5, compute_type="int8", cpu_threads=4, realtime_pass_seconds=0.2):
+    return {"model": model, "compute_type": compute_type, "cpu_threads": cpu_threads, "beam_size": beam_size,
+            "rtf": rtf, "realtime_pass_seconds": realtime_pass_seconds}
+
+
+class TestChooseConfig(unittest.TestCase):
+    """Test cases for picking a configuration from calibration results"""
+    
+    def test_largest_model_within_target(self):
+        """Test that the largest model meeting the target wins with its fastest setting"""
+        results = [
+            _result("tiny", 0.05), _result("base", 0.2), _result("base", 0.12, beam_size=1),
+            _result("small", 0.6),
+        ]
+        choice = choose_config(results, target_rtf=0.3)
+        
+        self.assertEqual(choice["model"], "base")
+        self.assertEqual(choice["beam_size"], 1)
+        self.assertTrue(choice["meets_target"])
+    
+    def test_fastest_when_nothing_meets_target(self):
+        """Test that a slow machine gets the fastest configuration"""
+        choice = choose_config([_result("tiny", 0.8), _result("base", 1.5)], target_rtf=0.3)
+        self.assertEqual(choice["model"], "tiny")
+        self.assertFalse(choice["meets_target"])
+    
+    def test_realtime_pause_is_clamped(self):
+        """Test that the realtime pause follows the measured pass time within bounds"""
+        self.assertEqual(choose_config([_result("tiny", 0.1, realtime_pass_seconds=0.01)])
+                         ["realtime_processing_pause"], 0.05)
+        self.assertEqual(choose_config([_result("tiny", 0.1, realtime_pass_seconds=0.2)])
+                         ["realtime_processing_pause"], 0.2)
+        self.assertIsNone(choose_config([]))
+
+
+class TestProfiles(unittest.TestCase):
+    """Test cases for hardware fingerprints and the profile file"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "autotune.json")
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def test_fingerprint_is_stable(self):
+        """Test that the fingerprint key depends only on the hardware description"""
+        key, description = hardware_fingerprint()
+        self.assertEqual(hardware_fingerprint()[0], key)
+        self.assertEqual(description["cores"], os.cpu_count())
+        with patch('autotune.os.cpu_count', return_value=(os.cpu_count() or 1) + 1):
+            self.assertNotEqual(hardware_fingerprint()[0], key)
+    
+    def test_profile_round_trip(self):
+        """Test that a saved choice is found again on the same machine only"""
+        self.assertIsNone(load_profile(self.path))
+        key, description = hardware_fingerprint()
+        choice = choose_config([_result("base", 0.2)])
+        save_profile(self.path, "other-machine", {}, [], {"model": "small"})
+        save_profile(self.path, key, description, [_result("base", 0.2)], choice)
+        
+        self.assertEqual(load_profile(self.path), choice)
+        with patch('autotune.os.cpu_count', return_value=(os.cpu_count() or 1) + 1):
+            self.assertIsNone(load_profile(self.path))
+    
+    def test_thread_candidates(self):
+        """Test that half and all cores are tried"""
+        self.assertEqual(thread_candidates(8), [4, 8])
+        self.assertEqual(thread_candidates(1), [1])
+
+
+class TestCalibrate(unittest.TestCase):
+    """Test cases for the benchmark loop"""
+    
+    def test_measures_every_configuration(self):
+        """Test that each model, compute type, thread count and beam size is measured"""
+        handler = Mock(device="cpu", compute_type="int8", language="en")
+        handler.create_model.return_value.transcribe.side_effect = lambda *a, **k: (iter([]), None)
+        audio = np.zeros(16000 * 4, dtype=np.float32)
+        
+        results = calibrate(handler, audio, models=("tiny", "base"), compute_types=("int8",),
+                            threads=[2, 4], beam_sizes=(1, 5))
+        
+        self.assertEqual(len(results), 2 * 2 * 2)
+        self.assertEqual(handler.create_model.call_count, 4)
+        self.assertTrue(all(r["rtf"] >= 0 for r in results))
+    
+    def test_failed_configuration_is_skipped(self):
+        """Test that a compute type the machine cannot run is skipped"""
+        handler = Mock(device="cpu", compute_type="int8", language="en")
+        handler.create_model.side_effect = ValueError("unsupported compute type")
+        
+        self.assertEqual(calibrate(handler, np.zeros(16000, dtype=np.float32), threads=[1]), [])
+
+
+
+class TestApplyProfile(unittest.TestCase):
+    """Test cases for adopting a profile in TranscriptionHandler"""
+    
+    @patch('transcription.TranscriptionHandler._get_optimal_device', return_value=("cpu", "int8"))
+    def test_apply_profile(self, mock_device):
+        """Test that the profile replaces model, threads, beam size and realtime pause"""
+        from transcription import TranscriptionHandler
+        handler = TranscriptionHandler("tiny")
+        handler.apply_profile(choose_config([_result("base", 0.2, compute_type="float32", cpu_threads=6)]))
+        
+        self.assertEqual((handler.model_name, handler.realtime_model_name), ("base", "base"))
+        self.assertTrue(handler.shared_model)
+        self.assertEqual((handler.compute_type, handler.cpu_threads, handler.beam_size), ("float32", 6, 5))
+        self.assertEqual(handler.realtime_processing_pause, 0.2)
+    
+    @patch('transcription.TranscriptionHandler._get_optimal_device', return_value=("cpu", "int8"))
+    def test_models_get_threads_like_the_recorder(self, mock_device):
+        """Test that calibrated models get their thread count through OMP_NUM_THREADS, as the recorder does"""
+        from transcription import TranscriptionHandler
+        faster_whisper = Mock()
+        seen = []
+        faster_whisper.WhisperModel.side_effect = lambda *args, **kwargs: seen.append(
+            (os.environ.get("OMP_NUM_THREADS"), kwargs))
+        with patch.dict(sys.modules, {"faster_whisper": faster_whisper}), patch.dict(os.environ):
+            os.environ.pop("OMP_NUM_THREADS", None)
+            TranscriptionHandler("tiny").create_model(3)
+            self.assertNotIn("OMP_NUM_THREADS", os.environ)
+        
+        self.assertEqual(seen[0][0], "3")
+        self.assertNotIn("cpu_threads", seen[0][1])
+    
+    def test_explicit_compute_type_wins(self):
+        """Test that a configured compute type is kept and a replaced model is reported"""
+        from app import WhisperTyperApp
+        app = WhisperTyperApp("tiny", compute_type="float32", autotune_path="autotune.json")
+        app.transcription_handler = Mock(device="cpu")
+        choice = choose_config([_result("base", 0.2, compute_type="int8")])
+        
+        with patch('autotune.load_profile', return_value=choice), self.assertLogs("whisper_typer.app", "WARNING"):
+            app._apply_tuned_profile()
+        
+        applied = app.transcription_handler.apply_profile.call_args.args[0]
+        self.assertEqual((applied["model"], applied["compute_type"]), ("base", "float32"))
+
+
+if __name__ == '__main__':
+    unittest.main()
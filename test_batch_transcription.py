@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock
+import numpy as np
+import soundfile as sf
+import batch_transcription
+from batch_transcription import SAMPLE_RATE, find_audio_files, load_audio, plan_batches
+
+
+class TestBatchTranscription(unittest.TestCase):
+    """Test cases for offline batch transcription helpers"""
+    
+    def setUp(self):
+        """Create a small corpus of generated audio files"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.corpus = self.temp_dir.name
+        self.short_path = self._write("short.wav", seconds=1, rate=SAMPLE_RATE)
+        self.stereo_path = self._write("nested/stereo.flac", seconds=2, rate=44100, channels=2)
+        self.long_path = self._write("long.wav", seconds=6, rate=SAMPLE_RATE)
+        with open(os.path.join(self.corpus, "notes.txt"), "w") as notes:
+            notes.write("not audio")
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def _write(self, name, seconds, rate, channels=1):
+        path = os.path.join(self.corpus, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        sf.write(path, np.zeros((int(seconds * rate), channels), dtype=np.float32), rate)
+        return path
+    
+    def test_find_audio_files_walks_directories(self):
+        """Test that only WAV/FLAC files are collected, recursively"""
+        paths = find_audio_files([self.corpus])
+        
+        self.assertEqual(paths, sorted([self.short_path, self.stereo_path, self.long_path]))
+    
+    def test_load_audio_resamples_to_mono_16k(self):
+        """Test that streamed decoding downmixes and resamples"""
+        audio = load_audio(self.stereo_path, block_seconds=0.5)
+        
+        self.assertEqual(audio.ndim, 1)
+        self.assertEqual(audio.dtype, np.float32)
+        self.assertAlmostEqual(len(audio) / SAMPLE_RATE, 2.0, places=2)
+    
+    def test_plan_batches_groups_short_files(self):
+        """Test that short files share a task while long files get their own"""
+        batches = plan_batches([self.short_path, self.stereo_path, self.long_path], batch_seconds=5)
+        
+        self.assertEqual(batches, [[self.short_path, self.stereo_path], [self.long_path]])
+    
+    def test_transcribe_batch_reports_rtf_and_errors(self):
+        """Test per-file results from a worker's resident model"""
+        segment = Mock(text=" hello")
+        batch_transcription._worker_model = Mock()
+        batch_transcription._worker_model.transcribe.return_value = ([segment], Mock())
+        batch_transcription._worker_language = "en"
+        
+        results = batch_transcription._transcribe_batch([self.short_path, "missing.wav"])
+        
+        self.assertEqual(results[0]["text"], "hello")
+        self.assertAlmostEqual(results[0]["audio_seconds"], 1.0)
+        self.assertIsNotNone(results[0]["rtf"])
+        self.assertIn("error", results[1])
+        batch_transcription._worker_model.transcribe.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
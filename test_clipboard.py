@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+import clipboard
+from clipboard import PyperclipClipboard, XClipboard, create_clipboard
+
+ATOMS = {"CLIPBOARD": 101, "TARGETS": 102, "UTF8_STRING": 103, "TEXT": 104,
+         "WHISPER_TYPER_CLIPBOARD": 105, "INCR": 106}
+
+
+class TestPyperclipClipboard(unittest.TestCase):
+    """Test cases for the pyperclip fallback"""
+    
+    @patch('clipboard.RESTORE_TIMEOUT', 0)
+    @patch('pyperclip.paste', return_value="user text")
+    @patch('pyperclip.copy')
+    def test_save_and_restore(self, mock_copy, mock_paste):
+        """Test that the user's clipboard is restored after a session with pastes"""
+        clip = PyperclipClipboard()
+        clip.begin_session()
+        clip.set_text("dictated")
+        clip.end_session()
+        clip.restore_timer.join(timeout=1)
+        
+        self.assertEqual([call.args[0] for call in mock_copy.call_args_list], ["dictated", "user text"])
+    
+    @patch('pyperclip.paste', return_value="user text")
+    @patch('pyperclip.copy')
+    def test_no_restore_without_paste(self, mock_copy, mock_paste):
+        """Test that a session without pastes leaves the clipboard alone"""
+        clip = PyperclipClipboard()
+        clip.begin_session()
+        clip.end_session()
+        
+        self.assertIsNone(clip.restore_timer)
+        mock_copy.assert_not_called()
+
+
+class TestXClipboard(unittest.TestCase):
+    """Test cases for the persistent X11 selection owner"""
+    
+    def setUp(self):
+        self.display = MagicMock()
+        self.display.pending_events.return_value = 0
+        self.display.intern_atom.side_effect = ATOMS.get
+        self.fd_read, self.fd_write = os.pipe()
+        self.display.fileno.return_value = self.fd_read
+        self.window = self.display.screen.return_value.root.create_window.return_value
+        self.window.id = 42
+        self.display.get_selection_owner.return_value = self.window
+        
+        xlib = MagicMock()
+        xlib.display.Display.return_value = self.display
+        xlib.X.NONE, xlib.X.CurrentTime, xlib.X.AnyPropertyType = 0, 0, 0
+        xlib.X.SelectionClear, xlib.X.SelectionRequest, xlib.X.SelectionNotify = 29, 30, 31
+        xlib.Xatom.ATOM, xlib.Xatom.STRING = 4, 31
+        modules = {"Xlib": xlib, "Xlib.X": xlib.X, "Xlib.Xatom": xlib.Xatom, "Xlib.display": xlib.display,
+                   "Xlib.protocol": xlib.protocol, "Xlib.protocol.event": xlib.protocol.event}
+        patcher = patch.dict(sys.modules, modules)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        
+        self.clip = XClipboard()
+        self.addCleanup(self._close)
+    
+    def _close(self):
+        with patch('pyperclip.copy'):
+            self.clip.close()
+        os.close(self.fd_read)
+        os.close(self.fd_write)
+    
+    def _request(self, target):
+        """Deliver a paste request from another window to the owner thread"""
+        request = MagicMock(type=30, target=target, property=200, selection=ATOMS["CLIPBOARD"])
+        self.clip._call(lambda: self.clip._handle_event(request))
+        return request.requestor
+    
+    def test_set_text_confirms_ownership(self):
+        """Test that set_text returns after the server confirmed the new owner"""
+        self.clip.set_text("hello")
+        
+        self.window.set_selection_owner.assert_called_with(ATOMS["CLIPBOARD"], 0)
+        self.display.get_selection_owner.assert_called_with(ATOMS["CLIPBOARD"])
+    
+    def test_lost_ownership_raises(self):
+        """Test that set_text fails when another client holds the selection"""
+        self.display.get_selection_owner.return_value = MagicMock(id=7)
+        with self.assertRaises(RuntimeError):
+            self.clip.set_text("hello")
+    
+    def test_serves_paste_requests(self):
+        """Test that TARGETS and UTF8_STRING requests are answered from memory"""
+        self.clip.set_text("héllo")
+        
+        requestor = self._request(ATOMS["TARGETS"])
+        self.assertEqual(requestor.change_property.call_args.args[1], 4)
+        requestor = self._request(ATOMS["UTF8_STRING"])
+        requestor.change_property.assert_called_once_with(200, ATOMS["UTF8_STRING"], 8, "héllo".encode("utf-8"))
+        requestor.send_event.assert_called_once()
+    
+    @patch('clipboard.RESTORE_SETTLE', 0)
+    def test_restores_after_last_paste_is_fetched(self):
+        """Test that the saved clipboard comes back once the paste was served"""
+        self.window.get_full_property.return_value = MagicMock(format=8, property_type=ATOMS["UTF8_STRING"],
+                                                               value=b"user text")
+        self.clip.begin_session()
+        self.clip._call(lambda: None)
+        self.window.convert_selection.assert_called_once()
+        notify = MagicMock(type=31, property=ATOMS["WHISPER_TYPER_CLIPBOARD"])
+        self.clip._call(lambda: self.clip._handle_event(notify))
+        
+        self.clip.set_text("dictated")
+        self.clip.end_session()
+        self.clip._call(self.clip._check_restore)
+        self.assertEqual(self.clip.contents, b"dictated")  # Not fetched yet
+        
+        self._request(ATOMS["UTF8_STRING"])
+        self.clip._call(self.clip._check_restore)
+        self.assertEqual(self.clip.contents, b"user text")
+    
+    @patch('clipboard.RESTORE_SETTLE', 0.1)
+    def test_clipboard_manager_fetch_does_not_restore_early(self):
+        """Test that a fetch right after the paste (e.g. by a clipboard manager) does not end the session early"""
+        self.window.get_full_property.return_value = MagicMock(format=8, property_type=ATOMS["UTF8_STRING"],
+                                                               value=b"user text")
+        self.clip.begin_session()
+        self.clip._call(lambda: None)
+        notify = MagicMock(type=31, property=ATOMS["WHISPER_TYPER_CLIPBOARD"])
+        self.clip._call(lambda: self.clip._handle_event(notify))
+        
+        self.clip.set_text("dictated")
+        self._request(ATOMS["UTF8_STRING"])  # The manager fetches before the target got Ctrl+V
+        self.clip.end_session()
+        self.clip._call(self.clip._check_restore)
+        self.assertEqual(self.clip.contents, b"dictated")
+        
+        time.sleep(0.15)
+        self.clip._call(self.clip._check_restore)
+        self.assertEqual(self.clip.contents, b"user text")
+    
+    @patch('clipboard.RESTORE_TIMEOUT', 0)
+    def test_restores_after_timeout(self):
+        """Test that an empty clipboard is released again if the paste is never fetched"""
+        self.clip.begin_session()
+        self.clip.set_text("dictated")
+        self.clip.end_session()
+        self.clip._call(self.clip._check_restore)
+        
+        self.assertIsNone(self.clip.contents)
+        self.window.set_selection_owner.assert_called_with(0, 0)
+
+
+class TestCreateClipboard(unittest.TestCase):
+    """Test cases for clipboard selection"""
+    
+    def test_unknown_name(self):
+        """Test that an unknown clipboard name is rejected"""
+        with self.assertRaises(ValueError):
+            create_clipboard("wayland")
+    
+    @patch.dict(os.environ, {}, clear=True)
+    def test_auto_without_display(self):
+        """Test that auto falls back to pyperclip without an X display"""
+        self.assertIsInstance(create_clipboard(), PyperclipClipboard)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+
+import os
+import tempfile
+import unittest
+from control import ControlServer, send_command
+
+
+class TestControlServer(unittest.TestCase):
+    """Test cases for the server control socket"""
+
+    def setUp(self):
+        """Set up a socket path in a private temporary directory"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.temp_dir.name, "control.sock")
+        self.received = []
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _handler(self, command):
+        self.received.append(command)
+        return f"ok {command}"
+
+    def test_command_round_trip(self):
+        """Test that commands reach the handler and replies reach the client"""
+        with ControlServer(self._handler, self.socket_path):
+            self.assertEqual(send_command("status", self.socket_path), "ok status")
+            self.assertEqual(send_command("toggle", self.socket_path), "ok toggle")
+
+        self.assertEqual(self.received, ["status", "toggle"])
+
+    def test_unknown_command_is_rejected(self):
+        """Test that unknown commands never reach the handler"""
+        with ControlServer(self._handler, self.socket_path):
+            reply = send_command("reboot", self.socket_path)
+
+        self.assertTrue(reply.startswith("error"))
+        self.assertEqual(self.received, [])
+
+    def test_socket_removed_on_stop(self):
+        """Test that stopping the server removes the socket file"""
+        with ControlServer(self._handler, self.socket_path):
+            self.assertTrue(os.path.exists(self.socket_path))
+
+        self.assertFalse(os.path.exists(self.socket_path))
+
+    def test_no_server_raises_os_error(self):
+        """Test that clients can detect a missing server to fall back"""
+        with self.assertRaises(OSError):
+            send_command("status", self.socket_path)
+
+    def test_stale_socket_is_replaced(self):
+        """Test that a socket file left by a crashed server is cleaned up"""
+        with open(self.socket_path, "w"):
+            pass
+
+        with ControlServer(self._handler, self.socket_path):
+            self.assertEqual(send_command("status", self.socket_path), "ok status")
+
+    def test_second_server_refuses_to_start(self):
+        """Test that a live server is never hijacked by a second instance"""
+        with ControlServer(self._handler, self.socket_path):
+            with self.assertRaises(RuntimeError):
+                ControlServer(self._handler, self.socket_path).start()
+
+    def test_failed_second_server_keeps_the_live_socket(self):
+        """Test that stopping an instance that never bound the socket leaves it in place"""
+        with ControlServer(self._handler, self.socket_path):
+            second = ControlServer(self._handler, self.socket_path)
+            with self.assertRaises(RuntimeError):
+                second.start()
+            second.stop()
+
+            self.assertEqual(send_command("status", self.socket_path), "ok status")
+
+
+if __name__ == '__main__':
+    unittest.main()
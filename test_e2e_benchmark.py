@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import tempfile
+import unittest
+from e2e_benchmark import compare, load_manifest, summarize, word_errors
+
+
+def fixture_result(errors, words, seconds, **metrics):
+    result = {"reference_words": words, "word_errors": errors, "audio_seconds": seconds,
+              "peak_rss_mb": 500.0, "cpu_seconds": seconds / 2}
+    result.update(metrics)
+    return result
+
+
+class TestEndToEndBenchmark(unittest.TestCase):
+    """Test cases for benchmark scoring and regression gates"""
+
+    def test_word_errors(self):
+        """Test that word errors ignore case and punctuation and count edits"""
+        self.assertEqual(word_errors("Hello, world.", "hello world"), 0)
+        self.assertEqual(word_errors("the quick brown fox", "the quick fox"), 1)
+        self.assertEqual(word_errors("the quick brown fox", "a quick brown fox jumps"), 2)
+        self.assertEqual(word_errors("one two", ""), 2)
+
+    def test_load_manifest_resolves_paths(self):
+        """Test that fixture audio paths are relative to the manifest"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            manifest = os.path.join(temp_dir, "fixtures.jsonl")
+            with open(manifest, "w") as f:
+                f.write(json.dumps({"audio": "clips/a.wav", "text": "hello"}) + "\n\n")
+                f.write(json.dumps({"audio": "b.flac", "text": "world", "name": "second"}) + "\n")
+
+            fixtures = load_manifest(manifest)
+
+            self.assertEqual(fixtures[0]["audio"], os.path.join(temp_dir, "clips/a.wav"))
+            self.assertEqual(fixtures[0]["name"], "a.wav")
+            self.assertEqual(fixtures[1]["name"], "second")
+
+    def test_load_manifest_rejects_incomplete_fixtures(self):
+        """Test that a fixture without a reference transcript is an error"""
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False) as f:
+            f.write(json.dumps({"audio": "a.wav"}) + "\n")
+        self.addCleanup(os.unlink, f.name)
+
+        with self.assertRaisesRegex(ValueError, ":1:"):
+            load_manifest(f.name)
+
+    def test_summarize_weights_wer_by_words(self):
+        """Test that the corpus WER counts every reference word once"""
+        summary = summarize([
+            fixture_result(1, 10, 4.0, rtf=0.2, stop_to_final_ms=300.0, first_partial_ms=500.0),
+            fixture_result(0, 30, 6.0, rtf=0.4, stop_to_final_ms=500.0, first_partial_ms=None),
+        ])
+
+        self.assertEqual(summary["wer"], 0.025)
+        self.assertAlmostEqual(summary["rtf"], 0.3)
+        self.assertEqual(summary["cpu_per_audio_second"], 0.5)
+        self.assertEqual(summary["first_partial_p50_ms"], 500.0)
+        self.assertIn("stop_to_final_p95_ms", summary)
+
+    def test_compare_flags_regressions(self):
+        """Test that only metrics beyond the threshold fail the comparison"""
+        baseline = {"runs": [{"model": "tiny", "compute_type": "int8",
+                              "summary": {"wer": 0.10, "rtf": 0.20, "peak_rss_mb": 500.0}}]}
+        current = {"runs": [
+            {"model": "tiny", "compute_type": "int8", "summary": {"wer": 0.105, "rtf": 0.25, "peak_rss_mb": 510.0}},
+            {"model": "base", "compute_type": "int8", "summary": {"wer": 0.5}},
+        ]}
+
+        rows = compare(baseline, current, threshold=0.1, wer_threshold=0.01)
+
+        regressed = {metric for _, metric, _, _, failed in rows if failed}
+        self.assertEqual(regressed, {"rtf"})
+        self.assertEqual({key for key, *_ in rows}, {"tiny/int8"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+import endpointing
+from endpointing import AdaptiveEndpointer, endpoint_report
+
+
+class TestAdaptiveEndpointer(unittest.TestCase):
+    """Test cases for learning the silence threshold from pauses"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.stats_path = os.path.join(self.temp_dir.name, "endpointing.json")
+        self.recorder = Mock()
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def _write_pauses(self, pauses, **extra):
+        with open(self.stats_path, "w") as f:
+            json.dump({"pauses": pauses, **extra}, f)
+    
+    def test_uses_configured_threshold_until_enough_pauses(self):
+        """Test that the configured threshold applies before anything was learned"""
+        endpointer = AdaptiveEndpointer(self.stats_path, 4)
+        endpointer.begin_session(self.recorder)
+        self.assertEqual(self.recorder.post_speech_silence_duration, 4)
+    
+    def test_threshold_from_pause_percentile(self):
+        """Test that the threshold is a high percentile of learned pauses, clamped"""
+        self._write_pauses([0.5] * 99 + [1.5])
+        endpointer = AdaptiveEndpointer(self.stats_path, 4, pause_percentile=95)
+        endpointer.begin_session(self.recorder)
+        self.assertAlmostEqual(self.recorder.post_speech_silence_duration, 0.5 + endpointing.PAUSE_MARGIN)
+        
+        self._write_pauses([10.0] * 50)
+        self.assertEqual(AdaptiveEndpointer(self.stats_path, 4).threshold(), 4)
+        self._write_pauses([0.01] * 50)
+        self.assertEqual(AdaptiveEndpointer(self.stats_path, 4).threshold(), endpointing.MIN_THRESHOLD)
+    
+    @patch('endpointing.time.monotonic')
+    def test_learns_pauses_across_sessions(self, mock_monotonic):
+        """Test that pauses between VAD stop and start are persisted"""
+        endpointer = AdaptiveEndpointer(self.stats_path, 4)
+        endpointer.begin_session(self.recorder)
+        mock_monotonic.return_value = 10.0
+        endpointer.on_voice_stop()
+        mock_monotonic.return_value = 10.7
+        endpointer.on_voice_start()
+        endpointer.on_voice_stop()  # Final silence, not a pause
+        endpointer.end_session()
+        
+        reloaded = AdaptiveEndpointer(self.stats_path, 4)
+        self.assertEqual(len(reloaded.pauses), 1)
+        self.assertAlmostEqual(reloaded.pauses[0], 0.7)
+    
+    def test_sentence_end_shortens_threshold(self):
+        """Test that sentence-final punctuation ends the session sooner until speech resumes"""
+        endpointer = AdaptiveEndpointer(self.stats_path, 4)
+        endpointer.begin_session(self.recorder)
+        
+        self.assertFalse(endpointer.on_realtime_text("Hello there"))
+        endpointer.on_voice_stop()
+        self.assertFalse(endpointer.on_realtime_text("Hello there."))
+        self.assertTrue(endpointer.on_realtime_text("Hello there."))
+        self.assertEqual(self.recorder.post_speech_silence_duration, 2)
+        endpointer.on_voice_start()
+        self.assertEqual(self.recorder.post_speech_silence_duration, 4)
+    
+    def test_punctuated_partials_during_speech_keep_threshold(self):
+        """Test that Whisper's habit of ending every partial with a period does not shorten the threshold"""
+        endpointer = AdaptiveEndpointer(self.stats_path, 4)
+        endpointer.begin_session(self.recorder)
+        
+        for text in ["So.", "So I think.", "So I think we should.", "So I think we should go."]:
+            self.assertFalse(endpointer.on_realtime_text(text))
+        endpointer.on_voice_stop()
+        self.assertFalse(endpointer.on_realtime_text("So I think we should go and."))
+        self.assertEqual(self.recorder.post_speech_silence_duration, 4)
+    
+    def test_quick_restart_counts_as_truncation(self):
+        """Test that restarting right after a session learns the pause that cut it off"""
+        endpointer = AdaptiveEndpointer(self.stats_path, 4)
+        endpointer.begin_session(self.recorder)
+        endpointer.end_session()
+        
+        self.assertTrue(endpointer.begin_session(self.recorder))
+        self.assertGreaterEqual(endpointer.pauses[-1], 4)
+    
+    def test_corrupt_stats_are_ignored(self):
+        """Test that an unreadable stats file falls back to the configured threshold"""
+        with open(self.stats_path, "w") as f:
+            f.write("{not json")
+        self.assertEqual(AdaptiveEndpointer(self.stats_path, 4).threshold(), 4)
+
+
+class TestEndpointReport(unittest.TestCase):
+    """Test cases for stop latency versus truncation reporting"""
+    
+    def _record(self, started_at, typed_ms, threshold, adaptive, latency):
+        return {
+            "started_at": started_at,
+            "attributes": {"silence_threshold": threshold, "adaptive_endpointing": adaptive},
+            "events": [{"event": "final_typed", "t_ms": typed_ms}],
+            "metrics": {"speech_end_to_typed_ms": latency},
+        }
+    
+    def test_report(self):
+        """Test truncation rate from sessions restarted within the resume window"""
+        records = [
+            self._record("2025-01-01T10:00:00+00:00", 5000, 1.0, True, 1200),
+            self._record("2025-01-01T10:00:07+00:00", 5000, 1.0, True, 1100),  # 2s after the previous one
+            self._record("2025-01-01T10:05:00+00:00", 8000, 4.0, False, 4300),
+        ]
+        report = endpoint_report(records)
+        
+        self.assertEqual(report["adaptive"]["sessions"], 2)
+        self.assertEqual(report["adaptive"]["truncation_rate"], 0.5)
+        self.assertEqual(report["adaptive"]["mean_stop_latency_ms"], 1150)
+        self.assertEqual(report["fixed"]["mean_threshold_s"], 4.0)
+        self.assertEqual(report["fixed"]["truncation_rate"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+
+import asyncio
+import json
+import time
+import unittest
+import numpy as np
+from ingest import IngestServer, read_frame, stream_audio, write_frame
+
+
+class FakeDecoder:
+    """Returns each window's length in samples and records batch sizes"""
+
+    def __init__(self, delay=0.0, error=None):
+        self.delay = delay
+        self.error = error
+        self.batches = []
+
+    def decode(self, windows):
+        self.batches.append(len(windows))
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return [str(len(window)) for window in windows]
+
+
+class TestIngestServer(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the multi-client ingest server"""
+
+    async def _server(self, decoder, **kwargs):
+        server = IngestServer(decoder, port=0, **kwargs)
+        await server.start()
+        self.addAsyncCleanup(server.close)
+        return server
+
+    async def test_final_text_for_one_stream(self):
+        """Test that an utterance streamed at full speed gets its final text back"""
+        server = await self._server(FakeDecoder())
+
+        result = await stream_audio("127.0.0.1", server.port, np.ones(16000, dtype=np.int16), speed=0)
+
+        self.assertEqual(result["text"], "16000")
+        self.assertEqual(result["audio_seconds"], 1.0)
+        self.assertGreaterEqual(result["final_ms"], 0)
+
+    async def test_long_utterance_is_split_into_windows(self):
+        """Test that audio longer than 30 seconds is decoded as several windows of one final"""
+        server = await self._server(FakeDecoder(), realtime_interval=60)
+
+        result = await stream_audio("127.0.0.1", server.port, np.ones(65 * 16000, dtype=np.int16),
+                                    speed=0, chunk_samples=16000)
+
+        self.assertEqual(result["text"], "480000 480000 80000")
+        self.assertEqual(result["server_batch_size"], 3)
+
+    async def test_concurrent_streams_share_batches(self):
+        """Test that utterances ending together are decoded in one inference call"""
+        decoder = FakeDecoder(delay=0.05)
+        server = await self._server(decoder, realtime_interval=60, batch_wait=0.05)
+
+        results = await asyncio.gather(*[
+            stream_audio("127.0.0.1", server.port, np.ones(8000 * (i + 1), dtype=np.int16), speed=0)
+            for i in range(4)
+        ])
+
+        self.assertEqual([r["text"] for r in results], ["8000", "16000", "24000", "32000"])
+        self.assertGreater(server.stats["max_batch"], 1)
+        self.assertLess(len(decoder.batches), 4)
+
+    async def test_realtime_updates_while_streaming(self):
+        """Test that realtime text arrives while audio is still being sent"""
+        server = await self._server(FakeDecoder(), realtime_interval=0.05, batch_wait=0.01)
+
+        result = await stream_audio("127.0.0.1", server.port, np.ones(8000, dtype=np.int16), speed=1.0)
+
+        self.assertGreater(result["realtime_updates"], 0)
+        self.assertLess(result["first_realtime_ms"], 500)
+        self.assertEqual(result["text"], "8000")
+
+    async def test_decode_error_is_reported(self):
+        """Test that a failing decode is reported to the client instead of hanging it"""
+        server = await self._server(FakeDecoder(error=RuntimeError("out of memory")), realtime_interval=60)
+
+        with self.assertRaisesRegex(RuntimeError, "out of memory"):
+            await stream_audio("127.0.0.1", server.port, np.ones(1600, dtype=np.int16), speed=0)
+
+    async def test_token_is_required_when_set(self):
+        """Test that a client with the shared token is served and one without it is turned away"""
+        decoder = FakeDecoder()
+        server = await self._server(decoder, token="s3cret")
+
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        write_frame(writer, b"guess")
+        await writer.drain()
+        reply = json.loads(await reader.readline())
+        self.assertEqual(reply, {"type": "error", "message": "unauthorized"})
+        self.assertIsNone(await read_frame(reader))
+        writer.close()
+        self.assertEqual(decoder.batches, [])
+
+        result = await stream_audio("127.0.0.1", server.port, np.ones(1600, dtype=np.int16),
+                                    speed=0, token="s3cret")
+        self.assertEqual(result["text"], "1600")
+
+    def test_lan_bind_requires_token(self):
+        """Test that listening beyond loopback without a token is refused"""
+        with self.assertRaises(ValueError):
+            IngestServer(FakeDecoder(), host="0.0.0.0")
+        IngestServer(FakeDecoder(), host="0.0.0.0", token="s3cret").executor.shutdown()
+        IngestServer(FakeDecoder(), host="localhost").executor.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
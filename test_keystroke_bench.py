@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+
+import time
+import unittest
+from keystroke_bench import PATTERNS, pattern_steps, run_pattern, summarize
+from text_typing import TypeController
+from typing_backends import RecordingBackend
+
+
+class DroppingBackend(RecordingBackend):
+    """Loses the last backspace of every run, like a target app that cannot keep up"""
+
+    def delete(self, count):
+        super().delete(count - 1)
+
+
+class FakeWindow:
+    """Shows whatever the recording backend typed"""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    @property
+    def text(self):
+        return self.backend.text
+
+    def clear(self):
+        self.backend.text = ""
+
+    def wait_for(self, expected, timeout=0):
+        return time.monotonic() if self.backend.text == expected else None
+
+
+class TestKeystrokeBench(unittest.TestCase):
+    """Test cases for the keystroke injection benchmark"""
+
+    def test_patterns_produce_their_correction(self):
+        """Test that every update of a pattern is the correction it is named after"""
+        controller = TypeController(output="recording")
+        for pattern in PATTERNS:
+            texts = pattern_steps(pattern, 10)
+            self.assertEqual(len(texts), 11)
+            for old, new in zip(texts, texts[1:]):
+                controller.diff_engine.reset()
+                self.assertEqual(controller.get_text_diff(old, new)["type"], pattern, (old, new))
+
+    def test_run_pattern_counts_round_trips(self):
+        """Test that a faithful target shows every update"""
+        backend = RecordingBackend()
+        controller = TypeController(output=backend)
+
+        result = run_pattern(controller, FakeWindow(backend), "replace_suffix", 5)
+
+        self.assertEqual(result["errors"], 0)
+        self.assertTrue(result["final_text_ok"])
+        self.assertIn("round_trip_p50_ms", result)
+        self.assertGreater(result["key_events"], 0)
+
+    def test_dropped_keystrokes_are_errors(self):
+        """Test that lost backspaces are detected, in paced and burst mode"""
+        backend = DroppingBackend()
+        controller = TypeController(output=backend)
+        window = FakeWindow(backend)
+
+        paced = run_pattern(controller, window, "delete_suffix", 4)
+        burst = run_pattern(controller, window, "delete_suffix", 4, burst=True)
+
+        self.assertEqual(paced["errors"], 4)
+        self.assertEqual(burst["error_rate"], 1.0)
+        summary = summarize([paced, burst])
+        self.assertEqual([(s["mode"], s["error_rate"]) for s in summary], [("paced", 1.0), ("burst", 1.0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+
+import io
+import json
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from logs import get_logger, set_session, setup_logging, stop_logging
+from text_typing import TypeController
+from typing_backends import RecordingBackend
+
+
+class SlowStream(io.StringIO):
+    """A stdout that blocks on every write, like a full pipe"""
+
+    def __init__(self, delay):
+        super().__init__()
+        self.delay = delay
+        self.wrote = threading.Event()
+
+    def write(self, text):
+        time.sleep(self.delay)
+        self.wrote.set()
+        return super().write(text)
+
+
+class TestLogs(unittest.TestCase):
+    """Test cases for the queued, structured log output"""
+
+    def setUp(self):
+        self.addCleanup(stop_logging)
+        self.addCleanup(set_session, None)
+        self.stream = io.StringIO()
+
+    def test_text_format_prints_the_message(self):
+        """Test that the text format looks like the old console output"""
+        setup_logging("INFO", stream=self.stream)
+
+        get_logger("test").info("✅ %s model loaded", "tiny")
+        stop_logging()
+
+        self.assertEqual(self.stream.getvalue(), "✅ tiny model loaded\n")
+
+    def test_json_format_carries_session_and_fields(self):
+        """Test that JSON records include the session id and structured fields"""
+        setup_logging("INFO", "json", stream=self.stream)
+
+        set_session("abc123")
+        get_logger("test").info("\n✅ Complete transcription: '%s'", "hello",
+                                extra={"event": "final_text", "duration_ms": 312.5})
+        stop_logging()
+
+        record = json.loads(self.stream.getvalue())
+        self.assertEqual(record["session"], "abc123")
+        self.assertEqual(record["event"], "final_text")
+        self.assertEqual(record["duration_ms"], 312.5)
+        self.assertEqual(record["message"], "✅ Complete transcription: 'hello'")
+        self.assertEqual(record["logger"], "whisper_typer.test")
+
+    def test_writes_do_not_block_the_caller(self):
+        """Test that a slow stream is written from the background thread"""
+        stream = SlowStream(0.2)
+        setup_logging("INFO", stream=stream)
+
+        start_time = time.perf_counter()
+        get_logger("test").info("🎤 Recording...")
+        elapsed = time.perf_counter() - start_time
+
+        self.assertLess(elapsed, 0.1)
+        self.assertTrue(stream.wrote.wait(2))
+
+    def test_unknown_format_is_rejected(self):
+        """Test that only the known formats are accepted"""
+        with self.assertRaises(ValueError):
+            setup_logging("INFO", "xml")
+
+    def test_corrections_are_skipped_at_the_default_level(self):
+        """Test that per-update logging costs nothing unless DEBUG is enabled"""
+        setup_logging("INFO", stream=self.stream)
+        controller = TypeController(debounce_delay=0.0, output=RecordingBackend())
+
+        with patch.object(controller, '_log_update') as mock_log_update:
+            controller.apply_text("Hello")
+            controller.apply_text("Hello world")
+            mock_log_update.assert_not_called()
+        stop_logging()
+
+        self.assertEqual(self.stream.getvalue(), "")
+        self.assertEqual(controller.output.text, "Hello world")
+
+    def test_corrections_are_logged_at_debug(self):
+        """Test that DEBUG logs each correction with its operation and duration"""
+        setup_logging("DEBUG", "json", stream=self.stream)
+        controller = TypeController(debounce_delay=0.0, output=RecordingBackend())
+
+        controller.apply_text("Hello world")
+        controller.apply_text("Hello there")
+        stop_logging()
+
+        records = [json.loads(line) for line in self.stream.getvalue().splitlines()]
+        self.assertEqual([r["event"] for r in records], ["append", "replace_suffix"])
+        self.assertEqual(records[1]["chars_deleted"], 6)
+        self.assertEqual(records[1]["chars_typed"], 6)
+        self.assertIn("duration_ms", records[1])
+        self.assertEqual(records[0]["message"], "💬 Appending: 'Hello world'")
+
+
+if __name__ == '__main__':
+    unittest.main()
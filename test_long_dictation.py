@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+
+import os
+import tempfile
+import threading
+import unittest
+from types import SimpleNamespace
+import numpy as np
+import soundfile as sf
+from long_dictation import SAMPLE_RATE, SegmentCommitter
+
+FRAME = np.ones(SAMPLE_RATE // 10, dtype=np.int16).tobytes()  # 100ms of audio
+
+
+class FakeModel:
+    """Transcribes audio as its length in tenths of a second"""
+
+    def __init__(self, gate=None):
+        self.gate = gate  # Event the decode waits for, to hold segments in flight
+        self.prompts = []
+
+    def transcribe(self, audio, initial_prompt=None, **kwargs):
+        if self.gate:
+            self.gate.wait(2)
+        self.prompts.append(initial_prompt)
+        return [SimpleNamespace(text=f" s{len(audio) * 10 // SAMPLE_RATE}")], None
+
+
+class TestSegmentCommitter(unittest.TestCase):
+    """Test cases for segment-by-segment finalization of long dictations"""
+
+    def setUp(self):
+        self.recorder = SimpleNamespace(frames=[], is_recording=True)
+        self.updates = []
+        self.updated = threading.Event()
+
+    def _committer(self, model, **kwargs):
+        kwargs.setdefault("min_segment_seconds", 1)
+        kwargs.setdefault("max_segment_seconds", 3)
+        committer = SegmentCommitter(model, self.recorder, self._on_text, min_pause_seconds=0, **kwargs)
+        self.addCleanup(committer.close)
+        committer.begin_session()
+        return committer
+
+    def _on_text(self, text):
+        self.updates.append(text)
+        self.updated.set()
+
+    def _speak(self, committer, seconds):
+        committer.on_voice_start()
+        self.recorder.frames.extend([FRAME] * int(seconds * 10))
+        committer._check()
+
+    def test_segment_is_cut_at_a_pause(self):
+        """Test that a long enough segment is taken from the recorder at the next pause"""
+        model = FakeModel()
+        committer = self._committer(model)
+
+        self._speak(committer, 1.5)
+        self.assertEqual(len(self.recorder.frames), 15)  # No cut while speaking
+        committer.on_voice_stop()
+        committer._check()
+        self.assertEqual(self.recorder.frames, [])
+
+        self._speak(committer, 0.5)
+        committer.on_voice_stop()
+        committer._check()
+        self.assertEqual(len(self.recorder.frames), 5)  # Too short to cut
+
+        self.assertEqual(committer.finish("last words"), "s15 last words")
+        self.assertEqual(committer.stats["segments"], 1)
+        self.assertEqual(committer.stats["forced"], 0)
+
+    def test_buffer_is_bounded_without_pauses(self):
+        """Test that speech without pauses is still cut at the maximum segment length"""
+        model = FakeModel()
+        committer = self._committer(model)
+
+        for _ in range(10):
+            self._speak(committer, 1)
+
+        self.assertLessEqual(committer.stats["max_buffer_ms"], 3000)
+        self.assertEqual(len(self.recorder.frames), 10)  # Left for the recorder's final pass
+        self.assertEqual(committer.finish("tail"), "s30 s30 s30 tail")
+        self.assertEqual(committer.stats["forced"], 3)
+        self.assertEqual(model.prompts[1], "s30")  # Finalized text is the next segment's context
+
+    def test_realtime_text_includes_cut_segments(self):
+        """Test that realtime updates show previews until segments are final, and stale ones are dropped"""
+        gate = threading.Event()
+        committer = self._committer(FakeModel(gate))
+
+        self._speak(committer, 1)
+        self.assertEqual(committer.on_realtime_text("hello there"), "hello there")
+        committer.on_voice_stop()
+        committer._check()
+        self.assertIsNone(committer.on_realtime_text("hello there"))  # Pass over the old segment
+
+        committer.on_voice_start()
+        committer.last_cut -= 2
+        self.assertEqual(committer.on_realtime_text("again"), "hello there again")
+
+        gate.set()
+        self.assertTrue(self.updated.wait(2))
+        self.assertEqual(self.updates, ["s10 again"])  # The final text replaces the preview
+        self.assertEqual(committer.finish("again"), "s10 again")
+
+    def test_finalized_audio_is_spilled(self):
+        """Test that cut segments are written to one FLAC file per session"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            committer = self._committer(FakeModel(), spill_dir=os.path.join(temp_dir, "dictations"))
+            for _ in range(7):
+                self._speak(committer, 1)
+            committer.finish("")
+            committer.end_session()
+
+            self.assertEqual(sf.info(committer.spill_path).frames, 6 * SAMPLE_RATE)
+            self.assertEqual(committer.session_stats()["spilled_seconds"], 6.0)
+
+    def test_aborted_session_discards_segments(self):
+        """Test that segments still in flight are dropped when the session ends"""
+        gate = threading.Event()
+        committer = self._committer(FakeModel(gate))
+        self._speak(committer, 4)
+
+        committer.end_session()
+        gate.set()
+        committer.begin_session()
+
+        self.assertEqual(committer.finish("next"), "next")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -86,7 +86,7 @@ class TestServerMode(unittest.TestCase):
                 mock_audio.play_audio_file.assert_any_call("on.wav")
                 mock_recorder.start.assert_called_once()
                 mock_recorder.text.assert_called_once()
-                mock_typer.type_text_realtime.assert_called_with("test transcription")
+                mock_typer.apply_text.assert_called_with("test transcription")
     
     def test_record_once_functionality(self):
         """Test record_once method functionality"""
@@ -119,7 +119,287 @@ class TestServerMode(unittest.TestCase):
                 mock_audio.play_audio_file.assert_any_call("on.wav")
                 mock_recorder.start.assert_called_once()
                 mock_recorder.text.assert_called_once()
-                mock_typer.type_text_realtime.assert_called_with("test transcription")
+                mock_typer.apply_text.assert_called_with("test transcription")
+    
+    def test_record_once_with_audio_source(self):
+        """Test that a replay source replaces the microphone for a session"""
+        with patch('app.AudioManager'), \
+             patch('app.TypeController'), \
+             patch('app.TranscriptionHandler') as mock_transcription:
+            
+            mock_recorder = Mock()
+            mock_recorder.__enter__ = Mock(return_value=mock_recorder)
+            mock_recorder.__exit__ = Mock(return_value=False)
+            mock_recorder.text.return_value = "replayed"
+            mock_transcription.return_value.create_recorder.return_value = mock_recorder
+            source = Mock()
+            
+            with WhisperTyperApp(audio_source=source) as app:
+                _, kwargs = mock_transcription.return_value.create_recorder.call_args
+                self.assertFalse(kwargs['use_microphone'])
+                source.attach.assert_called_once_with(mock_recorder)
+                
+                app.record_once()
+                
+                source.start_session.assert_called_once()
+                source.stop_session.assert_called_once()
+            
+            source.close.assert_called_once()
+    
+    def test_source_without_preroll_waits_for_cue(self):
+        """Test that the microphone opens after the start cue unless a pre-roll is already capturing"""
+        for preroll_seconds, waits in ((0, True), (0.5, False)):
+            with patch('app.AudioManager') as mock_audio_manager, \
+                 patch('app.TypeController'), \
+                 patch('app.TranscriptionHandler') as mock_transcription:
+                
+                mock_recorder = Mock()
+                mock_recorder.__enter__ = Mock(return_value=mock_recorder)
+                mock_recorder.__exit__ = Mock(return_value=False)
+                mock_recorder.text.return_value = "text"
+                mock_transcription.return_value.create_recorder.return_value = mock_recorder
+                source = Mock(preroll_seconds=preroll_seconds)
+                cue_done = mock_audio_manager.return_value.play_audio_file.return_value
+                cue_done.wait.side_effect = lambda timeout: source.start_session.assert_not_called()
+                
+                with WhisperTyperApp(server_mode=True, audio_source=source) as app:
+                    app.record_once()
+                
+                self.assertEqual(cue_done.wait.called, waits)
+                source.start_session.assert_called_once()
+    
+    def test_record_once_writes_timeline(self):
+        """Test that each session is written as one timeline record"""
+        import os
+        import tempfile
+        from timeline import load_records
+        
+        with patch('app.AudioManager'), \
+             patch('app.TypeController'), \
+             patch('app.TranscriptionHandler') as mock_transcription, \
+             tempfile.TemporaryDirectory() as temp_dir:
+            
+            mock_recorder = Mock()
+            mock_recorder.__enter__ = Mock(return_value=mock_recorder)
+            mock_recorder.__exit__ = Mock(return_value=False)
+            mock_transcription.return_value.create_recorder.return_value = mock_recorder
+            mock_transcription.return_value.scheduler = None
+            timeline_path = os.path.join(temp_dir, "timeline.jsonl")
+            
+            with WhisperTyperApp(server_mode=True, timeline_path=timeline_path) as app:
+                mock_recorder.text.side_effect = lambda: app.on_recording_stop() or "done"
+                app.record_once()
+            
+            records = load_records(timeline_path)
+            self.assertEqual(len(records), 1)
+            self.assertEqual(
+                [event["event"] for event in records[0]["events"]],
+                ["hotkey", "cue_start", "cue_done", "recording_start", "recording_stop",
+                 "final_text", "final_typed", "typing_stats"]
+            )
+            self.assertIn("stop_to_typed_ms", records[0]["metrics"])
+    
+    def test_stop_requested_during_start_cue(self):
+        """Test that a stop arriving before the recorder started still ends the session early"""
+        with patch('app.AudioManager') as mock_audio_manager, \
+             patch('app.TypeController'), \
+             patch('app.TranscriptionHandler') as mock_transcription:
+            
+            mock_recorder = Mock()
+            mock_recorder.__enter__ = Mock(return_value=mock_recorder)
+            mock_recorder.__exit__ = Mock(return_value=False)
+            mock_recorder.text.return_value = "short"
+            mock_transcription.return_value.create_recorder.return_value = mock_recorder
+            
+            with WhisperTyperApp(server_mode=True, recording_mode="push") as app:
+                # The hotkey is released while the start cue is still playing
+                cue_done = mock_audio_manager.return_value.play_audio_file.return_value
+                cue_done.wait.side_effect = lambda timeout: app.stop_recording(source="release")
+                app.record_once()
+                
+                mock_recorder.start.assert_called_once()
+                mock_recorder.stop.assert_called_once()
+                self.assertEqual(app.timeline.attributes["recording_mode"], "push")
+                self.assertIsNotNone(app.timeline.first("stop_requested"))
+    
+    def test_adaptive_endpointer_sets_session_threshold(self):
+        """Test that the endpointer chooses the threshold and sees VAD and transcript events"""
+        with patch('app.AudioManager'), \
+             patch('app.TypeController'), \
+             patch('app.TranscriptionHandler') as mock_transcription:
+            
+            mock_recorder = Mock()
+            mock_recorder.__enter__ = Mock(return_value=mock_recorder)
+            mock_recorder.__exit__ = Mock(return_value=False)
+            mock_transcription.return_value.create_recorder.return_value = mock_recorder
+            endpointer = Mock(base_threshold=1.5, current_threshold=0.8)
+            endpointer.begin_session.return_value = False
+            
+            with WhisperTyperApp(server_mode=True, endpointer=endpointer) as app:
+                def speak():
+                    app.on_voice_stop()
+                    app.on_voice_start()
+                    app.on_realtime_transcription("Done.")
+                    return "Done."
+                mock_recorder.text.side_effect = speak
+                app.record_once()
+                
+                endpointer.begin_session.assert_called_once_with(mock_recorder)
+                endpointer.on_voice_stop.assert_called_once()
+                endpointer.on_voice_start.assert_called_once()
+                endpointer.on_realtime_text.assert_called_once_with("Done.")
+                endpointer.end_session.assert_called_once()
+                self.assertEqual(app.timeline.attributes["silence_threshold"], 1.5)
+                self.assertEqual(app.timeline.attributes["endpoint_threshold"], 0.8)
+    
+    def test_idle_unload_and_reload(self):
+        """Test that unloaded models are reloaded by the next session while the source keeps capturing"""
+        with patch('app.AudioManager'), \
+             patch('app.TypeController'), \
+             patch('app.TranscriptionHandler') as mock_transcription:
+            
+            recorders = []
+            def create_recorder(**kwargs):
+                recorder = Mock()
+                recorder.__enter__ = Mock(return_value=recorder)
+                recorder.__exit__ = Mock(return_value=False)
+                recorder.text.return_value = "after reload"
+                recorders.append(recorder)
+                return recorder
+            mock_transcription.return_value.create_recorder.side_effect = create_recorder
+            mock_transcription.return_value.device = "cpu"
+            source = Mock()
+            
+            with WhisperTyperApp(server_mode=True, audio_source=source) as app:
+                app.unload()
+                
+                self.assertFalse(app.loaded)
+                recorders[0].__exit__.assert_called_once()
+                source.suspend.assert_called_once()
+                
+                source.resume.side_effect = lambda: self.assertEqual(len(recorders), 1)
+                app.record_once()
+                
+                source.resume.assert_called_once()
+                self.assertEqual(len(recorders), 2)
+                self.assertIs(app.recorder, recorders[1])
+                source.attach.assert_called_with(recorders[1])
+                recorders[1].start.assert_called_once()
+                self.assertTrue(app.timeline.attributes["reloaded"])
+                self.assertIn("model_reload_ms", app.timeline.metrics())
+    
+    def test_adaptive_realtime_pacer_follows_session(self):
+        """Test that the realtime pacer sees VAD and stop events and reports its decisions"""
+        with patch('app.AudioManager'), \
+             patch('app.TypeController'), \
+             patch('app.TranscriptionHandler') as mock_transcription:
+            
+            mock_recorder = Mock()
+            mock_recorder.__enter__ = Mock(return_value=mock_recorder)
+            mock_recorder.__exit__ = Mock(return_value=False)
+            mock_transcription.return_value.create_recorder.return_value = mock_recorder
+            pacer = mock_transcription.return_value.pacer
+            pacer.session_stats.return_value = {"passes": 3, "mean_pass_ms": 40.0, "interval_ms": 80.0}
+            
+            with WhisperTyperApp(server_mode=True, adaptive_realtime=True) as app:
+                def speak():
+                    app.on_voice_start()
+                    app.on_voice_stop()
+                    app.on_recording_stop()
+                    return "paced"
+                mock_recorder.text.side_effect = speak
+                app.record_once()
+                
+                _, kwargs = mock_transcription.call_args
+                self.assertTrue(kwargs["adaptive_realtime"])
+                pacer.begin_session.assert_called_once_with(app.timeline)
+                pacer.on_voice_start.assert_called_once()
+                pacer.on_voice_stop.assert_called_once()
+                pacer.on_final_pending.assert_called_once()
+                self.assertEqual(app.timeline.metrics()["realtime_pass_ms"], 40.0)
+    
+    def test_tail_realtime_follows_session(self):
+        """Test that the tail-window transcriber runs only while recording and is closed on exit"""
+        with patch('app.AudioManager'), \
+             patch('app.TypeController'), \
+             patch('app.TranscriptionHandler') as mock_transcription:
+            
+            mock_recorder = Mock()
+            mock_recorder.__enter__ = Mock(return_value=mock_recorder)
+            mock_recorder.__exit__ = Mock(return_value=False)
+            mock_transcription.return_value.create_recorder.return_value = mock_recorder
+            tail = mock_transcription.return_value.create_tail_transcriber.return_value
+            
+            with WhisperTyperApp(server_mode=True, realtime_mode="tail") as app:
+                def speak():
+                    tail.begin_session.assert_called_once_with(app.timeline)
+                    tail.end_session.assert_not_called()
+                    return "tail"
+                mock_recorder.text.side_effect = speak
+                app.record_once()
+                
+                _, kwargs = mock_transcription.call_args
+                self.assertEqual(kwargs["realtime_mode"], "tail")
+                mock_transcription.return_value.create_tail_transcriber.assert_called_once_with(
+                    mock_recorder, app.on_realtime_transcription)
+                tail.end_session.assert_called_once()
+            tail.close.assert_called_once()
+    
+    def test_long_dictation_prepends_cut_segments(self):
+        """Test that realtime and final text include segments finalized during the session"""
+        with patch('app.AudioManager'), \
+             patch('app.TypeController') as mock_type_controller, \
+             patch('app.TranscriptionHandler') as mock_transcription:
+            
+            mock_recorder = Mock()
+            mock_recorder.__enter__ = Mock(return_value=mock_recorder)
+            mock_recorder.__exit__ = Mock(return_value=False)
+            mock_transcription.return_value.create_recorder.return_value = mock_recorder
+            mock_typer = mock_type_controller.return_value
+            segmenter = mock_transcription.return_value.create_segment_committer.return_value
+            segmenter.on_realtime_text.side_effect = lambda text: None if text == "stale" else "first " + text
+            segmenter.finish.side_effect = lambda text: "first " + text
+            segmenter.session_stats.return_value = {"segments": 1}
+            
+            with WhisperTyperApp(server_mode=True, long_dictation=True, spill_dir="/tmp/spill") as app:
+                def speak():
+                    app.on_voice_start()
+                    app.on_realtime_transcription("stale")
+                    app.on_realtime_transcription("second")
+                    app.on_voice_stop()
+                    return "second"
+                mock_recorder.text.side_effect = speak
+                app.record_once()
+                
+                _, kwargs = mock_transcription.return_value.create_segment_committer.call_args
+                self.assertEqual(kwargs["spill_dir"], "/tmp/spill")
+                segmenter.begin_session.assert_called_once_with(app.timeline)
+                segmenter.on_voice_start.assert_called_once()
+                segmenter.on_voice_stop.assert_called_once()
+                applied = [c.args[0] for c in mock_typer.apply_text.call_args_list]
+                self.assertNotIn("stale", " ".join(applied))
+                mock_typer.apply_text.assert_called_with("first second")
+                segmenter.end_session.assert_called_once()
+            segmenter.close.assert_called_once()
+    
+    def test_warmup_runs_before_first_session(self):
+        """Test that the optional warm-up runs during initialization"""
+        with patch('app.AudioManager'), \
+             patch('app.TypeController'), \
+             patch('app.TranscriptionHandler') as mock_transcription, \
+             patch('warmup.warm_up_recorder', return_value=["warmup_vad"]) as mock_warm_up:
+            
+            mock_recorder = Mock()
+            mock_recorder.__enter__ = Mock(return_value=mock_recorder)
+            mock_recorder.__exit__ = Mock(return_value=False)
+            mock_recorder.text.return_value = "warm"
+            mock_transcription.return_value.create_recorder.return_value = mock_recorder
+            
+            with WhisperTyperApp(server_mode=True, warmup=True) as app:
+                mock_warm_up.assert_called_once_with(mock_recorder, app.warmup_timeline)
+                app.record_once()
+                self.assertTrue(app.timeline.attributes["warmed_up"])
+                self.assertEqual(app.timeline.attributes["session_index"], 1)
     
     def test_cleanup_with_persistent_recorder(self):
         """Test proper cleanup of persistent recorder"""
@@ -179,6 +459,142 @@ class TestWhisperTyperServerModule(unittest.TestCase):
                 
         except Exception as e:
             self.fail(f"Could not import or test WhisperTyperServer: {e}")
+    
+    def test_control_commands(self):
+        """Test control socket commands drive the persistent app"""
+        import os
+        import importlib.util
+        
+        server_path = os.path.join(os.path.dirname(__file__), 'whisper-typer-server.py')
+        spec = importlib.util.spec_from_file_location("whisper_typer_server", server_path)
+        server_module = importlib.util.module_from_spec(spec)
+        
+        with patch('pynput.keyboard'), \
+             patch('app.WhisperTyperApp'):
+            spec.loader.exec_module(server_module)
+            server = server_module.WhisperTyperServer()
+            server.app = Mock()
+            
+            with patch.object(server, '_start_recording') as mock_start:
+                self.assertEqual(server._handle_control_command("status"), "ok idle")
+                self.assertEqual(server._handle_control_command("stop"), "ok idle")
+                self.assertEqual(server._handle_control_command("toggle"), "ok recording")
+                mock_start.assert_called_once()
+            
+            server.is_recording = True
+            self.assertEqual(server._handle_control_command("toggle"), "ok stopping")
+            server.app.stop_recording.assert_called_once()
+            self.assertEqual(server._handle_control_command("abort"), "ok aborted")
+            server.app.abort_recording.assert_called_once()
+    
+    def test_duplicate_server_exits_before_loading_the_model(self):
+        """Test that a second instance fails on the control socket and leaves it to the first"""
+        server = self._load_server("auto")
+        server.app = None
+        
+        with patch('control.ControlServer._remove_stale_socket',
+                   side_effect=RuntimeError("Another server is already listening")), \
+             patch.object(type(server), 'shutdown') as mock_shutdown, \
+             patch('os.unlink') as mock_unlink:
+            with self.assertRaises(SystemExit):
+                server.start()
+        
+        self.assertIsNone(server.app)
+        self.assertIsNone(server.control_server)
+        mock_shutdown.assert_not_called()
+        mock_unlink.assert_not_called()
+    
+    def test_control_commands_wait_for_the_model(self):
+        """Test that commands arriving while the model loads are refused"""
+        server = self._load_server("auto")
+        server.is_loading = True
+        
+        self.assertEqual(server._handle_control_command("start"), "error loading model")
+        self.assertFalse(server.is_recording)
+    
+    def test_profile_command_profiles_next_session(self):
+        """Test that the profile command wraps the next session in the profiler"""
+        server = self._load_server("auto")
+        
+        self.assertEqual(server._handle_control_command("profile"), "ok profiling 3")
+        with patch.object(server.profiler, 'session') as mock_session:
+            server._record_session()
+            mock_session.assert_called_once_with("session-1")
+            server.app.record_once.assert_called_once()
+    
+    def _load_server(self, recording_mode):
+        """Load the server script and create a server with a mock app"""
+        import os
+        import importlib.util
+        
+        server_path = os.path.join(os.path.dirname(__file__), 'whisper-typer-server.py')
+        spec = importlib.util.spec_from_file_location("whisper_typer_server", server_path)
+        server_module = importlib.util.module_from_spec(spec)
+        
+        with patch('pynput.keyboard'), \
+             patch('app.WhisperTyperApp'):
+            spec.loader.exec_module(server_module)
+            server = server_module.WhisperTyperServer(recording_mode=recording_mode)
+        server.app = Mock()
+        return server
+    
+    def test_push_to_talk(self):
+        """Test that holding the hotkey records and releasing it finalizes immediately"""
+        server = self._load_server("push")
+        
+        with patch.object(server, '_start_recording', side_effect=lambda t: setattr(server, 'is_recording', True)) \
+                as mock_start:
+            server._on_key_press(server.hotkey)
+            server._on_key_press(server.hotkey)  # Auto-repeat while held
+            mock_start.assert_called_once()
+            server.app.stop_recording.assert_not_called()
+            
+            server._on_key_release(server.hotkey)
+            server.app.stop_recording.assert_called_once_with(source="release")
+    
+    def test_toggle_to_stop(self):
+        """Test that pressing the hotkey again finalizes immediately"""
+        server = self._load_server("toggle")
+        
+        with patch.object(server, '_start_recording', side_effect=lambda t: setattr(server, 'is_recording', True)):
+            server._on_key_press(server.hotkey)
+            server._on_key_release(server.hotkey)
+            server.app.stop_recording.assert_not_called()
+            
+            server._on_key_press(server.hotkey)
+            server.app.stop_recording.assert_called_once_with(source="hotkey")
+    
+    def test_auto_mode_ignores_second_press(self):
+        """Test that the default mode keeps waiting for silence"""
+        server = self._load_server("auto")
+        server.is_recording = True
+        
+        server._on_key_press(server.hotkey)
+        server._on_key_release(server.hotkey)
+        server.app.stop_recording.assert_not_called()
+    
+    def test_idle_unload(self):
+        """Test that the model is unloaded only after the idle period and never mid-session"""
+        server = self._load_server("auto")
+        server.app.loaded = True
+        
+        with patch.dict(server._check_idle.__globals__, {"IDLE_UNLOAD_MINUTES": 1}):
+            server._check_idle()
+            server.app.unload.assert_not_called()
+            
+            server.last_activity -= 120
+            server.is_recording = True
+            server._check_idle()
+            server.app.unload.assert_not_called()
+            
+            server.is_recording = False
+            server._check_idle()
+            server.app.unload.assert_called_once()
+    
+    def test_unknown_recording_mode(self):
+        """Test that an unknown recording mode is rejected"""
+        with self.assertRaises(ValueError):
+            self._load_server("hold")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from session_profiler import SessionProfiler, ThreadSampler
+
+
+def busy_work(stop_event):
+    while not stop_event.is_set():
+        sum(range(1000))
+
+
+class TestSessionProfiler(unittest.TestCase):
+    """Test cases for on-demand session profiling"""
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.root = temp_dir.name
+
+    def test_inactive_profiler_writes_nothing(self):
+        """Test that sessions are not profiled without a request"""
+        profiler = SessionProfiler(self.root)
+
+        with profiler.session() as directory:
+            pass
+
+        self.assertIsNone(directory)
+        self.assertEqual(os.listdir(self.root), [])
+
+    def test_request_profiles_the_next_sessions(self):
+        """Test that a request covers exactly the requested number of sessions"""
+        profiler = SessionProfiler(self.root, sample_interval=0.001)
+        profiler.request(2)
+
+        directories = []
+        for index in range(3):
+            with profiler.session(f"session-{index}") as directory:
+                sum(range(10000))
+                time.sleep(0.02)
+            directories.append(directory)
+
+        self.assertIsNone(directories[2])
+        self.assertEqual(os.path.dirname(directories[0]), os.path.dirname(directories[1]))
+        for name in ("profile.pstats", "profile.txt", "allocations.txt", "stacks.txt", "summary.json"):
+            self.assertTrue(os.path.exists(os.path.join(directories[0], name)), name)
+        with open(os.path.join(directories[0], "summary.json")) as f:
+            summary = json.load(f)
+        self.assertGreater(summary["samples"], 0)
+        self.assertIn("MainThread", summary["thread_samples"])
+
+    def test_sampler_sees_named_threads(self):
+        """Test that stacks of other threads are attributed to the thread name"""
+        stop_event = threading.Event()
+        worker = threading.Thread(target=busy_work, args=(stop_event,), name="busy-worker", daemon=True)
+        worker.start()
+        sampler = ThreadSampler(interval=0.001)
+
+        sampler.start()
+        time.sleep(0.05)
+        sampler.stop()
+        stop_event.set()
+        worker.join()
+
+        self.assertGreater(sampler.thread_totals()["busy-worker"], 0)
+        self.assertTrue(any(stack.startswith("busy-worker;") and "busy_work" in stack for stack in sampler.stacks))
+        self.assertNotIn("profiler-sampler", sampler.thread_totals())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import time
+import unittest
+from import_profile import HEAVY_MODULES
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Budgets can be tightened or relaxed per machine through the environment
+IMPORT_BUDGET_MS = float(os.environ.get("WHISPER_TYPER_IMPORT_BUDGET_MS", 300))
+COLD_START_BUDGET_MS = float(os.environ.get("WHISPER_TYPER_COLD_START_BUDGET_MS", 15000))
+
+COLD_START_SCRIPT = """
+import json, os, sys, time
+# Align the session timeline with the moment the parent launched us
+launch_time = time.perf_counter() - (time.time() - float(os.environ["WHISPER_TYPER_LAUNCH_TIME"]))
+from app import WhisperTyperApp
+from audio_source import WavFileSource
+from typing_backends import RecordingBackend
+with WhisperTyperApp("tiny", 0.5, audio_source=WavFileSource("on.wav", speed=0), output=RecordingBackend()) as app:
+    app.record_once(launch_time)
+    print(json.dumps(app.timeline.first("recording_start")))
+"""
+
+
+def run_python(code, env=None):
+    """Run code in a fresh interpreter from the project directory"""
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=PROJECT_DIR, capture_output=True, text=True, env=env, check=True,
+    )
+
+
+class TestStartupBudget(unittest.TestCase):
+    """Regression tests for cold-start cost of the entry points"""
+    
+    def test_app_import_defers_heavy_modules(self):
+        """Test that importing the app loads none of the heavy dependencies"""
+        result = run_python(
+            "import json, sys, app\n"
+            f"print(json.dumps([m for m in {list(HEAVY_MODULES)!r} if m in sys.modules]))"
+        )
+        
+        self.assertEqual(json.loads(result.stdout), [])
+    
+    def test_app_import_within_budget(self):
+        """Test that importing the app stays within the import budget"""
+        def best_of(code, runs=3):
+            timings = []
+            for _ in range(runs):
+                start_time = time.perf_counter()
+                run_python(code)
+                timings.append(time.perf_counter() - start_time)
+            return min(timings)
+        
+        import_ms = (best_of("import app") - best_of("pass")) * 1000
+        
+        self.assertLess(import_ms, IMPORT_BUDGET_MS)
+    
+    @unittest.skipUnless(importlib.util.find_spec("RealtimeSTT"), "RealtimeSTT not installed")
+    def test_cold_start_to_recording_within_budget(self):
+        """Test that a fresh process starts recording within the cold-start budget"""
+        env = dict(os.environ, WHISPER_TYPER_LAUNCH_TIME=repr(time.time()))
+        result = run_python(COLD_START_SCRIPT, env=env)
+        
+        recording_start_ms = json.loads(result.stdout.strip().splitlines()[-1])
+        self.assertLess(recording_start_ms, COLD_START_BUDGET_MS)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+
+import unittest
+from types import SimpleNamespace
+import numpy as np
+from tail_transcription import MAX_TAIL_SECONDS, SAMPLE_RATE, TailWindowTranscriber
+
+WORD_SAMPLES = SAMPLE_RATE // 2  # One word every half second
+FRAME_SAMPLES = 512
+
+
+def dictation(words):
+    """int16 audio where word k is a run of the value k + 1, separated by silence"""
+    audio = np.zeros(words * WORD_SAMPLES, dtype=np.int16)
+    for k in range(words):
+        audio[k * WORD_SAMPLES + 800:(k + 1) * WORD_SAMPLES - 800] = k + 1
+    return audio
+
+
+class FakeModel:
+    """Transcribes each run of a constant value as the word 'w<value>'"""
+
+    def __init__(self, unstable=False):
+        self.unstable = unstable  # Vary every word on every pass, so nothing ever agrees
+        self.windows = []
+        self.prompts = []
+
+    def transcribe(self, audio, initial_prompt=None, **kwargs):
+        self.windows.append(len(audio))
+        self.prompts.append(initial_prompt)
+        values = np.round(audio * 32768).astype(np.int32)
+        bounds = [0, *(np.flatnonzero(np.diff(values)) + 1), len(values)]
+        suffix = f"-{len(self.windows)}" if self.unstable else ""
+        words = [SimpleNamespace(start=a / SAMPLE_RATE, end=b / SAMPLE_RATE, word=f" w{values[a]}{suffix}")
+                 for a, b in zip(bounds, bounds[1:]) if values[a]]
+        return [SimpleNamespace(words=words)], None
+
+
+class TestTailWindowTranscriber(unittest.TestCase):
+    """Test cases for realtime passes over the uncommitted tail only"""
+
+    def setUp(self):
+        self.recorder = SimpleNamespace(frames=[], realtime_processing_pause=0.1, is_recording=True)
+        self.texts = []
+
+    def _transcriber(self, model):
+        transcriber = TailWindowTranscriber(model, self.recorder, self.texts.append)
+        self.addCleanup(transcriber.close)
+        transcriber.active = True  # Passes are driven by the test, not the worker thread
+        return transcriber
+
+    def _dictate(self, transcriber, audio, pass_every=WORD_SAMPLES):
+        """Feed audio frame by frame, running a pass every `pass_every` samples"""
+        for offset in range(0, len(audio), FRAME_SAMPLES):
+            self.recorder.frames.append(audio[offset:offset + FRAME_SAMPLES].tobytes())
+            if (offset + FRAME_SAMPLES) % pass_every < FRAME_SAMPLES:
+                transcriber._pass()
+
+    def test_long_dictation_decodes_a_bounded_window(self):
+        """Test that a minute of speech is transcribed with a window that does not grow"""
+        model = FakeModel()
+        transcriber = self._transcriber(model)
+
+        self._dictate(transcriber, dictation(120))
+
+        self.assertEqual(self.texts[-1], " ".join(f"w{k}" for k in range(1, 121)))
+        self.assertLess(max(model.windows), 4 * SAMPLE_RATE)
+        self.assertGreater(transcriber.frame_index, 0)  # Old frames are not copied again
+        self.assertIn("w119", transcriber.committed)
+        self.assertEqual(len(model.prompts[-1]), 200)  # Committed text is passed as context
+        self.assertIn(model.prompts[-1], transcriber.committed)
+
+    def test_updates_are_append_mostly(self):
+        """Test that committed text is never revised by later passes"""
+        transcriber = self._transcriber(FakeModel())
+
+        self._dictate(transcriber, dictation(20))
+
+        committed = [text for text in self.texts if text]
+        for earlier, later in zip(committed, committed[1:]):
+            common = len(earlier) - len(earlier.split()[-1])  # Only the newest word may change
+            self.assertEqual(later[:common], earlier[:common])
+
+    def test_unstable_transcript_is_force_committed(self):
+        """Test that the window stays bounded even if passes never agree"""
+        model = FakeModel(unstable=True)
+        transcriber = self._transcriber(model)
+
+        self._dictate(transcriber, dictation(120))
+
+        self.assertLess(max(model.windows), (MAX_TAIL_SECONDS + 2) * SAMPLE_RATE)
+        self.assertTrue(transcriber.committed)
+
+    def test_no_pass_without_new_audio(self):
+        """Test that a pass is skipped when no audio arrived since the last one"""
+        model = FakeModel()
+        transcriber = self._transcriber(model)
+        self._dictate(transcriber, dictation(2))
+        passes = len(model.windows)
+
+        transcriber._pass()
+
+        self.assertEqual(len(model.windows), passes)
+
+
+if __name__ == '__main__':
+    unittest.main()
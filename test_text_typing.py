@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
 
 import unittest
-from unittest.mock import Mock, patch, MagicMock
+from text_diff import IncrementalDiffEngine, common_prefix_length
 from text_typing import TypeController
+from typing_backends import RecordingBackend
 
 
 class TestTypeController(unittest.TestCase):
@@ -10,7 +11,11 @@ class TestTypeController(unittest.TestCase):
     
     def setUp(self):
         """Set up test fixtures"""
-        self.type_controller = TypeController(debounce_delay=0.0)  # No debouncing for tests
+        # No debouncing, and a stub output so no keystrokes reach the desktop
+        self.type_controller = TypeController(debounce_delay=0.0, output=RecordingBackend())
+    
+    def tearDown(self):
+        self.type_controller.output.close()
     
     def test_get_text_diff_append(self):
         """Test append case in text diff"""
@@ -78,33 +83,41 @@ class TestTypeController(unittest.TestCase):
         self.assertEqual(self.type_controller.last_typed_text, "")
         self.assertEqual(self.type_controller.last_update_time, 0)
     
-    @patch('text_typing.pyperclip.copy')
-    @patch('text_typing.keyboard.Controller')
-    def test_type_text_realtime_skip_empty(self, mock_keyboard, mock_clipboard):
+    def test_type_text_realtime_skip_empty(self):
         """Test that empty text is skipped"""
         self.type_controller.type_text_realtime("")
         self.type_controller.type_text_realtime(None)
         self.type_controller.type_text_realtime("   ")
         
-        mock_keyboard.assert_not_called()
-        mock_clipboard.assert_not_called()
+        self.assertEqual(self.type_controller.output.events, [])
     
-    @patch('text_typing.pyperclip.copy')
-    @patch('text_typing.keyboard.Controller')
-    def test_type_text_realtime_skip_duplicate(self, mock_keyboard, mock_clipboard):
+    def test_type_text_realtime_skip_duplicate(self):
         """Test that duplicate text is skipped"""
         self.type_controller.last_typed_text = "Hello"
         self.type_controller.type_text_realtime("Hello")
         
-        mock_keyboard.assert_not_called()
-        mock_clipboard.assert_not_called()
+        self.assertEqual(self.type_controller.output.events, [])
+    
+    def test_recording_output_tracks_corrections(self):
+        """Test that corrections applied through a stub output leave the final text"""
+        output = RecordingBackend()
+        type_controller = TypeController(debounce_delay=0.0, output=output)
+        
+        for text in ["Hello", "Hello wor", "Hello world", "Hello there", "Hi"]:
+            type_controller.type_text_realtime(text)
+        
+        self.assertEqual(output.text, "Hi")
+        self.assertEqual(output.events[0][1:], ('paste', 'Hello'))
 
 
 class TestTextDiffAlgorithm(unittest.TestCase):
     """Test cases specifically for text diff algorithm performance"""
     
     def setUp(self):
-        self.type_controller = TypeController()
+        self.type_controller = TypeController(output=RecordingBackend())
+    
+    def tearDown(self):
+        self.type_controller.output.close()
     
     def test_word_boundary_handling(self):
         """Test that word boundaries are handled correctly"""
@@ -131,9 +144,68 @@ class TestTextDiffAlgorithm(unittest.TestCase):
         diff = self.type_controller.get_text_diff(old_text, new_text)
         
         self.assertEqual(diff['type'], 'replace_suffix')
-        self.assertEqual(diff['chars_to_delete'], 15)  # " quick brown fox"
+        self.assertEqual(diff['chars_to_delete'], 16)  # " quick brown fox"
         self.assertEqual(diff['text'], ' fast brown fox')
 
 
+
+class TestIncrementalDiffEngine(unittest.TestCase):
+    """Test cases for the linear-time diff engine"""
+    
+    def test_common_prefix_length_across_blocks(self):
+        """Test prefix detection on both sides of block boundaries"""
+        base = "x" * 1000
+        for divergence in (0, 1, 255, 256, 257, 999):
+            changed = base[:divergence] + "y" + base[divergence + 1:]
+            self.assertEqual(common_prefix_length(base, changed), divergence)
+        self.assertEqual(common_prefix_length(base, base + "tail"), 1000)
+    
+    def test_char_mode_retypes_from_first_difference(self):
+        """Test that char mode keeps the shared part of a changed word"""
+        engine = IncrementalDiffEngine("char")
+        diff = engine.diff("Hello world", "Hello there")
+        
+        self.assertEqual(diff, {'type': 'replace_suffix', 'chars_to_delete': 5, 'text': 'there'})
+    
+    def test_word_mode_without_separator_replaces_all(self):
+        """Test that a changed first word is retyped entirely"""
+        engine = IncrementalDiffEngine("word")
+        diff = engine.diff("Shirt", "Short")
+        
+        self.assertEqual(diff, {'type': 'replace_all', 'chars_to_delete': 5, 'text': 'Short'})
+    
+    def test_incremental_hint_is_verified(self):
+        """Test that an earlier rewrite is found despite the remembered divergence point"""
+        engine = IncrementalDiffEngine("char")
+        engine.diff("", "The quick brown fox")
+        engine.diff("The quick brown fox", "The quick brown fox jumps")
+        diff = engine.diff("The quick brown fox jumps", "A quick brown fox jumps")
+        
+        self.assertEqual(diff['type'], 'replace_all')
+    
+    def test_long_transcript_matches_reference(self):
+        """Test a sequence of long updates against a naive prefix computation"""
+        engine = IncrementalDiffEngine("char")
+        words = [f"word{i}" for i in range(5000)]
+        previous = ""
+        for count in (100, 2000, 2001, 1999, 4000, 4000):
+            text = " ".join(words[:count])
+            if count == 1999:
+                text = text[:5000] + "X" + text[5001:]
+            expected = next((i for i, (a, b) in enumerate(zip(previous, text)) if a != b),
+                            min(len(previous), len(text)))
+            diff = engine.diff(previous, text)
+            kept = len(previous) - diff.get('chars_to_delete', 0)
+            self.assertEqual(previous[:kept] + diff.get('text', ''), text)
+            if diff['type'] == 'replace_suffix':
+                self.assertEqual(kept, expected)
+            previous = text
+    
+    def test_unknown_mode_rejected(self):
+        """Test that only word and char modes exist"""
+        with self.assertRaises(ValueError):
+            IncrementalDiffEngine("line")
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
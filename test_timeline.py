@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import tempfile
+import time
+import unittest
+from timeline import SessionTimeline, TimelineWriter, load_records, percentile, summarize
+
+
+class TestSessionTimeline(unittest.TestCase):
+    """Test cases for session timeline tracing"""
+    
+    def test_events_are_relative_to_hotkey(self):
+        """Test that event offsets are measured from the hotkey time"""
+        timeline = SessionTimeline(time.perf_counter() - 0.5)
+        timeline.mark("hotkey")
+        
+        self.assertGreaterEqual(timeline.events[0]["t_ms"], 500)
+    
+    def test_span_records_duration(self):
+        """Test that spans record their start and duration"""
+        timeline = SessionTimeline()
+        with timeline.span("paste", chars=5):
+            time.sleep(0.01)
+        
+        event = timeline.events[0]
+        self.assertEqual(event["event"], "paste")
+        self.assertEqual(event["chars"], 5)
+        self.assertGreaterEqual(event["duration_ms"], 10)
+    
+    def test_metrics(self):
+        """Test derived first-word and end-of-speech latencies"""
+        timeline = SessionTimeline(silence_threshold=4)
+        timeline.events = [
+            {"event": "hotkey", "t_ms": 0},
+            {"event": "voice_start", "t_ms": 300},
+            {"event": "paste", "t_ms": 900, "duration_ms": 12},
+            {"event": "voice_stop", "t_ms": 2000},
+            {"event": "recording_stop", "t_ms": 6000},
+            {"event": "final_typed", "t_ms": 6400},
+            {"event": "realtime_stats", "t_ms": 6401, "passes": 9, "mean_pass_ms": 80.5, "interval_ms": 161.0},
+        ]
+        
+        self.assertEqual(timeline.metrics(), {
+            "time_to_first_word_ms": 900,
+            "stop_to_typed_ms": 400,
+            "speech_end_to_typed_ms": 4400,
+            "paste_ms": 12,
+            "realtime_pass_ms": 80.5,
+            "realtime_interval_ms": 161.0,
+        })
+    
+    def test_metrics_without_vad_assume_silence_timeout(self):
+        """Test that the silence timeout is used when no VAD stop was seen"""
+        timeline = SessionTimeline(silence_threshold=4)
+        timeline.events = [
+            {"event": "recording_stop", "t_ms": 6000},
+            {"event": "final_typed", "t_ms": 6400},
+        ]
+        
+        self.assertEqual(timeline.metrics()["speech_end_to_typed_ms"], 4400)
+    
+    def test_metrics_with_explicit_stop(self):
+        """Test stop-request-to-typed latency for hotkey or release stops"""
+        timeline = SessionTimeline(silence_threshold=60)
+        timeline.events = [
+            {"event": "voice_stop", "t_ms": 2000},
+            {"event": "stop_requested", "t_ms": 2500, "source": "release"},
+            {"event": "recording_stop", "t_ms": 2510},
+            {"event": "final_typed", "t_ms": 2900},
+        ]
+        
+        metrics = timeline.metrics()
+        self.assertEqual(metrics["stop_request_to_typed_ms"], 400)
+        self.assertEqual(metrics["speech_end_to_typed_ms"], 900)
+
+
+class TestTimelineFiles(unittest.TestCase):
+    """Test cases for writing and summarizing timeline files"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "timeline.jsonl")
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def test_rotated_files_are_read_oldest_first(self):
+        """Test that one JSON line is written per session across rotations"""
+        writer = TimelineWriter(self.path, max_bytes=300, backup_count=5)
+        sessions = []
+        for _ in range(6):
+            timeline = SessionTimeline()
+            timeline.mark("hotkey")
+            writer.write(timeline)
+            sessions.append(timeline.session_id)
+        writer.close()
+        
+        self.assertTrue(os.path.exists(self.path + ".1"))
+        with open(self.path) as timeline_file:
+            json.loads(timeline_file.readline())
+        self.assertEqual([r["session_id"] for r in load_records(self.path)], sessions)
+    
+    def test_summarize_percentiles(self):
+        """Test p50/p95/p99 over recorded sessions"""
+        records = [{"metrics": {"time_to_first_word_ms": value}} for value in range(1, 101)]
+        records.append({"metrics": {}})
+        
+        summary = summarize(records)
+        
+        self.assertEqual(list(summary), ["time_to_first_word_ms"])
+        self.assertEqual(summary["time_to_first_word_ms"]["count"], 100)
+        self.assertAlmostEqual(summary["time_to_first_word_ms"]["p50"], 50.5)
+        self.assertAlmostEqual(summary["time_to_first_word_ms"]["p99"], 99.01)
+        self.assertEqual(percentile([7], 95), 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+from transcription_scheduler import MAX_INTERVAL, MIN_INTERVAL, RealtimePacer, TranscriptionScheduler
+
+
+class TestTranscriptionScheduler(unittest.TestCase):
+    """Test cases for sharing one model between realtime and final passes"""
+    
+    def setUp(self):
+        self.scheduler = TranscriptionScheduler()
+        self.order = []
+    
+    def _realtime_pass(self, name, hold=0.0):
+        with self.scheduler:
+            self.order.append(name)
+            time.sleep(hold)
+    
+    def test_acts_as_a_lock(self):
+        """Test that passes are mutually exclusive"""
+        with self.scheduler:
+            self.assertTrue(self.scheduler.locked())
+            self.assertFalse(self.scheduler.acquire(blocking=False))
+        self.assertFalse(self.scheduler.locked())
+        self.assertEqual(self.scheduler.stats["realtime_passes"], 1)
+    
+    def test_final_pass_jumps_queued_realtime_passes(self):
+        """Test that a pending final pass runs before waiting realtime passes"""
+        in_flight = threading.Thread(target=self._realtime_pass, args=("in-flight", 0.2))
+        in_flight.start()
+        time.sleep(0.05)  # Let the in-flight pass take the model
+        
+        def final():
+            with self.scheduler.final_pass():
+                time.sleep(0.05)  # Realtime passes queue up meanwhile
+                with self.scheduler:
+                    self.order.append("final")
+        
+        final_thread = threading.Thread(target=final)
+        final_thread.start()
+        time.sleep(0.02)
+        queued = [threading.Thread(target=self._realtime_pass, args=(f"queued-{i}",)) for i in range(3)]
+        for thread in queued:
+            thread.start()
+        
+        for thread in [in_flight, final_thread] + queued:
+            thread.join(timeout=2)
+        
+        self.assertEqual(self.order[:2], ["in-flight", "final"])
+        self.assertEqual(len(self.order), 5)
+        self.assertEqual(self.scheduler.stats["final_passes"], 1)
+        self.assertGreater(self.scheduler.stats["last_final_wait_ms"], 0)
+    
+    def test_final_pass_does_not_wait_when_idle(self):
+        """Test that an idle model is handed to the final pass immediately"""
+        with self.scheduler.final_pass():
+            self.assertTrue(self.scheduler.acquire(timeout=0.1))
+            self.scheduler.release()
+        
+        self.assertLess(self.scheduler.stats["last_final_wait_ms"], 50)
+
+    
+    def test_pass_listener_sees_realtime_passes_only(self):
+        """Test that realtime pass durations are reported and final passes are not"""
+        listener = Mock()
+        self.scheduler.pass_listener = listener
+        
+        self._realtime_pass("realtime", 0.02)
+        with self.scheduler.final_pass():
+            with self.scheduler:
+                pass
+        
+        listener.assert_called_once()
+        seconds, waited = listener.call_args.args
+        self.assertGreaterEqual(seconds, 0.02)
+        self.assertLess(waited, 0.05)
+
+
+class TestRealtimePacer(unittest.TestCase):
+    """Test cases for adapting the realtime pass interval"""
+    
+    def setUp(self):
+        patcher = patch('transcription_scheduler.system_cpu_ticks')
+        self.cpu_ticks = patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def _pacer(self, ticks=None):
+        # Half of the CPU busy between samples unless given otherwise
+        self.cpu_ticks.side_effect = ticks or [(0, 100)] + [(50 * i, 100 + 100 * i) for i in range(1, 50)]
+        self.recorder = Mock(realtime_processing_pause=0.1)
+        pacer = RealtimePacer(self.recorder, 0.1)
+        pacer.begin_session()
+        return pacer
+    
+    def test_interval_follows_pass_time(self):
+        """Test that passes are spaced to keep the model busy at most half the time"""
+        pacer = self._pacer()
+        
+        pacer.on_pass(0.3, 0.0)
+        self.assertEqual(self.recorder.realtime_processing_pause, 0.6)
+        
+        for _ in range(20):
+            pacer.on_pass(0.005, 0.0)  # A fast machine
+        self.assertEqual(self.recorder.realtime_processing_pause, MIN_INTERVAL)
+        
+        for _ in range(20):
+            pacer.on_pass(5.0, 0.0)  # A machine far too slow for realtime
+        self.assertEqual(self.recorder.realtime_processing_pause, MAX_INTERVAL)
+    
+    def test_busy_cpu_spreads_passes(self):
+        """Test that a saturated CPU lengthens the interval beyond the pass-time target"""
+        busy = [(0, 100)] + [(95 * i, 100 + 100 * i) for i in range(1, 50)]
+        pacer = self._pacer(ticks=busy)
+        
+        pacer.on_pass(0.1, 0.0)
+        
+        self.assertGreater(self.recorder.realtime_processing_pause, 0.2 * 2)
+        self.assertAlmostEqual(pacer.cpu_busy, 0.95)
+    
+    def test_passes_held_during_silence_and_final_pass(self):
+        """Test that stale passes are held off and resume with the next voice"""
+        pacer = self._pacer()
+        pacer.on_pass(0.1, 0.0)
+        
+        pacer.on_voice_stop()
+        self.assertEqual(self.recorder.realtime_processing_pause, MAX_INTERVAL)
+        time.sleep(0.01)
+        pacer.on_pass(0.01, 0.0)  # A pass already in flight must not lift the hold
+        self.assertEqual(self.recorder.realtime_processing_pause, MAX_INTERVAL)
+        pacer.on_voice_start()
+        self.assertLess(self.recorder.realtime_processing_pause, MAX_INTERVAL)
+        
+        pacer.on_final_pending()
+        self.assertEqual(self.recorder.realtime_processing_pause, MAX_INTERVAL)
+        stats = pacer.session_stats()
+        self.assertEqual(stats["passes"], 2)
+        self.assertGreater(stats["held_seconds"], 0)
+        
+        pacer.begin_session()
+        self.assertLess(self.recorder.realtime_processing_pause, MAX_INTERVAL)
+        self.assertEqual(pacer.session_stats()["passes"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
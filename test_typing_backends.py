@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+from typing_backends import RecordingBackend, XTestBackend, create_backend
+
+
+class TestRecordingBackend(unittest.TestCase):
+    """Test cases for the recording stub and throughput accounting"""
+    
+    def test_simulated_field_and_stats(self):
+        """Test that edits are applied to the simulated field and counted as key events"""
+        backend = RecordingBackend()
+        backend.paste("hello world")
+        backend.delete(5)
+        backend.paste("there")
+        
+        self.assertEqual(backend.text, "hello there")
+        stats = backend.stats()
+        self.assertEqual(stats["backend"], "recording")
+        self.assertEqual(stats["events"], 4 + 10 + 4)
+        self.assertGreaterEqual(stats["events_per_second"], 0)
+    
+    def test_reset_stats(self):
+        """Test that reset_stats starts a new measurement window"""
+        backend = RecordingBackend()
+        backend.delete(3)
+        backend.reset_stats()
+        self.assertEqual(backend.stats()["events"], 0)
+        self.assertEqual(backend.events_per_second, 0.0)
+
+
+class TestXTestBackend(unittest.TestCase):
+    """Test cases for batched XTest injection"""
+    
+    def setUp(self):
+        self.display = MagicMock()
+        self.display.keysym_to_keycode.side_effect = lambda keysym: keysym
+        xlib = MagicMock()
+        xlib.display.Display.return_value = self.display
+        xlib.XK.string_to_keysym.side_effect = {"BackSpace": 22, "Control_L": 37, "v": 55}.get
+        xlib.X.KeyPress, xlib.X.KeyRelease = 2, 3
+        self.xtest = xlib.ext.xtest
+        modules = {"Xlib": xlib, "Xlib.X": xlib.X, "Xlib.XK": xlib.XK, "Xlib.display": xlib.display,
+                   "Xlib.ext": xlib.ext, "Xlib.ext.xtest": xlib.ext.xtest}
+        patcher = patch.dict(sys.modules, modules)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def test_delete_is_one_round_trip(self):
+        """Test that a run of backspaces is queued and synced once"""
+        backend = XTestBackend()
+        backend.delete(10)
+        
+        calls = [call.args[1:] for call in self.xtest.fake_input.call_args_list]
+        self.assertEqual(calls, [(2, 22), (3, 22)] * 10)
+        self.display.sync.assert_called_once()
+        self.assertEqual(backend.stats()["events"], 20)
+    
+    def test_paste_sends_ctrl_v(self):
+        """Test that paste sets the clipboard and sends Ctrl+V in one round trip"""
+        clipboard = MagicMock()
+        backend = XTestBackend(clipboard)
+        backend.paste("hello")
+        
+        clipboard.set_text.assert_called_once_with("hello")
+        self.assertIn("clipboard_ms", backend.stats())
+        calls = [call.args[1:] for call in self.xtest.fake_input.call_args_list]
+        self.assertEqual(calls, [(2, 37), (2, 55), (3, 55), (3, 37)])
+        self.display.sync.assert_called_once()
+    
+    def test_sessions_reach_clipboard(self):
+        """Test that session boundaries let the clipboard save and restore user contents"""
+        clipboard = MagicMock()
+        backend = XTestBackend(clipboard)
+        backend.begin_session()
+        backend.end_session()
+        backend.close()
+        
+        clipboard.begin_session.assert_called_once()
+        clipboard.end_session.assert_called_once()
+        clipboard.close.assert_called_once()
+    
+    def test_missing_extension(self):
+        """Test that a server without XTEST is rejected"""
+        self.display.query_extension.return_value = None
+        with self.assertRaises(RuntimeError):
+            XTestBackend()
+        self.display.close.assert_called_once()
+    
+    def test_missing_keycode_closes_display(self):
+        """Test that the X connection is closed when the keymap lacks a needed key"""
+        self.display.keysym_to_keycode.side_effect = lambda keysym: 0 if keysym == 55 else keysym
+        with self.assertRaises(RuntimeError):
+            XTestBackend(MagicMock())
+        self.display.close.assert_called_once()
+
+
+class TestCreateBackend(unittest.TestCase):
+    """Test cases for backend selection"""
+    
+    def test_by_name(self):
+        """Test that backends are created by name"""
+        self.assertIsInstance(create_backend("recording"), RecordingBackend)
+    
+    def test_unknown_name(self):
+        """Test that an unknown backend name is rejected"""
+        with self.assertRaises(ValueError):
+            create_backend("uinput")
+    
+    @patch('typing_backends.PynputBackend')
+    @patch('typing_backends.XTestBackend', side_effect=RuntimeError("no display"))
+    def test_auto_falls_back_to_pynput(self, mock_xtest, mock_pynput):
+        """Test that auto falls back to pynput when XTest is unavailable"""
+        with patch.object(sys, 'platform', 'linux'):
+            backend = create_backend("auto")
+        self.assertIs(backend, mock_pynput.return_value)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+
+import threading
+import time
+import unittest
+from unittest.mock import Mock
+from text_typing import TypeController
+from typing_backends import RecordingBackend
+from typing_worker import TypingWorker
+
+
+class TestTypingWorker(unittest.TestCase):
+    """Test cases for the coalescing output thread"""
+    
+    def setUp(self):
+        self.output = RecordingBackend()
+        self.type_controller = TypeController(output=self.output)
+    
+    def _worker(self, min_interval):
+        worker = TypingWorker(self.type_controller, min_interval)
+        self.addCleanup(worker.close)
+        return worker
+    
+    def test_submit_does_not_block(self):
+        """Test that submit returns while a slow update is still being typed"""
+        release = threading.Event()
+        controller = Mock()
+        controller.apply_text.side_effect = lambda text: release.wait(2)
+        worker = TypingWorker(controller, 0)
+        self.addCleanup(worker.close)
+        self.addCleanup(release.set)
+        
+        start_time = time.perf_counter()
+        worker.submit("Hello")
+        worker.submit("Hello world")
+        self.assertLess(time.perf_counter() - start_time, 0.5)
+        self.assertGreaterEqual(worker.depth, 1)
+    
+    def test_latest_wins(self):
+        """Test that updates superseded during a slow apply are dropped, not queued"""
+        started = threading.Event()
+        release = threading.Event()
+        applied = []
+        
+        def apply_text(text):
+            applied.append(text)
+            started.set()
+            release.wait(2)
+        
+        controller = Mock()
+        controller.apply_text.side_effect = apply_text
+        worker = TypingWorker(controller, 0)
+        self.addCleanup(worker.close)
+        
+        worker.submit("one")
+        self.assertTrue(started.wait(2))
+        for text in ["one two", "one two three", "one two three four"]:
+            worker.submit(text)
+        release.set()
+        self.assertTrue(worker.flush(timeout=2))
+        
+        self.assertEqual(applied, ["one", "one two three four"])
+        self.assertEqual(worker.stats["dropped"], 2)
+        self.assertEqual(worker.stats["applied"], 2)
+        self.assertEqual(worker.stats["max_depth"], 2)
+    
+    def test_trailing_edge(self):
+        """Test that an update inside the interval is applied once the interval has passed"""
+        worker = self._worker(0.2)
+        worker.submit("Hello")
+        worker.flush(timeout=2)
+        worker.submit("Hello world")
+        time.sleep(0.05)
+        self.assertEqual(self.output.text, "Hello")
+        
+        deadline = time.time() + 2
+        while self.output.text != "Hello world" and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.output.text, "Hello world")
+    
+    def test_flush_applies_final_text_immediately(self):
+        """Test that the final text is typed even right after a realtime update"""
+        worker = self._worker(10)
+        worker.submit("Hello wor")
+        worker.flush(timeout=2)
+        worker.submit("Hello world.")
+        
+        start_time = time.perf_counter()
+        self.assertTrue(worker.flush(timeout=2))
+        self.assertLess(time.perf_counter() - start_time, 1)
+        self.assertEqual(self.output.text, "Hello world.")
+    
+    def test_discard(self):
+        """Test that discarding drops the pending update"""
+        worker = self._worker(10)
+        worker.submit("Hello")
+        worker.flush(timeout=2)
+        worker.submit("Hello world")
+        worker.discard()
+        worker.flush(timeout=2)
+        
+        self.assertEqual(self.output.text, "Hello")
+        self.assertEqual(worker.stats["dropped"], 1)
+    
+    def test_updates_after_final_are_ignored(self):
+        """Test that a late realtime update cannot retype over the final text"""
+        worker = self._worker(0)
+        worker.submit("Hello wor")
+        worker.submit_final("Hello world.")
+        worker.submit("Hello wor")
+        worker.flush(timeout=2)
+        
+        self.assertEqual(self.output.text, "Hello world.")
+        
+        worker.begin_session()
+        worker.submit("Next")
+        worker.flush(timeout=2)
+        self.assertEqual(self.output.text, "Next")
+
+
+if __name__ == '__main__':
+    unittest.main()
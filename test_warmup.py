@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+
+import unittest
+from unittest.mock import Mock
+from timeline import SessionTimeline
+from warmup import SAMPLE_RATE, VAD_CHUNK_SAMPLES, synthetic_audio, warm_up_recorder
+
+
+class TestWarmUp(unittest.TestCase):
+    """Test cases for the start-up warm-up pass"""
+    
+    def setUp(self):
+        self.recorder = Mock()
+        self.recorder.language = "en"
+        self.recorder.realtime_model_type.transcribe.return_value = (iter([]), Mock())
+        self.timeline = SessionTimeline(kind="warmup")
+    
+    def test_synthetic_audio_has_silence_then_tone(self):
+        """Test the layout of the synthetic buffer"""
+        audio = synthetic_audio(0.5, 0.5)
+        
+        self.assertEqual(len(audio), SAMPLE_RATE)
+        self.assertFalse(audio[:SAMPLE_RATE // 2].any())
+        self.assertGreater(abs(audio[SAMPLE_RATE // 2:]).max(), 5000)
+    
+    def test_all_paths_are_exercised(self):
+        """Test that VAD, realtime and final paths all run and are timed"""
+        stages = warm_up_recorder(self.recorder, self.timeline)
+        
+        self.assertEqual(stages, ["warmup_vad", "warmup_realtime", "warmup_final"])
+        self.assertEqual(self.recorder._is_silero_speech.call_count, SAMPLE_RATE // VAD_CHUNK_SAMPLES)
+        self.assertEqual(self.recorder._is_webrtc_speech.call_count, SAMPLE_RATE // VAD_CHUNK_SAMPLES)
+        self.recorder.realtime_model_type.transcribe.assert_called_once()
+        self.recorder.perform_final_transcription.assert_called_once()
+        self.assertEqual([e["event"] for e in self.timeline.events], stages)
+    
+    def test_shared_model_skips_realtime_stage(self):
+        """Test that no separate realtime pass runs when no realtime model is loaded"""
+        self.recorder.realtime_model_type = "tiny"
+        
+        stages = warm_up_recorder(self.recorder, self.timeline)
+        
+        self.assertEqual(stages, ["warmup_vad", "warmup_final"])
+    
+    def test_failing_stage_is_skipped(self):
+        """Test that a missing internal API does not abort the warm-up"""
+        self.recorder.perform_final_transcription.side_effect = AttributeError("not available")
+        
+        stages = warm_up_recorder(self.recorder, self.timeline)
+        
+        self.assertNotIn("warmup_final", stages)
+        self.assertEqual(self.timeline.last("warmup_skipped"), self.timeline.events[-1]["t_ms"])
+
+
+if __name__ == '__main__':
+    unittest.main()
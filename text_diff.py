@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+
+import difflib
+
+BLOCK_SIZE = 256         # Characters compared per C-level slice comparison
+WORD_SEPARATORS = " \t\n"
+
+
+def common_prefix_length(a, b, start=0):
+    """Return the length of the common prefix of a and b
+
+    The first `start` characters are assumed to match already. Whole blocks
+    are compared with a single slice comparison, so only the last partial
+    block is walked character by character in Python.
+    """
+    limit = min(len(a), len(b))
+    i = min(start, limit)
+    while i + BLOCK_SIZE <= limit and a[i:i + BLOCK_SIZE] == b[i:i + BLOCK_SIZE]:
+        i += BLOCK_SIZE
+    while i < limit and a[i] == b[i]:
+        i += 1
+    return i
+
+
+def build_diff(old_text, new_text, prefix_length):
+    """Turn a common prefix length into a TypeController edit operation"""
+    if not old_text:
+        return {'type': 'append', 'text': new_text}
+
+    if not new_text:
+        return {'type': 'delete_all', 'chars_to_delete': len(old_text)}
+
+    if prefix_length == len(old_text):
+        # Old text is a prefix of new text, just append
+        return {'type': 'append', 'text': new_text[prefix_length:]}
+
+    if prefix_length == len(new_text):
+        # New text is a prefix of old text, delete excess
+        return {'type': 'delete_suffix', 'chars_to_delete': len(old_text) - prefix_length}
+
+    if prefix_length == 0:
+        # No common prefix, replace everything
+        return {'type': 'replace_all', 'chars_to_delete': len(old_text), 'text': new_text}
+
+    # Replace suffix after common prefix
+    return {
+        'type': 'replace_suffix',
+        'chars_to_delete': len(old_text) - prefix_length,
+        'text': new_text[prefix_length:],
+    }
+
+
+class IncrementalDiffEngine:
+    """Computes corrections from the point where new text diverges from typed text
+
+    Only a common prefix is ever needed, so this runs in linear time (and
+    mostly in C) instead of a full sequence alignment. The divergence point
+    of the previous update is remembered: realtime updates rarely rewrite
+    text that was stable last time, so the scan resumes there after a single
+    slice comparison confirms the earlier text is unchanged.
+
+    In 'word' mode, replacements start at the separator before the diverging
+    word so whole words are retyped; 'char' mode retypes only from the
+    first differing character.
+    """
+
+    def __init__(self, mode="word"):
+        if mode not in ("word", "char"):
+            raise ValueError(f"Unknown diff mode: {mode}")
+        self.mode = mode
+        self.previous_text = None
+        self.previous_prefix = 0
+
+    def reset(self):
+        """Forget the previous update, e.g. at the start of a session"""
+        self.previous_text = None
+        self.previous_prefix = 0
+
+    def _prefix_length(self, old_text, new_text):
+        """Common prefix length, resuming from the previous divergence point when possible"""
+        hint = 0
+        if old_text is self.previous_text or old_text == self.previous_text:
+            hint = min(self.previous_prefix, len(old_text), len(new_text))
+            if old_text[:hint] != new_text[:hint]:
+                hint = 0  # Earlier text was rewritten, scan from the start
+        return common_prefix_length(old_text, new_text, hint)
+
+    def diff(self, old_text, new_text):
+        """Return the edit operation turning old_text into new_text"""
+        prefix_length = self._prefix_length(old_text, new_text)
+        self.previous_text = new_text
+        self.previous_prefix = prefix_length
+
+        if self.mode == "word" and prefix_length < min(len(old_text), len(new_text)):
+            # Back up to the separator before the diverging word
+            prefix_length = max(old_text.rfind(sep, 0, prefix_length) for sep in WORD_SEPARATORS)
+            prefix_length = max(prefix_length, 0)
+
+        return build_diff(old_text, new_text, prefix_length)
+
+
+def sequence_matcher_diff(old_text, new_text):
+    """Reference implementation: first matching block of a full SequenceMatcher
+
+    This is the algorithm TypeController used before IncrementalDiffEngine;
+    it is kept for the scaling comparison in benchmark.py.
+    """
+    if not old_text or not new_text:
+        return build_diff(old_text, new_text, 0)
+
+    first_match = difflib.SequenceMatcher(None, old_text, new_text).get_matching_blocks()[0]
+    prefix_length = first_match.size if first_match.a == 0 and first_match.b == 0 else 0
+    return build_diff(old_text, new_text, prefix_length)
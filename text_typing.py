@@ -1,76 +1,38 @@
 #!/usr/bin/env python3
 
+import contextlib
+import logging
 import time
-import pyperclip
-from pynput import keyboard
-import difflib
+from logs import get_logger
+from text_diff import IncrementalDiffEngine
+from typing_backends import create_backend
+
+log = get_logger("typing")
 
 
 class TypeController:
     """Handles intelligent text typing with corrections and debouncing"""
     
-    def __init__(self, debounce_delay=0.1):
+    def __init__(self, debounce_delay=0.1, output=None, diff_mode="word"):
+        if output is None or isinstance(output, str):
+            output = create_backend(output or "auto")
+        self.output = output  # Keystroke injection backend
+        self.diff_engine = IncrementalDiffEngine(diff_mode)
+        self.timeline = None  # SessionTimeline of the current session, if traced
         self.last_typed_text = ""
         self.last_update_time = 0
         self.debounce_delay = debounce_delay
     
     def get_text_diff(self, old_text, new_text):
-        """Get optimal edit operations using difflib for more efficient text correction"""
-        if not old_text:
-            return {'type': 'append', 'text': new_text}
-        
-        if not new_text:
-            return {'type': 'delete_all', 'chars_to_delete': len(old_text)}
-        
-        # Use SequenceMatcher for optimal diff
-        matcher = difflib.SequenceMatcher(None, old_text, new_text)
-        
-        # Get the longest common subsequence
-        matching_blocks = matcher.get_matching_blocks()
-        
-        if not matching_blocks or matching_blocks[0] == (len(old_text), len(new_text), 0):
-            # No common parts, replace everything
-            return {
-                'type': 'replace_all',
-                'chars_to_delete': len(old_text),
-                'text': new_text
-            }
-        
-        # Find the longest common prefix
-        first_match = matching_blocks[0]
-        if first_match.a == 0 and first_match.b == 0:
-            # Common prefix exists
-            prefix_length = first_match.size
-            
-            if prefix_length == len(old_text):
-                # Old text is a prefix of new text, just append
-                return {
-                    'type': 'append',
-                    'text': new_text[prefix_length:]
-                }
-            elif prefix_length == len(new_text):
-                # New text is a prefix of old text, delete excess
-                return {
-                    'type': 'delete_suffix',
-                    'chars_to_delete': len(old_text) - prefix_length
-                }
-            else:
-                # Replace suffix after common prefix
-                return {
-                    'type': 'replace_suffix',
-                    'chars_to_delete': len(old_text) - prefix_length,
-                    'text': new_text[prefix_length:]
-                }
-        else:
-            # No common prefix, replace everything
-            return {
-                'type': 'replace_all',
-                'chars_to_delete': len(old_text),
-                'text': new_text
-            }
+        """Get the edit operations that turn the typed text into the new text"""
+        return self.diff_engine.diff(old_text, new_text)
     
     def type_text_realtime(self, text):
-        """Type text with corrections, deleting and retyping changed portions"""
+        """Type text with corrections, skipping updates that arrive within the debounce delay
+        
+        Used when typing synchronously; TypingWorker calls apply_text() and
+        coalesces updates instead of dropping them.
+        """
         if not text or not text.strip():
             return
         
@@ -84,38 +46,40 @@ class TypeController:
             return
         
         self.last_update_time = current_time
+        self.apply_text(text)
+    
+    def apply_text(self, text):
+        """Type text with corrections, deleting and retyping changed portions"""
+        if not text or not text.strip():
+            return
+        
+        # Skip if text is exactly the same
+        if text == self.last_typed_text:
+            return
         
-        # Get optimal diff operations using difflib
+        # Get the correction from the point where the new text diverges
         diff = self.get_text_diff(self.last_typed_text, text)
+        debug = log.isEnabledFor(logging.DEBUG)  # Per-update logging is off at the default level
+        start_time = time.perf_counter() if debug else 0.0
+        chars_to_delete = 0
         
         try:
-            kb = keyboard.Controller()
-            
             if diff['type'] == 'append':
                 # Simple append case
                 new_text_to_type = diff['text']
-                print(f"💬 Appending: '{new_text_to_type}'")
                 
             elif diff['type'] == 'delete_all':
                 # Delete all existing text
                 chars_to_delete = diff['chars_to_delete']
-                print(f"🗑️ Deleting all {chars_to_delete} characters")
-                
-                for _ in range(chars_to_delete):
-                    kb.press(keyboard.Key.backspace)
-                    kb.release(keyboard.Key.backspace)
-                
+                with self._trace('delete', chars=chars_to_delete):
+                    self.output.delete(chars_to_delete)
                 new_text_to_type = ""
                 
             elif diff['type'] == 'delete_suffix':
                 # Delete suffix only
                 chars_to_delete = diff['chars_to_delete']
-                print(f"🗑️ Deleting {chars_to_delete} suffix characters")
-                
-                for _ in range(chars_to_delete):
-                    kb.press(keyboard.Key.backspace)
-                    kb.release(keyboard.Key.backspace)
-                
+                with self._trace('delete', chars=chars_to_delete):
+                    self.output.delete(chars_to_delete)
                 new_text_to_type = ""
                 
             elif diff['type'] in ['replace_suffix', 'replace_all']:
@@ -123,36 +87,60 @@ class TypeController:
                 chars_to_delete = diff['chars_to_delete']
                 new_text_to_type = diff['text']
                 
-                print(f"🔄 Replacing: deleting {chars_to_delete} chars, typing '{new_text_to_type}'")
-                
                 # Send backspace keystrokes to delete the divergent part
-                for _ in range(chars_to_delete):
-                    kb.press(keyboard.Key.backspace)
-                    kb.release(keyboard.Key.backspace)
+                with self._trace('delete', chars=chars_to_delete):
+                    self.output.delete(chars_to_delete)
             
             else:
                 new_text_to_type = ""
 
             # Type the new/corrected text if there is any
             if new_text_to_type:
-                # Use pyperclip for cross-platform clipboard operations
-                pyperclip.copy(new_text_to_type)
-                
-                # Small delay to ensure clipboard is set
-                time.sleep(0.01)
-                
-                # Paste using Ctrl+V (cross-platform)
-                with kb.pressed(keyboard.Key.ctrl):
-                    kb.press('v')
-                    kb.release('v')
+                with self._trace('paste', chars=len(new_text_to_type)):
+                    self.output.paste(new_text_to_type)
             
             # Update what we've typed
             self.last_typed_text = text
             
+            if debug:
+                self._log_update(diff['type'], chars_to_delete, new_text_to_type, start_time)
+            
         except Exception as e:
-            print(f"Warning: Could not type/correct text: {e}")
+            log.warning("Warning: Could not type/correct text: %s", e)
+    
+    def _log_update(self, operation, chars_deleted, typed, start_time):
+        """Describe one applied correction at DEBUG level"""
+        fields = {
+            "event": operation,
+            "chars_deleted": chars_deleted,
+            "chars_typed": len(typed),
+            "duration_ms": round((time.perf_counter() - start_time) * 1000, 2),
+        }
+        if operation == 'append':
+            log.debug("💬 Appending: '%s'", typed, extra=fields)
+        elif operation == 'delete_all':
+            log.debug("🗑️ Deleting all %d characters", chars_deleted, extra=fields)
+        elif operation == 'delete_suffix':
+            log.debug("🗑️ Deleting %d suffix characters", chars_deleted, extra=fields)
+        else:
+            log.debug("🔄 Replacing: deleting %d chars, typing '%s'", chars_deleted, typed, extra=fields)
+    
+    def finish_session(self):
+        """Record the output backend's throughput and hand the clipboard back to the user"""
+        if self.timeline:
+            self.timeline.mark("output_stats", **self.output.stats())
+        self.output.end_session()
+    
+    def _trace(self, event, **fields):
+        """Time an output operation on the session timeline when tracing"""
+        if self.timeline:
+            return self.timeline.span(event, **fields)
+        return contextlib.nullcontext()
     
-    def reset(self):
+    def reset(self, timeline=None):
         """Reset typing state for new session"""
+        self.timeline = timeline
+        self.diff_engine.reset()
+        self.output.begin_session()
         self.last_typed_text = ""
         self.last_update_time = 0
\ No newline at end of file
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+
+import contextlib
+import json
+import logging
+import logging.handlers
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+
+# Events whose first occurrence means text reached the target window
+OUTPUT_EVENTS = ("paste", "delete")
+SUMMARY_METRICS = ("time_to_first_word_ms", "speech_end_to_typed_ms", "stop_to_typed_ms",
+                   "stop_request_to_typed_ms", "paste_ms", "model_reload_ms", "realtime_pass_ms",
+                   "realtime_interval_ms")
+
+
+class SessionTimeline:
+    """Collects timestamped events for one recording session
+
+    Event times are milliseconds relative to `start_time`, a
+    time.perf_counter() value (normally the moment the hotkey was received).
+    """
+
+    def __init__(self, start_time=None, **attributes):
+        self.session_id = uuid.uuid4().hex[:12]
+        self.start_time = start_time if start_time is not None else time.perf_counter()
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        self.attributes = attributes
+        self.events = []
+        self.lock = threading.Lock()  # Events arrive from recorder and typing threads
+
+    def _offset_ms(self, timestamp):
+        return round((timestamp - self.start_time) * 1000, 2)
+
+    def mark(self, event, **fields):
+        """Record an instantaneous event"""
+        record = {"event": event, "t_ms": self._offset_ms(time.perf_counter()), **fields}
+        with self.lock:
+            self.events.append(record)
+
+    @contextlib.contextmanager
+    def span(self, event, **fields):
+        """Record an event with the duration of the wrapped block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            record = {
+                "event": event,
+                "t_ms": self._offset_ms(start),
+                "duration_ms": round((end - start) * 1000, 2),
+                **fields,
+            }
+            with self.lock:
+                self.events.append(record)
+
+    def first(self, *events):
+        """Return the time of the first matching event, or None"""
+        with self.lock:
+            return next((e["t_ms"] for e in self.events if e["event"] in events), None)
+
+    def last(self, *events):
+        """Return the time of the last matching event, or None"""
+        with self.lock:
+            return next((e["t_ms"] for e in reversed(self.events) if e["event"] in events), None)
+
+    def metrics(self):
+        """Derive the headline latencies of the session"""
+        metrics = {}
+
+        first_output = self.first(*OUTPUT_EVENTS)
+        if first_output is not None:
+            metrics["time_to_first_word_ms"] = first_output
+
+        with self.lock:
+            pastes = [e["duration_ms"] for e in self.events if e["event"] == "paste"]
+        if pastes:
+            # Clipboard hand-over plus Ctrl+V, averaged over the session's pastes
+            metrics["paste_ms"] = round(sum(pastes) / len(pastes), 2)
+
+        final_typed = self.last("final_typed")
+        recording_stop = self.first("recording_stop")
+        if final_typed is not None and recording_stop is not None:
+            metrics["stop_to_typed_ms"] = round(final_typed - recording_stop, 2)
+
+            # Prefer the VAD's end of speech; otherwise assume the full silence timeout elapsed
+            speech_end = self.last("voice_stop")
+            if speech_end is None or speech_end > recording_stop:
+                speech_end = recording_stop - self.attributes.get("silence_threshold", 0) * 1000
+            metrics["speech_end_to_typed_ms"] = round(final_typed - speech_end, 2)
+
+        # Sessions stopped explicitly (hotkey, key release or control socket)
+        stop_requested = self.first("stop_requested")
+        if final_typed is not None and stop_requested is not None:
+            metrics["stop_request_to_typed_ms"] = round(final_typed - stop_requested, 2)
+
+        # Realtime pacing decisions of the session
+        with self.lock:
+            pacing = [e for e in self.events if e["event"] == "realtime_stats"]
+        if pacing and pacing[-1].get("mean_pass_ms") is not None:
+            metrics["realtime_pass_ms"] = pacing[-1]["mean_pass_ms"]
+            metrics["realtime_interval_ms"] = pacing[-1]["interval_ms"]
+
+        # First session after an idle unload
+        with self.lock:
+            reloads = [e["duration_ms"] for e in self.events if e["event"] == "model_reload"]
+        if reloads:
+            metrics["model_reload_ms"] = reloads[0]
+
+        return metrics
+
+    def to_record(self):
+        """Return the session as a JSON-serializable record"""
+        with self.lock:
+            events = list(self.events)
+        return {
+            "session_id": self.session_id,
+            "started_at": self.started_at,
+            "attributes": self.attributes,
+            "events": events,
+            "metrics": self.metrics(),
+        }
+
+
+class TimelineWriter:
+    """Appends session records as JSON lines to a size-rotated file"""
+
+    def __init__(self, path, max_bytes=5 * 1024 * 1024, backup_count=3):
+        self.path = path
+        self.handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=True
+        )
+        self.handler.setFormatter(logging.Formatter("%(message)s"))
+
+    def write(self, timeline):
+        """Write one session as a single JSON line"""
+        record = logging.makeLogRecord({"msg": json.dumps(timeline.to_record()), "levelno": logging.INFO})
+        self.handler.handle(record)
+
+    def close(self):
+        """Flush and close the underlying file"""
+        self.handler.close()
+
+
+def load_records(path):
+    """Read session records from a timeline file and its rotated backups"""
+    directory = os.path.dirname(path) or "."
+    prefix = os.path.basename(path) + "."
+    # RotatingFileHandler keeps the oldest records in the highest-numbered backup
+    backups = sorted(
+        (int(name[len(prefix):]) for name in os.listdir(directory)
+         if name.startswith(prefix) and name[len(prefix):].isdigit()),
+        reverse=True,
+    )
+
+    records = []
+    for full_path in [f"{path}.{index}" for index in backups] + [path]:
+        if not os.path.exists(full_path):
+            continue
+        with open(full_path, encoding="utf-8") as timeline_file:
+            for line in timeline_file:
+                line = line.strip()
+                if line:
+                    records.append(json.loads(line))
+    return records
+
+
+def split_records(records, kind="warmup"):
+    """Separate records of one kind (warmup, unload) from recording sessions"""
+    matching = [r for r in records if r.get("attributes", {}).get("kind") == kind]
+    sessions = [r for r in records if "kind" not in r.get("attributes", {})]
+    return matching, sessions
+
+
+def percentile(values, pct):
+    """Linearly interpolated percentile of a non-empty list"""
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(records, metrics=SUMMARY_METRICS):
+    """Compute count and p50/p95/p99 for each session metric"""
+    summary = {}
+    for metric in metrics:
+        values = [r["metrics"][metric] for r in records if metric in r.get("metrics", {})]
+        if values:
+            summary[metric] = {
+                "count": len(values),
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+                "p99": percentile(values, 99),
+            }
+    return summary
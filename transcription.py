@@ -1,55 +1,161 @@
 #!/usr/bin/env python3
 
-import torch
-from RealtimeSTT import AudioToTextRecorder
+import contextlib
+import os
+from logs import get_logger
+from transcription_scheduler import RealtimePacer, TranscriptionScheduler
+
+log = get_logger(__name__)
+
+REALTIME_MODES = ("full", "tail")
+
+
+@contextlib.contextmanager
+def cpu_threads_environment(cpu_threads):
+    """Load CTranslate2 models inside this block with `cpu_threads` threads (0 keeps the default)
+
+    The recorder has no thread setting, so every model gets its thread
+    count through OMP_NUM_THREADS, which CTranslate2 reads when a model is
+    loaded (also in the recorder's worker process, which inherits it).
+    Calibration goes through the same path as the recorder.
+    """
+    previous = os.environ.get("OMP_NUM_THREADS")
+    if cpu_threads:
+        os.environ["OMP_NUM_THREADS"] = str(cpu_threads)
+    try:
+        yield
+    finally:
+        if previous is None:
+            os.environ.pop("OMP_NUM_THREADS", None)
+        else:
+            os.environ["OMP_NUM_THREADS"] = previous
 
 
 class TranscriptionHandler:
     """Handles Whisper model configuration and transcription setup"""
     
-    def __init__(self, model_name="base", silence_threshold=4):
+    def __init__(self, model_name="base", silence_threshold=4, realtime_model_name=None, share_model=True,
+                 cpu_threads=0, beam_size=5, realtime_processing_pause=0.1, adaptive_realtime=False,
+                 realtime_mode="full", compute_type=None):
         self.model_name = model_name
+        self.realtime_model_name = realtime_model_name or model_name
         self.silence_threshold = silence_threshold
+        self.language = "en"
+        self.cpu_threads = cpu_threads  # 0 lets CTranslate2 decide
+        self.beam_size = beam_size
+        self.realtime_processing_pause = realtime_processing_pause
+        self.adaptive_realtime = adaptive_realtime  # Pace realtime passes by inference time and load
+        if realtime_mode not in REALTIME_MODES:
+            raise ValueError(f"Unknown realtime mode: {realtime_mode}")
+        self.realtime_mode = realtime_mode  # full: re-decode the whole recording, tail: only the uncommitted tail
+        self.share_model = share_model
         self.device, self.compute_type = self._get_optimal_device()
+        if compute_type:
+            self.compute_type = compute_type  # e.g. float32 instead of the device default, for benchmarks
+        # Identical models are loaded once and shared by realtime and final passes
+        self.shared_model = share_model and self.realtime_model_name == self.model_name
+        self.scheduler = None  # Created with the recorder when the model is shared
+        self.pacer = None  # Created with the recorder when realtime pacing is adaptive
     
     def _get_optimal_device(self):
         """Detect optimal device for Whisper inference"""
+        import torch  # Deferred: importing torch dominates cold start
         if torch.cuda.is_available():
-            print(f"✅ CUDA detected: {torch.cuda.get_device_name()}")
+            log.info("✅ CUDA detected: %s", torch.cuda.get_device_name())
             return "cuda", "float16"
         else:
-            print("⚠️ CUDA not available, using CPU with int8 quantization")
+            log.warning("⚠️ CUDA not available, using CPU with int8 quantization")
             return "cpu", "int8"
     
-    def create_recorder(self, on_realtime_transcription_callback, on_recording_stop_callback):
-        """Create and configure AudioToTextRecorder with optimized settings"""
-        return AudioToTextRecorder(
-            # Model configuration
-            model=self.model_name,
-            language="en",
-            device=self.device,
-            compute_type=self.compute_type,
-            
-            # VAD Configuration for better speech detection
-            silero_sensitivity=0.4,          # Silero VAD sensitivity (0.0-1.0)
-            webrtc_sensitivity=2,            # WebRTC VAD aggressiveness (0-3)
-            
-            # Recording behavior
-            post_speech_silence_duration=self.silence_threshold,  # Stop after N seconds of silence
-            min_length_of_recording=0.5,     # Minimum recording duration
-            
-            # Real-time transcription settings
-            enable_realtime_transcription=True,
-            realtime_processing_pause=0.1,   # Update every 100ms for better responsiveness
-            realtime_model_type=self.model_name,  # Use same model for consistency
-            
-            # Callbacks
-            on_recording_stop=on_recording_stop_callback,
-            on_realtime_transcription_stabilized=on_realtime_transcription_callback,
-            
-            # Performance settings
-            use_microphone=True,
-            no_log_file=True,
-            spinner=False,                   # Disable spinner for cleaner output
-            early_transcription_on_silence=1,    # Faster transcription on silence
-        )
\ No newline at end of file
+    def apply_profile(self, choice):
+        """Adopt a configuration chosen by autotune.choose_config()"""
+        if self.realtime_model_name == self.model_name:
+            self.realtime_model_name = choice["model"]
+        self.model_name = choice["model"]
+        self.compute_type = choice["compute_type"]
+        self.cpu_threads = choice["cpu_threads"]
+        self.beam_size = choice["beam_size"]
+        self.realtime_processing_pause = choice["realtime_processing_pause"]
+        self.shared_model = self.share_model and self.realtime_model_name == self.model_name
+    
+    def create_model(self, cpu_threads=0, model_name=None, compute_type=None):
+        """Load a standalone faster-whisper model with the same tuned settings as the recorder"""
+        from faster_whisper import WhisperModel
+        with cpu_threads_environment(cpu_threads or self.cpu_threads):
+            return WhisperModel(
+                model_name or self.model_name,
+                device=self.device,
+                compute_type=compute_type or self.compute_type,
+            )
+    
+    def create_recorder(self, on_realtime_transcription_callback, on_recording_stop_callback, use_microphone=True,
+                        on_vad_start_callback=None, on_vad_stop_callback=None):
+        """Create and configure AudioToTextRecorder with optimized settings
+
+        With use_microphone=False the recorder is fed through feed_audio()
+        by an external audio source instead of capturing the microphone.
+        """
+        from RealtimeSTT import AudioToTextRecorder
+        tail = self.realtime_mode == "tail"
+        with cpu_threads_environment(self.cpu_threads):
+            recorder = AudioToTextRecorder(
+                # Model configuration
+                model=self.model_name,
+                language=self.language,
+                device=self.device,
+                compute_type=self.compute_type,
+                beam_size=self.beam_size,
+                
+                # VAD Configuration for better speech detection
+                silero_sensitivity=0.4,          # Silero VAD sensitivity (0.0-1.0)
+                webrtc_sensitivity=2,            # WebRTC VAD aggressiveness (0-3)
+                
+                # Recording behavior
+                post_speech_silence_duration=self.silence_threshold,  # Stop after N seconds of silence
+                min_length_of_recording=0.5,     # Minimum recording duration
+                
+                # Real-time transcription settings
+                enable_realtime_transcription=not tail,  # Tail mode runs its own realtime passes
+                realtime_processing_pause=self.realtime_processing_pause,  # 100ms by default; the pacer adapts it
+                realtime_model_type=self.realtime_model_name,
+                use_main_model_for_realtime=self.shared_model,  # Load the weights once when identical
+                
+                # Callbacks
+                on_recording_stop=on_recording_stop_callback,
+                on_realtime_transcription_stabilized=on_realtime_transcription_callback,
+                on_vad_start=on_vad_start_callback,
+                on_vad_stop=on_vad_stop_callback,
+                
+                # Performance settings
+                use_microphone=use_microphone,
+                no_log_file=True,
+                spinner=False,                   # Disable spinner for cleaner output
+                early_transcription_on_silence=1,    # Faster transcription on silence
+            )
+        
+        if self.shared_model or tail:
+            # Realtime and final passes share one model (or the CPU); let the final pass jump the queue
+            self.scheduler = TranscriptionScheduler()
+            recorder.transcription_lock = self.scheduler
+        if self.adaptive_realtime:
+            # Pass times are only measured when passes go through the scheduler
+            self.pacer = RealtimePacer(recorder, self.realtime_processing_pause, self.scheduler)
+        return recorder
+    
+    def create_tail_transcriber(self, recorder, on_text):
+        """Load the realtime model in-process for tail-window realtime passes"""
+        from tail_transcription import TailWindowTranscriber  # Deferred: pulls in numpy
+        model = self.create_model(model_name=self.realtime_model_name)
+        return TailWindowTranscriber(model, recorder, on_text, self.language, lock=self.scheduler)
+    
+    def create_segment_committer(self, recorder, on_text, spill_dir=None, on_cut=None):
+        """Load the final model in-process to finalize long dictations segment by segment"""
+        from long_dictation import SegmentCommitter  # Deferred: pulls in numpy
+        return SegmentCommitter(self.create_model(), recorder, on_text, self.language, self.beam_size,
+                                spill_dir=spill_dir, on_cut=on_cut)
+    
+    def final_pass(self):
+        """Context for the thread that waits on the final transcription"""
+        if self.scheduler:
+            return self.scheduler.final_pass()
+        return contextlib.nullcontext()
\ No newline at end of file
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+
+import contextlib
+import os
+import threading
+import time
+from process_stats import system_cpu_ticks
+
+TARGET_DUTY = 0.5        # Realtime passes may keep the model busy at most this share of the time
+MIN_INTERVAL = 0.02      # seconds between realtime pass starts on a fast, idle machine
+MAX_INTERVAL = 1.0       # Never slower than this, so the live text keeps moving
+BUSY_CPU = 0.85          # System CPU share above which realtime passes are spread further apart
+PASS_SMOOTHING = 0.3     # Weight of the newest pass in the moving average of pass durations
+
+
+class TranscriptionScheduler:
+    """Serializes realtime and final passes on a shared model, final pass first
+
+    Installed in place of the recorder's transcription lock, so it implements
+    the Lock protocol. While a final pass is pending (see final_pass()), the
+    model is handed to it as soon as the in-flight pass releases, and
+    realtime passes wait until the final pass is done.
+    """
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.busy = False
+        self.priority_thread = None  # Thread that is waiting for or running the final pass
+        self.pass_listener = None  # Called with (seconds held, seconds waited) after each realtime pass
+        self.holder = None  # (is_final, acquire time, seconds waited) of the pass holding the model
+        self.stats = {
+            "realtime_passes": 0,
+            "final_passes": 0,
+            "realtime_wait_ms": 0.0,
+            "final_wait_ms": 0.0,
+            "last_final_wait_ms": 0.0,
+        }
+
+    def acquire(self, blocking=True, timeout=-1):
+        """Acquire the model, yielding to a pending final pass"""
+        is_final = threading.current_thread() is self.priority_thread
+        start_time = time.perf_counter()
+
+        with self.condition:
+            if is_final:
+                ready = lambda: not self.busy
+            else:
+                ready = lambda: not self.busy and self.priority_thread is None
+
+            if not blocking:
+                acquired = ready()
+            else:
+                acquired = self.condition.wait_for(ready, None if timeout < 0 else timeout)
+            if not acquired:
+                return False
+
+            self.busy = True
+            now = time.perf_counter()
+            self.holder = (is_final, now, now - start_time)
+            wait_ms = (now - start_time) * 1000
+            if is_final:
+                self.stats["final_passes"] += 1
+                self.stats["final_wait_ms"] += wait_ms
+                self.stats["last_final_wait_ms"] = wait_ms
+            else:
+                self.stats["realtime_passes"] += 1
+                self.stats["realtime_wait_ms"] += wait_ms
+            return True
+
+    def release(self):
+        """Release the model to the next pass"""
+        with self.condition:
+            holder, self.holder = self.holder, None
+            self.busy = False
+            self.condition.notify_all()
+        if holder and not holder[0] and self.pass_listener:
+            self.pass_listener(time.perf_counter() - holder[1], holder[2])
+
+    def locked(self):
+        """Return True while a pass holds the model"""
+        return self.busy
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+        return False
+
+    @contextlib.contextmanager
+    def final_pass(self):
+        """Give the calling thread's transcription priority over realtime passes"""
+        with self.condition:
+            self.priority_thread = threading.current_thread()
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.priority_thread = None
+                self.condition.notify_all()
+
+
+class RealtimePacer:
+    """Adapts the interval between realtime passes to inference time and system load
+
+    The recorder reads realtime_processing_pause before every realtime
+    pass, so the pacer steers it live. Each pass's inference time (reported
+    by the TranscriptionScheduler) is averaged, and passes are spaced so
+    they keep the model busy at most TARGET_DUTY of the time. A loaded CPU
+    spreads them further. Between MIN_INTERVAL and MAX_INTERVAL this is
+    fast on quick machines and keeps slow ones from piling passes up.
+
+    Passes are stale while the VAD hears no voice (the transcript cannot
+    change) and once the final pass is pending (its result will be typed
+    instead), so the pacer holds them off at MAX_INTERVAL then.
+    """
+
+    def __init__(self, recorder, base_interval=0.1, scheduler=None):
+        self.recorder = recorder
+        self.base_interval = base_interval  # Configured pause, used until passes were measured
+        self.pass_seconds = None  # Moving average of realtime pass durations
+        self.cpu_sample = system_cpu_ticks()
+        self.cpu_busy = None  # System CPU share since the previous pass
+        self.interval = base_interval
+        self.held = False  # Passes are held off (silence or final pass pending)
+        self.timeline = None
+        self.lock = threading.Lock()
+        if scheduler:
+            scheduler.pass_listener = self.on_pass
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Start new counters, e.g. per session"""
+        self.stats = {"passes": 0, "pass_ms_sum": 0.0, "max_pass_ms": 0.0, "max_wait_ms": 0.0,
+                      "interval_changes": 0, "held_seconds": 0.0, "held_since": None}
+
+    def begin_session(self, timeline=None):
+        """Pace a new session, reporting decisions on its timeline"""
+        with self.lock:
+            self.timeline = timeline
+            self.reset_stats()
+            self.held = False
+            self._apply()
+
+    def _sample_cpu(self):
+        """Update the system CPU share since the last sample"""
+        sample = system_cpu_ticks()
+        if sample and self.cpu_sample and sample[1] > self.cpu_sample[1]:
+            self.cpu_busy = (sample[0] - self.cpu_sample[0]) / (sample[1] - self.cpu_sample[1])
+        elif sample is None and hasattr(os, "getloadavg"):
+            self.cpu_busy = os.getloadavg()[0] / (os.cpu_count() or 1)
+        self.cpu_sample = sample
+
+    def _target_interval(self):
+        """Interval between pass starts for the measured pass time and load"""
+        interval = self.base_interval if self.pass_seconds is None else self.pass_seconds / TARGET_DUTY
+        if self.cpu_busy is not None and self.cpu_busy > BUSY_CPU:
+            interval *= self.cpu_busy / BUSY_CPU * 2
+        return round(min(max(interval, MIN_INTERVAL), MAX_INTERVAL), 3)
+
+    def _apply(self):
+        """Set the recorder's pause (caller holds the lock)"""
+        self.recorder.realtime_processing_pause = MAX_INTERVAL if self.held else self.interval
+
+    def on_pass(self, seconds, waited):
+        """A realtime pass held the model for `seconds` after waiting `waited` seconds for it"""
+        with self.lock:
+            self._sample_cpu()
+            if self.pass_seconds is None:
+                self.pass_seconds = seconds
+            else:
+                self.pass_seconds += PASS_SMOOTHING * (seconds - self.pass_seconds)
+            self.stats["passes"] += 1
+            self.stats["pass_ms_sum"] += seconds * 1000
+            self.stats["max_pass_ms"] = round(max(self.stats["max_pass_ms"], seconds * 1000), 2)
+            self.stats["max_wait_ms"] = round(max(self.stats["max_wait_ms"], waited * 1000), 2)
+
+            interval = self._target_interval()
+            # Small changes only add noise to the timeline
+            if abs(interval - self.interval) < 0.2 * self.interval:
+                return
+            self.interval = interval
+            self.stats["interval_changes"] += 1
+            self._apply()
+            if self.timeline:
+                self.timeline.mark("realtime_interval", interval_ms=round(interval * 1000, 1),
+                                   pass_ms=round(self.pass_seconds * 1000, 2),
+                                   cpu_busy=round(self.cpu_busy, 3) if self.cpu_busy is not None else None)
+
+    def _hold(self, held):
+        """Hold off or resume realtime passes"""
+        with self.lock:
+            if held == self.held:
+                return
+            self.held = held
+            now = time.monotonic()
+            if held:
+                self.stats["held_since"] = now
+            elif self.stats["held_since"] is not None:
+                self.stats["held_seconds"] += now - self.stats["held_since"]
+                self.stats["held_since"] = None
+            self._apply()
+
+    def on_voice_start(self):
+        """Voice again: the transcript can change, so pass at the normal interval"""
+        self._hold(False)
+
+    def on_voice_stop(self):
+        """Silence: new passes would only re-transcribe the same words"""
+        self._hold(True)
+
+    def on_final_pending(self):
+        """The final pass is waiting; realtime results would be superseded anyway"""
+        self._hold(True)
+
+    def session_stats(self):
+        """Summary of the session's pacing, for the timeline"""
+        with self.lock:
+            stats = dict(self.stats)
+        held_since = stats.pop("held_since")
+        if held_since is not None:
+            stats["held_seconds"] += time.monotonic() - held_since
+        pass_ms_sum = stats.pop("pass_ms_sum")
+        stats["mean_pass_ms"] = round(pass_ms_sum / stats["passes"], 2) if stats["passes"] else None
+        stats["held_seconds"] = round(stats["held_seconds"], 3)
+        stats["interval_ms"] = round(self.interval * 1000, 1)
+        return stats
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+
+import sys
+import time
+from clipboard import create_clipboard
+
+BACKENDS = ("auto", "pynput", "xtest", "recording")
+PASTE_EVENTS = 4         # Ctrl down, V down, V up, Ctrl up
+
+
+class OutputBackend:
+    """Base class for keystroke injection backends
+
+    Backends implement delete(count) and paste(text) and account for the
+    key events they send, so every backend can report its throughput.
+    """
+
+    name = "base"
+
+    def __init__(self, clipboard=None):
+        self.clipboard = clipboard  # Clipboard used for pastes, None for backends that do not paste
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Start a new measurement window, e.g. per session"""
+        self.event_count = 0
+        self.busy_seconds = 0.0
+        self.clipboard_seconds = 0.0
+
+    def begin_session(self):
+        """Reset counters and let the clipboard save the user's contents"""
+        self.reset_stats()
+        if self.clipboard:
+            self.clipboard.begin_session()
+
+    def end_session(self):
+        """Let the clipboard restore the user's contents"""
+        if self.clipboard:
+            self.clipboard.end_session()
+
+    def _account(self, events, start_time):
+        """Record `events` key events sent since `start_time`"""
+        self.event_count += events
+        self.busy_seconds += time.perf_counter() - start_time
+
+    @property
+    def events_per_second(self):
+        """Measured key events per second while the backend was busy"""
+        return self.event_count / self.busy_seconds if self.busy_seconds else 0.0
+
+    def stats(self):
+        """Return throughput counters for reporting"""
+        return {
+            "backend": self.name,
+            "events": self.event_count,
+            "busy_ms": round(self.busy_seconds * 1000, 2),
+            "events_per_second": round(self.events_per_second, 1),
+            "clipboard_ms": round(self.clipboard_seconds * 1000, 2),
+        }
+
+    def _copy_to_clipboard(self, text):
+        """Put text on the clipboard; returns once it is ready to be pasted"""
+        start_time = time.perf_counter()
+        self.clipboard.set_text(text)
+        self.clipboard_seconds += time.perf_counter() - start_time
+
+    def close(self):
+        """Release backend resources"""
+        if self.clipboard:
+            self.clipboard.close()
+
+
+class PynputBackend(OutputBackend):
+    """Sends key events through one long-lived pynput controller"""
+
+    name = "pynput"
+
+    def __init__(self, clipboard=None):
+        super().__init__(clipboard or create_clipboard())
+        # Deferred so importing this module does not connect to the display server
+        from pynput import keyboard
+        self.keyboard = keyboard
+        self.controller = keyboard.Controller()
+
+    def delete(self, count):
+        """Send `count` backspace keystrokes"""
+        start_time = time.perf_counter()
+        backspace = self.keyboard.Key.backspace
+        for _ in range(count):
+            self.controller.press(backspace)
+            self.controller.release(backspace)
+        self._account(2 * count, start_time)
+
+    def paste(self, text):
+        """Insert text at the cursor through the clipboard"""
+        start_time = time.perf_counter()
+        self._copy_to_clipboard(text)
+
+        # Paste using Ctrl+V (cross-platform)
+        with self.controller.pressed(self.keyboard.Key.ctrl):
+            self.controller.press('v')
+            self.controller.release('v')
+        self._account(PASTE_EVENTS, start_time)
+
+
+class XTestBackend(OutputBackend):
+    """Queues a whole run of key events through the X11 XTest extension
+
+    Every event of a run is buffered client-side and submitted with a single
+    round trip to the X server, instead of one flush per key event.
+    """
+
+    name = "xtest"
+
+    def __init__(self, clipboard=None):
+        from Xlib import X, XK, display
+        from Xlib.ext import xtest
+
+        self.X = X
+        self.xtest = xtest
+        self.display = display.Display()
+        try:
+            if not self.display.query_extension("XTEST"):
+                raise RuntimeError("X server does not support the XTEST extension")
+            self.backspace = self._keycode(XK, "BackSpace")
+            self.control = self._keycode(XK, "Control_L")
+            self.v = self._keycode(XK, "v")
+            clipboard = clipboard or create_clipboard()
+        except Exception:
+            self.display.close()  # Otherwise a fallback to pynput leaks the connection
+            raise
+        super().__init__(clipboard)
+
+    def _keycode(self, XK, keysym_name):
+        """Resolve a keysym name to a keycode of the current keyboard mapping"""
+        keycode = self.display.keysym_to_keycode(XK.string_to_keysym(keysym_name))
+        if not keycode:
+            raise RuntimeError(f"No keycode for {keysym_name} in the current keyboard mapping")
+        return keycode
+
+    def _send(self, keycodes_and_types):
+        """Queue key events and submit them in one round trip"""
+        for event_type, keycode in keycodes_and_types:
+            self.xtest.fake_input(self.display, event_type, keycode)
+        self.display.sync()
+
+    def delete(self, count):
+        """Send `count` backspace keystrokes in a single batch"""
+        start_time = time.perf_counter()
+        press, release = self.X.KeyPress, self.X.KeyRelease
+        self._send([(press, self.backspace), (release, self.backspace)] * count)
+        self._account(2 * count, start_time)
+
+    def paste(self, text):
+        """Insert text at the cursor through the clipboard"""
+        start_time = time.perf_counter()
+        self._copy_to_clipboard(text)
+        press, release = self.X.KeyPress, self.X.KeyRelease
+        self._send([(press, self.control), (press, self.v), (release, self.v), (release, self.control)])
+        self._account(PASTE_EVENTS, start_time)
+
+    def close(self):
+        """Close the X connection"""
+        super().close()
+        self.display.close()
+
+
+class RecordingBackend(OutputBackend):
+    """Stub backend that records events and simulates the target text field"""
+
+    name = "recording"
+
+    def __init__(self):
+        super().__init__()
+        self.events = []  # (perf_counter timestamp, operation, argument)
+        self.text = ""
+
+    def delete(self, count):
+        """Record a run of backspaces and apply it to the simulated field"""
+        start_time = time.perf_counter()
+        self.events.append((start_time, 'delete', count))
+        self.text = self.text[:max(0, len(self.text) - count)]
+        self._account(2 * count, start_time)
+
+    def paste(self, text):
+        """Record a paste and apply it to the simulated field"""
+        start_time = time.perf_counter()
+        self.events.append((start_time, 'paste', text))
+        self.text += text
+        self._account(PASTE_EVENTS, start_time)
+
+
+def create_backend(name="auto", clipboard=None):
+    """Create an output backend by name
+
+    'auto' batches through XTest on X11 and falls back to pynput elsewhere
+    (or when XTest is unavailable). Pasting backends use `clipboard`, or
+    create_clipboard().
+    """
+    if name == "recording":
+        return RecordingBackend()
+    if name in BACKENDS and clipboard is None:
+        clipboard = create_clipboard()
+    if name == "pynput":
+        return PynputBackend(clipboard)
+    if name == "xtest":
+        return XTestBackend(clipboard)
+    if name != "auto":
+        raise ValueError(f"Unknown output backend: {name}")
+
+    if sys.platform.startswith("linux"):
+        try:
+            return XTestBackend(clipboard)
+        except Exception:
+            pass  # No X display, python-xlib or XTEST; pynput picks the right platform backend
+    return PynputBackend(clipboard)
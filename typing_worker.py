@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+
+import threading
+import time
+from logs import get_logger
+
+log = get_logger("typing")
+
+
+class TypingWorker:
+    """Applies text updates to a TypeController from a dedicated output thread
+
+    Producers submit() the newest full text and return immediately, so
+    keystroke injection never blocks transcription. Updates are coalesced in
+    a single latest-wins slot: a text that is superseded before the output
+    thread gets to it is counted as dropped, but the newest text is always
+    applied. Updates are spaced at least `min_interval` apart; the pending
+    text is applied on the trailing edge of that interval, or right away
+    when flush() is called.
+
+    Once submit_final() has queued a session's final text (or discard()
+    has dropped an aborted session), late realtime updates are ignored
+    until begin_session(), so they cannot retype a stale partial over the
+    final transcript.
+    """
+
+    def __init__(self, type_controller, min_interval=0.1):
+        self.type_controller = type_controller
+        self.min_interval = min_interval
+        self.condition = threading.Condition()
+        self.pending = None  # (text, perf_counter at submit) waiting to be applied
+        self.busy = False  # An update is being applied right now
+        self.flushing = False
+        self.finalized = False  # The session's final text was submitted; ignore further updates
+        self.last_apply_time = 0.0
+        self.running = True
+        self.reset_stats()
+        self.thread = threading.Thread(target=self._run, name="typing-worker", daemon=True)
+        self.thread.start()
+
+    def begin_session(self):
+        """Accept updates for a new session and start new counters"""
+        with self.condition:
+            self.finalized = False
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Start new counters, e.g. per session"""
+        with self.condition:
+            self.stats = {"submitted": 0, "applied": 0, "dropped": 0, "max_depth": 0, "max_lag_ms": 0.0,
+                          "apply_ms": 0.0}
+
+    @property
+    def depth(self):
+        """Updates waiting or in flight"""
+        return (self.pending is not None) + self.busy
+
+    def submit(self, text):
+        """Queue the newest text, replacing any update that has not been applied yet"""
+        self._submit(text, final=False)
+
+    def submit_final(self, text):
+        """Queue the session's final text; later submit() calls are ignored until begin_session()"""
+        self._submit(text, final=True)
+
+    def _submit(self, text, final):
+        if not text or not text.strip():
+            if final:
+                with self.condition:
+                    self.finalized = True
+            return
+        with self.condition:
+            if self.finalized:
+                return  # A realtime update that arrived after the final text
+            self.finalized = final
+            if self.pending is not None:
+                self.stats["dropped"] += 1
+            self.pending = (text, time.perf_counter())
+            self.stats["submitted"] += 1
+            self.stats["max_depth"] = max(self.stats["max_depth"], self.depth)
+            self.condition.notify_all()
+
+    def discard(self):
+        """Drop the pending update and ignore further ones, e.g. when a session is aborted"""
+        with self.condition:
+            self.finalized = True
+            if self.pending is not None:
+                self.stats["dropped"] += 1
+                self.pending = None
+            self.condition.notify_all()
+
+    def flush(self, timeout=None):
+        """Apply the pending update now and wait until the output thread is idle
+
+        Returns False if that did not happen within `timeout` seconds.
+        """
+        with self.condition:
+            self.flushing = True
+            self.condition.notify_all()
+            try:
+                return self.condition.wait_for(lambda: self.pending is None and not self.busy, timeout)
+            finally:
+                self.flushing = False
+
+    def close(self):
+        """Stop the output thread after applying what is pending"""
+        self.flush(timeout=5)
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        self.thread.join(timeout=1)
+
+    def _run(self):
+        while True:
+            with self.condition:
+                if not self.running:
+                    return
+                if self.pending is None:
+                    self.condition.wait()
+                    continue
+                delay = self.last_apply_time + self.min_interval - time.monotonic()
+                if delay > 0 and not self.flushing:
+                    self.condition.wait(delay)  # Newer text may replace the pending one meanwhile
+                    continue
+                text, submit_time = self.pending
+                self.pending = None
+                self.busy = True
+
+            apply_start = time.perf_counter()
+            lag_ms = (apply_start - submit_time) * 1000
+            try:
+                self.type_controller.apply_text(text)
+            except Exception as e:
+                log.warning("Warning: Typing worker failed to apply text: %s", e)
+            finally:
+                apply_ms = (time.perf_counter() - apply_start) * 1000
+                with self.condition:
+                    self.busy = False
+                    self.last_apply_time = time.monotonic()
+                    self.stats["applied"] += 1
+                    self.stats["max_lag_ms"] = round(max(self.stats["max_lag_ms"], lag_ms), 2)
+                    self.stats["apply_ms"] = round(self.stats["apply_ms"] + apply_ms, 2)
+                    self.condition.notify_all()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+
+import numpy as np
+from logs import get_logger
+
+log = get_logger(__name__)
+
+SAMPLE_RATE = 16000
+VAD_CHUNK_SAMPLES = 512
+
+
+def synthetic_audio(silence_seconds=0.5, tone_seconds=0.5, frequency=440):
+    """Build a 16 kHz int16 buffer of silence followed by a sine tone"""
+    silence = np.zeros(int(SAMPLE_RATE * silence_seconds), dtype=np.float32)
+    t = np.arange(int(SAMPLE_RATE * tone_seconds), dtype=np.float32) / SAMPLE_RATE
+    tone = 0.3 * np.sin(2 * np.pi * frequency * t)
+    return (np.concatenate([silence, tone]) * 32767).astype(np.int16)
+
+
+def _warm_vad(recorder, audio):
+    """Run every VAD chunk of the buffer through WebRTC and Silero"""
+    for offset in range(0, len(audio) - VAD_CHUNK_SAMPLES + 1, VAD_CHUNK_SAMPLES):
+        chunk = audio[offset:offset + VAD_CHUNK_SAMPLES].tobytes()
+        recorder._is_webrtc_speech(chunk)
+        recorder._is_silero_speech(chunk)
+
+
+def _warm_realtime(recorder, audio_float):
+    """Run the dedicated realtime model once"""
+    segments, _ = recorder.realtime_model_type.transcribe(
+        audio_float, language=recorder.language or None, beam_size=recorder.beam_size_realtime
+    )
+    list(segments)  # transcribe() is lazy; consume it to actually decode
+
+
+def _warm_final(recorder, audio_float):
+    """Run the final transcription worker once"""
+    recorder.perform_final_transcription(audio_float, use_prompt=False)
+
+
+def warm_up_recorder(recorder, timeline):
+    """Push a synthetic buffer through the VAD, realtime and final paths
+
+    Each stage is recorded as a span on `timeline`. Stages the installed
+    RealtimeSTT version does not expose are skipped. Returns the list of
+    stages that ran.
+    """
+    audio = synthetic_audio()
+    audio_float = audio.astype(np.float32) / 32768
+
+    stages = [("warmup_vad", _warm_vad, audio), ("warmup_final", _warm_final, audio_float)]
+    # A loaded model here (not a model name) means realtime passes use their own weights
+    if hasattr(getattr(recorder, "realtime_model_type", None), "transcribe"):
+        stages.insert(1, ("warmup_realtime", _warm_realtime, audio_float))
+
+    completed = []
+    for stage, warm, stage_audio in stages:
+        try:
+            with timeline.span(stage):
+                warm(recorder, stage_audio)
+            completed.append(stage)
+        except Exception as e:
+            timeline.mark("warmup_skipped", stage=stage, error=str(e))
+            log.warning("⚠️ Skipping %s: %s", stage, e)
+    return completed
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+
+import argparse
+import sys
+from batch_transcription import BatchTranscriber
+from logs import get_logger, setup_logging, stop_logging
+from transcription import TranscriptionHandler
+
+# Configuration
+WHISPER_MODEL = "tiny"
+BATCH_SECONDS = 30       # Group short files until a task holds this much audio
+LOG_LEVEL = "INFO"       # WARNING hides the progress messages
+LOG_FORMAT = "text"      # json: one structured record per line
+
+log = get_logger("batch")
+
+
+def main():
+    """Main entry point for offline batch transcription"""
+    parser = argparse.ArgumentParser(description="Transcribe recorded WAV/FLAC files in bulk")
+    parser.add_argument("inputs", nargs="+", help="audio files or directories to transcribe")
+    parser.add_argument("-o", "--output", default="transcripts.jsonl", help="JSONL results file")
+    parser.add_argument("-m", "--model", default=WHISPER_MODEL, help="Whisper model name")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="worker processes (default: half the cores)")
+    parser.add_argument("-t", "--threads", type=int, default=0, help="CPU threads per worker (default: cores / workers)")
+    parser.add_argument("--batch-seconds", type=float, default=BATCH_SECONDS, help="audio per worker task")
+    args = parser.parse_args()
+    
+    setup_logging(LOG_LEVEL, LOG_FORMAT)
+    try:
+        transcriber = BatchTranscriber(
+            TranscriptionHandler(args.model),
+            workers=args.workers,
+            batch_seconds=args.batch_seconds,
+            cpu_threads=args.threads,
+        )
+        summary = transcriber.run(args.inputs, args.output)
+    except KeyboardInterrupt:
+        log.warning("\n⚠️ Interrupted by user")
+        sys.exit(1)
+    except Exception as e:
+        log.error("Fatal error: %s", e)
+        sys.exit(1)
+    finally:
+        stop_logging()  # Write out the progress messages before the summary
+    
+    print(f"✅ {summary['files']} files ({summary['errors']} errors), "
+          f"{summary['audio_seconds']:.1f}s audio in {summary['wall_seconds']:.1f}s")
+    if summary['rtf'] is not None:
+        print(f"⚡ Real-time factor: {summary['rtf']:.3f} ({1 / summary['rtf']:.1f}x real time)")
+    print(f"📄 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
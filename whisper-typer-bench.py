@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import sys
+from e2e_benchmark import (REGRESSION_THRESHOLD, WER_THRESHOLD, compare, environment, load_manifest,
+                           run_config)
+from logs import get_logger, setup_logging, stop_logging
+
+# Configuration
+MODELS = ("tiny",)
+COMPUTE_TYPES = (None,)  # None uses the device default (int8 on CPU, float16 on CUDA)
+SILENCE_THRESHOLD = 1    # seconds of trailing silence before auto-stop, as in replay mode
+LOG_LEVEL = "INFO"       # WARNING hides per-fixture progress and session messages
+LOG_FORMAT = "text"      # json: one structured record per line
+
+log = get_logger("bench")
+
+
+def run(args):
+    """Sweep models and compute types over the fixture corpus"""
+    fixtures = load_manifest(args.manifest)
+    if not fixtures:
+        log.error("❌ The manifest lists no fixtures")
+        sys.exit(1)
+    log.info("📂 %s fixtures from %s", len(fixtures), args.manifest)
+    
+    runs = []
+    for model in args.models:
+        for compute_type in args.compute_types:
+            log.info("🧪 %s (%s)", model, compute_type or "default")
+            result = run_config(model, compute_type, fixtures, speed=args.speed, silence_threshold=args.silence)
+            summary = result["summary"]
+            runs.append(result)
+            log.info("📊 %s/%s: WER %.3f, RTF %.3f, first partial p50 %.0fms, stop→final p50/p95 %.0f/%.0fms, "
+                     "peak RSS %.0fMB, CPU %.2fs per audio second", model, result["compute_type"], summary["wer"],
+                     summary.get("rtf", 0), summary.get("first_partial_p50_ms", 0),
+                     summary.get("stop_to_final_p50_ms", 0), summary.get("stop_to_final_p95_ms", 0),
+                     summary["peak_rss_mb"], summary.get("cpu_per_audio_second", 0))
+    
+    results = dict(environment(), manifest=args.manifest, speed=args.speed, runs=runs)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    log.info("📄 Results written to %s", args.output)
+
+
+def compare_results(args):
+    """Fail when a metric got worse than the baseline by more than the threshold"""
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+    
+    rows = compare(baseline, current, args.threshold, args.wer_threshold)
+    if not rows:
+        print("⚠️ No configuration appears in both files")
+        sys.exit(1)
+    for key, metric, before, after, regressed in rows:
+        change = f"{(after - before) / before * 100:+.1f}%" if before else "n/a"
+        print(f"{'❌' if regressed else '✅'} {key:<20} {metric:<22} {before:>10.3f} → {after:>10.3f} ({change})")
+    regressions = [row for row in rows if row[4]]
+    if regressions:
+        print(f"❌ {len(regressions)} metric(s) regressed")
+        sys.exit(1)
+    print("✅ No regressions")
+
+
+def main():
+    """Benchmark the full dictation pipeline on recorded fixtures"""
+    parser = argparse.ArgumentParser(description="End-to-end latency and accuracy benchmark")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    run_parser = commands.add_parser("run", help="replay the fixtures and write results as JSON")
+    run_parser.add_argument("manifest", help="JSONL manifest of {\"audio\": ..., \"text\": ...} fixtures")
+    run_parser.add_argument("-m", "--models", nargs="+", default=list(MODELS), help="Whisper models to sweep")
+    run_parser.add_argument("-c", "--compute-types", nargs="+", default=list(COMPUTE_TYPES),
+                            help="compute types to sweep (e.g. int8 float32)")
+    run_parser.add_argument("-s", "--speed", type=float, default=1.0, help="replay speed (0 = as fast as possible)")
+    run_parser.add_argument("--silence", type=float, default=SILENCE_THRESHOLD, help="silence threshold in seconds")
+    run_parser.add_argument("-o", "--output", default="benchmark-results.json", help="results file")
+    run_parser.set_defaults(func=run)
+    
+    compare_parser = commands.add_parser("compare", help="check results against a baseline")
+    compare_parser.add_argument("baseline", help="results file to compare against")
+    compare_parser.add_argument("current", help="new results file")
+    compare_parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                                help="relative increase that fails (0.1 = 10%%)")
+    compare_parser.add_argument("--wer-threshold", type=float, default=WER_THRESHOLD,
+                                help="absolute word error rate increase that fails")
+    compare_parser.set_defaults(func=compare_results)
+    args = parser.parse_args()
+    
+    setup_logging(LOG_LEVEL, LOG_FORMAT)
+    try:
+        args.func(args)
+    except KeyboardInterrupt:
+        log.warning("\n⚠️ Interrupted by user")
+        sys.exit(1)
+    except (OSError, ValueError) as e:
+        log.error("❌ %s", e)
+        sys.exit(1)
+    finally:
+        stop_logging()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+
+import argparse
+import sys
+import numpy as np
+from autotune import (CANDIDATE_MODELS, TARGET_RTF, calibrate, choose_config, hardware_fingerprint,
+                      save_profile)
+from batch_transcription import SAMPLE_RATE, load_audio
+from logs import get_logger, setup_logging, stop_logging
+from paths import cache_path
+from transcription import TranscriptionHandler
+
+# Configuration
+AUTOTUNE_PROFILE = "autotune.json"  # Calibration profiles, inside the cache directory
+LOG_LEVEL = "INFO"       # WARNING hides the per-configuration results
+LOG_FORMAT = "text"      # json: one structured record per line
+
+log = get_logger("calibrate")
+
+
+def main():
+    """Benchmark candidate configurations on this machine and store the best one"""
+    parser = argparse.ArgumentParser(description="Calibrate model, compute type, threads and beam size")
+    parser.add_argument("--audio", nargs="+", help="speech recordings to benchmark with (recommended)")
+    parser.add_argument("-m", "--models", nargs="+", default=list(CANDIDATE_MODELS), help="candidate models")
+    parser.add_argument("--threads", nargs="+", type=int, default=None, help="CPU thread counts to try")
+    parser.add_argument("--target-rtf", type=float, default=TARGET_RTF,
+                        help="slowest acceptable real-time factor for the final pass")
+    args = parser.parse_args()
+    
+    setup_logging(LOG_LEVEL, LOG_FORMAT)
+    if args.audio:
+        audio = np.concatenate([load_audio(path) for path in args.audio])
+    else:
+        # Whisper decodes a tone faster than speech, so this underestimates RTF
+        from warmup import synthetic_audio
+        log.warning("⚠️ No --audio given, calibrating on synthetic audio (less representative than speech)")
+        audio = np.tile(synthetic_audio(), 5).astype(np.float32) / 32768
+    
+    try:
+        handler = TranscriptionHandler(args.models[0])
+        key, description = hardware_fingerprint(handler.device)
+        log.info("🖥️ %s, %s cores, %s GB (%s) - profile %s", description["cpu"], description["cores"],
+                 description["memory_gb"], handler.device, key)
+        log.info("⏱️ Benchmarking on %.1fs of audio...", len(audio) / SAMPLE_RATE)
+        
+        results = calibrate(handler, audio, models=args.models, threads=args.threads)
+        choice = choose_config(results, args.target_rtf, models=args.models)
+        if not choice:
+            log.error("❌ No configuration could be benchmarked")
+            sys.exit(1)
+        
+        path = cache_path(AUTOTUNE_PROFILE)
+        save_profile(path, key, description, results, choice, args.target_rtf)
+    except KeyboardInterrupt:
+        log.warning("\n⚠️ Interrupted by user")
+        sys.exit(1)
+    except Exception as e:
+        log.error("Fatal error: %s", e)
+        sys.exit(1)
+    finally:
+        stop_logging()  # Write out the benchmark results before the summary
+    
+    status = "meets" if choice["meets_target"] else "misses"
+    print(f"✅ {choice['model']} ({choice['compute_type']}, {choice['cpu_threads'] or 'auto'} threads, "
+          f"beam {choice['beam_size']}): RTF {choice['rtf']:.3f} {status} the {args.target_rtf} target")
+    print(f"⚙️ Realtime processing pause: {choice['realtime_processing_pause'] * 1000:.0f}ms")
+    print(f"💾 Profile saved to {path}")
+
+
+if __name__ == "__main__":
+    main()
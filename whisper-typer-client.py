@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+from control import COMMANDS, send_command
+
+# Configuration
+DEFAULT_COMMAND = "toggle"
+ONE_OFF_TOOL = os.path.join(os.path.dirname(os.path.abspath(__file__)), "whisper-typer-tool.py")
+
+
+def main():
+    """Forward a command to the warm server, falling back to one-off mode"""
+    command = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_COMMAND
+    if command not in COMMANDS:
+        print(f"Usage: {os.path.basename(sys.argv[0])} [{'|'.join(COMMANDS)}]")
+        sys.exit(2)
+    
+    try:
+        reply = send_command(command)
+    except OSError:
+        if command in ("start", "toggle"):
+            # No server running - load the model in this process instead
+            os.execv(sys.executable, [sys.executable, ONE_OFF_TOOL])
+        print("⚠️ No whisper-typer server running")
+        sys.exit(1)
+    
+    print(reply)
+    sys.exit(0 if reply.startswith("ok") else 1)
+
+
+if __name__ == "__main__":
+    main()
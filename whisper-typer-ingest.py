@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+
+import argparse
+import asyncio
+import os
+import sys
+from ingest import (BATCH_WAIT, DEFAULT_PORT, MAX_BATCH, REALTIME_INTERVAL, TOKEN_ENV, BatchDecoder,
+                    IngestServer, is_loopback)
+from logs import get_logger, setup_logging, stop_logging
+from transcription import TranscriptionHandler
+
+# Configuration
+WHISPER_MODEL = "base"
+HOST = "127.0.0.1"       # Use 0.0.0.0 to accept clients from the LAN (needs WHISPER_TYPER_INGEST_TOKEN)
+LOG_LEVEL = "INFO"       # DEBUG, INFO or WARNING
+LOG_FORMAT = "text"      # "text" or "json"
+
+log = get_logger("ingest")
+
+
+def main():
+    """Serve transcription to clients that stream audio over TCP"""
+    parser = argparse.ArgumentParser(description="Transcribe PCM streams from several clients with one model")
+    parser.add_argument("-m", "--model", default=WHISPER_MODEL, help="Whisper model name")
+    parser.add_argument("--host", default=HOST, help="address to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="TCP port")
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH, help="windows per inference call")
+    parser.add_argument("--realtime-interval", type=float, default=REALTIME_INTERVAL,
+                        help="seconds between realtime passes of one stream")
+    parser.add_argument("--batch-wait", type=float, default=BATCH_WAIT,
+                        help="seconds to wait for concurrent streams before decoding")
+    args = parser.parse_args()
+    
+    token = os.environ.get(TOKEN_ENV) or None
+    if not token and not is_loopback(args.host):
+        parser.error(f"listening on {args.host or 'all interfaces'} requires a shared token in {TOKEN_ENV}")
+    
+    setup_logging(LOG_LEVEL, LOG_FORMAT)
+    server = None
+    try:
+        handler = TranscriptionHandler(args.model)
+        log.info("Loading Whisper model %s...", args.model)
+        decoder = BatchDecoder(handler.create_model(), handler.language)
+        server = IngestServer(decoder, args.host, args.port, max_batch=args.max_batch,
+                              realtime_interval=args.realtime_interval, batch_wait=args.batch_wait,
+                              token=token)
+        
+        async def serve():
+            await server.start()
+            log.info("🎧 Ingest server listening on %s:%s%s", args.host, server.port,
+                     " (token required)" if token else "")
+            log.info("💡 Press Ctrl+C to stop the server")
+            await server.serve_forever()
+        
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        log.warning("\n⚠️ Interrupted by user")
+    except Exception as e:
+        log.error("Fatal error: %s", e)
+        stop_logging()
+        sys.exit(1)
+    
+    stats = server.stats if server else {"batches": 0}
+    if stats["batches"]:
+        log.info("📊 %s clients, %s batches, %.1f windows per batch (max %s), %.0fms per batch",
+                 stats["clients"], stats["batches"], stats["windows"] / stats["batches"],
+                 stats["max_batch"], stats["decode_ms"] / stats["batches"])
+    stop_logging()
+
+
+if __name__ == "__main__":
+    main()
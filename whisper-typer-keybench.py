@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+
+import argparse
+import contextlib
+import json
+import sys
+from keystroke_bench import PATTERNS, CaptureWindow, VirtualDisplay, run_benchmark, summarize
+from logs import get_logger, setup_logging, stop_logging
+
+# Configuration
+STEPS = 20               # Updates per pattern run
+REPEATS = 3              # Runs per pattern and mode
+LOG_LEVEL = "INFO"       # DEBUG also logs every correction, which adds to the measured update time
+LOG_FORMAT = "text"      # json: one structured record per line
+
+log = get_logger("keybench")
+
+
+def main():
+    """Measure keystroke injection against a text field on a virtual display"""
+    parser = argparse.ArgumentParser(description="Keystroke throughput, paste latency and dropped input per correction pattern")
+    parser.add_argument("--backend", choices=("xtest", "pynput"), default="xtest", help="output backend to measure")
+    parser.add_argument("--patterns", nargs="+", choices=PATTERNS, default=list(PATTERNS), help="correction patterns")
+    parser.add_argument("--steps", type=int, default=STEPS, help="updates per run")
+    parser.add_argument("--repeats", type=int, default=REPEATS, help="runs per pattern and mode")
+    parser.add_argument("--display", action="store_true",
+                        help="use the current DISPLAY instead of starting Xvfb (the capture window takes the focus)")
+    parser.add_argument("-o", "--output", default=None, help="also write the results as JSON")
+    args = parser.parse_args()
+    
+    setup_logging(LOG_LEVEL, LOG_FORMAT)
+    try:
+        with VirtualDisplay() if not args.display else contextlib.nullcontext():
+            # Deferred until DISPLAY points at the server under test
+            from text_typing import TypeController
+            controller = TypeController(output=args.backend)
+            window = CaptureWindow()
+            try:
+                results = run_benchmark(controller, window, args.steps, args.repeats, args.patterns)
+            finally:
+                window.close()
+                controller.output.close()
+    except KeyboardInterrupt:
+        log.warning("\n⚠️ Interrupted by user")
+        sys.exit(1)
+    except Exception as e:
+        log.error("❌ %s", e)
+        sys.exit(1)
+    finally:
+        stop_logging()  # Write out typing warnings before the report
+    
+    summary = summarize(results)
+    print(f"\n⌨️ {args.backend}: {args.steps} updates per run, {args.repeats} runs")
+    for entry in summary:
+        round_trip = f"{entry['round_trip_p50_ms']:6.1f}ms / {entry['round_trip_p95_ms']:6.1f}ms" \
+            if "round_trip_p50_ms" in entry else "-"
+        print(f"{entry['pattern']:<15} {entry['mode']:<6} | {entry['keystrokes_per_second']:7.0f} keys/s "
+              f"| round trip p50/p95: {round_trip:<19} | errors: {entry['error_rate'] * 100:.1f}%")
+    
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"backend": args.backend, "summary": summary, "runs": results}, f, indent=2)
+        print(f"📄 Results written to {args.output}")
+    if any(entry["error_rate"] for entry in summary):
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
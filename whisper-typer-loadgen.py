@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import numpy as np
+from batch_transcription import SAMPLE_RATE, find_audio_files, load_audio
+from ingest import DEFAULT_PORT, TOKEN_ENV, stream_audio
+from timeline import percentile
+
+# Configuration
+CONCURRENCY = (1, 4, 16)  # Concurrent streams per run
+
+
+async def run_level(host, port, clips, streams, speed, token=None):
+    """Stream `streams` clips at once and summarize throughput and latency"""
+    start_time = time.perf_counter()
+    results = await asyncio.gather(*[
+        stream_audio(host, port, clips[i % len(clips)], speed=speed, token=token) for i in range(streams)
+    ], return_exceptions=True)
+    wall_seconds = time.perf_counter() - start_time
+    
+    completed = [r for r in results if not isinstance(r, BaseException)]
+    if not completed:
+        raise results[0]
+    audio_seconds = sum(r["audio_seconds"] for r in completed)
+    summary = {
+        "streams": streams,
+        "completed": len(completed),
+        "errors": len(results) - len(completed),
+        "audio_seconds": round(audio_seconds, 3),
+        "wall_seconds": round(wall_seconds, 3),
+        "throughput_x_realtime": round(audio_seconds / wall_seconds, 2),
+    }
+    for metric in ("final_ms", "first_realtime_ms"):
+        values = [r[metric] for r in completed if r[metric] is not None]
+        if values:
+            summary[f"{metric[:-3]}_p50_ms"] = round(percentile(values, 50), 2)
+            summary[f"{metric[:-3]}_p95_ms"] = round(percentile(values, 95), 2)
+    batch_sizes = [r["server_batch_size"] for r in completed]
+    if batch_sizes:
+        summary["mean_final_batch"] = round(sum(batch_sizes) / len(batch_sizes), 2)
+    return summary
+
+
+def main():
+    """Replay audio files as concurrent streams against a running ingest server"""
+    parser = argparse.ArgumentParser(description="Measure ingest server throughput and latency")
+    parser.add_argument("inputs", nargs="+", help="audio files or directories to stream")
+    parser.add_argument("--host", default="127.0.0.1", help="ingest server address")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="ingest server port")
+    parser.add_argument("-c", "--concurrency", type=int, nargs="+", default=list(CONCURRENCY),
+                        help="concurrent streams per run")
+    parser.add_argument("-s", "--speed", type=float, default=1.0, help="stream speed (0 = as fast as possible)")
+    parser.add_argument("-o", "--output", default=None, help="also write the results as JSON")
+    args = parser.parse_args()
+    
+    paths = find_audio_files(args.inputs)
+    if not paths:
+        print("❌ No audio files found")
+        sys.exit(1)
+    clips = [(load_audio(path) * 32767).clip(-32768, 32767).astype(np.int16) for path in paths]
+    print(f"📂 {len(clips)} clips, {sum(len(c) for c in clips) / SAMPLE_RATE:.1f}s of audio")
+    
+    summaries = []
+    try:
+        for streams in args.concurrency:
+            summary = asyncio.run(run_level(args.host, args.port, clips, streams, args.speed,
+                                            token=os.environ.get(TOKEN_ENV)))
+            summaries.append(summary)
+            final = f"{summary['final_p50_ms']:7.0f}ms / {summary['final_p95_ms']:7.0f}ms" \
+                if "final_p50_ms" in summary else "n/a"
+            print(f"{streams:>3} streams | {summary['throughput_x_realtime']:6.2f}x real time "
+                  f"| final p50/p95: {final} | errors: {summary['errors']}")
+    except KeyboardInterrupt:
+        print("\n⚠️ Interrupted by user")
+        sys.exit(1)
+    except OSError as e:
+        print(f"❌ Could not reach the ingest server at {args.host}:{args.port}: {e}")
+        sys.exit(1)
+    
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"speed": args.speed, "runs": summaries}, f, indent=2)
+        print(f"📄 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
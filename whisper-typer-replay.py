@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+import argparse
+import sys
+import time
+from app import WhisperTyperApp
+from audio_source import WavFileSource
+from logs import LOG_FORMATS, setup_logging, stop_logging
+from timeline import percentile
+from transcription import REALTIME_MODES
+from typing_backends import BACKENDS
+
+# Configuration
+WHISPER_MODEL = "tiny"
+SILENCE_THRESHOLD = 1    # seconds of trailing silence before auto-stop
+
+
+def main():
+    """Replay a recorded fixture through the full pipeline without a microphone"""
+    parser = argparse.ArgumentParser(description="Run a dictation session from an audio file")
+    parser.add_argument("audio", help="WAV/FLAC fixture to replay")
+    parser.add_argument("-m", "--model", default=WHISPER_MODEL, help="Whisper model name")
+    parser.add_argument("-s", "--speed", type=float, default=1.0, help="replay speed (0 = as fast as possible)")
+    parser.add_argument("--silence", type=float, default=SILENCE_THRESHOLD, help="silence threshold in seconds")
+    parser.add_argument("--type", action="store_true", help="type into the focused window (same as --backend auto)")
+    parser.add_argument("--backend", choices=BACKENDS, default="recording", help="output backend (default: recording stub)")
+    parser.add_argument("--adaptive-realtime", action="store_true", help="pace realtime passes by inference time and load")
+    parser.add_argument("--realtime-mode", choices=REALTIME_MODES, default="full",
+                        help="tail: decode only the uncommitted end of the recording")
+    parser.add_argument("--long-dictation", action="store_true", help="finalize the recording segment by segment at pauses")
+    parser.add_argument("--spill", default=None, help="with --long-dictation, keep finalized audio as FLAC in this directory")
+    parser.add_argument("--log-level", default="INFO", choices=("DEBUG", "INFO", "WARNING"),
+                        help="DEBUG also logs every correction; compare the apply time it costs")
+    parser.add_argument("--log-format", choices=LOG_FORMATS, default="text", help="json: structured records")
+    args = parser.parse_args()
+    
+    source = WavFileSource(args.audio, speed=args.speed)
+    backend = "auto" if args.type else args.backend
+    setup_logging(args.log_level, args.log_format)
+    
+    try:
+        with WhisperTyperApp(args.model, args.silence, audio_source=source, output=backend,
+                             adaptive_realtime=args.adaptive_realtime, realtime_mode=args.realtime_mode,
+                             long_dictation=args.long_dictation, spill_dir=args.spill) as app:
+            start_time = time.perf_counter()
+            app.record_once()
+            session_seconds = time.perf_counter() - start_time
+    except KeyboardInterrupt:
+        print("\n⚠️ Interrupted by user")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Fatal error: {e}")
+        sys.exit(1)
+    stop_logging()  # Write out the session's log before the report
+    
+    print(f"⏱️ Audio: {source.duration:.2f}s, session: {session_seconds:.2f}s")
+    for metric, value in app.timeline.metrics().items():
+        print(f"⏱️ {metric}: {value:.1f}")
+    tail_passes = [e for e in app.timeline.events if e["event"] == "tail_pass"]
+    if len(tail_passes) >= 10:
+        # Per-pass cost should stay flat as the dictation grows
+        tenth = len(tail_passes) // 10
+        for label, passes in (("first", tail_passes[:tenth]), ("last", tail_passes[-tenth:])):
+            print(f"⏱️ Tail passes, {label} 10%: decode p50 {percentile([p['decode_ms'] for p in passes], 50):.1f}ms, "
+                  f"window p50 {percentile([p['window_ms'] for p in passes], 50) / 1000:.1f}s")
+    cuts = [e for e in app.timeline.events if e["event"] == "segment_cut"]
+    segment_stats = next((e for e in app.timeline.events if e["event"] == "segment_stats"), None)
+    if segment_stats:
+        # Buffered audio and memory should stay flat however long the recording is
+        rss = [e["rss_mb"] for e in cuts if e.get("rss_mb")]
+        print(f"✂️ Segments: {segment_stats['segments']} cut ({segment_stats['forced']} without a pause), "
+              f"max buffer {segment_stats['max_buffer_ms'] / 1000:.1f}s, "
+              f"flush at stop {segment_stats['flush_wait_ms']:.0f}ms"
+              + (f", RSS {min(rss):.0f}-{max(rss):.0f}MB" if rss else ""))
+        if segment_stats["spill_path"]:
+            print(f"💾 Finalized audio: {segment_stats['spill_path']}")
+    typing_stats = app.typing_worker.stats
+    print(f"⌨️ Updates: {typing_stats['applied']} applied, {typing_stats['dropped']} coalesced, "
+          f"max lag {typing_stats['max_lag_ms']:.1f}ms")
+    if typing_stats["applied"]:
+        # Time the typing thread spends per update, including logging at --log-level DEBUG
+        print(f"⌨️ Applying updates: {typing_stats['apply_ms']:.1f}ms in total, "
+              f"{typing_stats['apply_ms'] / typing_stats['applied']:.3f}ms per update")
+    output = app.type_controller.output
+    stats = output.stats()
+    print(f"⌨️ {stats['backend']}: {stats['events']} key events in {stats['busy_ms']:.1f}ms "
+          f"({stats['events_per_second']:.0f} events/s)")
+    if backend == "recording":
+        if output.events:
+            first_output = output.events[0][0] - start_time
+            print(f"⏱️ First output after {first_output * 1000:.0f}ms, {len(output.events)} output events")
+        print(f"📝 Simulated field: '{output.text}'")
+
+
+if __name__ == "__main__":
+    main()
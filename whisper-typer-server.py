@@ -6,36 +6,82 @@ import threading
 import time
 from pynput import keyboard
 from app import WhisperTyperApp
+from control import ControlServer
+from endpointing import AdaptiveEndpointer
+from logs import get_logger, setup_logging
+from paths import cache_path
+from session_profiler import PROFILE_SESSIONS, SessionProfiler
 
 # Configuration
 WHISPER_MODEL = "tiny"
 SILENCE_THRESHOLD = 4    # seconds before auto-stop
 HOTKEY = keyboard.Key.menu  # Menu key as default hotkey
+TIMELINE_LOG = "timeline.jsonl"  # Session latency timelines, inside the cache directory
+WARMUP = True            # Run a synthetic pass through the models before announcing ready
+OUTPUT_BACKEND = "auto"  # Keystroke backend: auto, xtest (X11, batched), pynput
+ADAPTIVE_ENDPOINTING = True  # Learn the silence threshold from your pauses (SILENCE_THRESHOLD is the maximum)
+ENDPOINT_STATS = "endpointing.json"  # Learned pause lengths, inside the cache directory
+AUTOTUNE_PROFILE = "autotune.json"  # Written by whisper-typer-calibrate.py; overrides WHISPER_MODEL when present (None to disable)
+ADAPTIVE_REALTIME = True  # Space realtime passes by measured inference time and CPU load
+REALTIME_MODE = "full"   # tail: decode only the uncommitted end of long dictations (loads a second model copy)
+LONG_DICTATION = False   # Finalize long sessions segment by segment at pauses (loads a second model copy)
+SPILL_DIR = None         # With LONG_DICTATION, keep finalized audio as FLAC in this cache subdirectory (e.g. "dictations")
+RECORDING_MODE = "auto"  # auto: stop after silence, toggle: press the hotkey again, push: hold the hotkey
+EXPLICIT_STOP_SILENCE = 60  # Silence timeout in toggle/push mode, only a safety net
+PREROLL_SECONDS = 0      # Keep the mic open and prepend this much audio from before the hotkey (0 = off)
+IDLE_UNLOAD_MINUTES = 0  # Release the model after this long without a session, reload on the hotkey (0 = never)
+PROFILE_DIR = "profiles"  # Session profiles (--profile, SIGUSR1 or `profile` command), inside the cache directory
+LOG_LEVEL = "INFO"       # DEBUG also logs every realtime correction (the typing hot path)
+LOG_FORMAT = "text"      # json: one structured record per line (session, event, duration_ms)
+
+RECORDING_MODES = ("auto", "toggle", "push")
+
+log = get_logger("server")
 
 
 class WhisperTyperServer:
     """Server mode for whisper-typer-tool with persistent model and hotkey activation"""
     
-    def __init__(self, model_name=WHISPER_MODEL, silence_threshold=SILENCE_THRESHOLD, hotkey=HOTKEY):
+    def __init__(self, model_name=WHISPER_MODEL, silence_threshold=SILENCE_THRESHOLD, hotkey=HOTKEY,
+                 recording_mode=RECORDING_MODE, profile_sessions=0):
+        if recording_mode not in RECORDING_MODES:
+            raise ValueError(f"Unknown recording mode: {recording_mode}")
         self.model_name = model_name
         self.silence_threshold = silence_threshold
         self.hotkey = hotkey
+        self.recording_mode = recording_mode
+        self.hotkey_down = False  # Ignore auto-repeated presses while the hotkey is held
         self.app = None
         self.is_recording = False
         self.is_shutting_down = False
+        self.is_loading = False  # Control commands are refused until the model is ready
         self.recording_lock = threading.Lock()
         self.hotkey_listener = None
+        self.control_server = None
+        self.last_activity = time.monotonic()  # End of the last session, for idle unloading
+        self.session_count = 0
+        self.profiler = SessionProfiler(cache_path(PROFILE_DIR))
+        if profile_sessions:
+            self.profiler.request(profile_sessions)
         
         # Setup signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
+        if hasattr(signal, "SIGUSR1"):
+            # `kill -USR1 <pid>` profiles the next sessions of a running server
+            signal.signal(signal.SIGUSR1, self._profile_signal_handler)
     
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals gracefully"""
-        print(f"\n🔔 Received signal {signum}, shutting down...")
+        log.info("\n🔔 Received signal %s, shutting down...", signum)
         self.shutdown()
         sys.exit(0)
     
+    def _profile_signal_handler(self, signum, frame):
+        """Profile the next sessions"""
+        self.profiler.request()
+        log.info("\n🔬 Profiling the next %s sessions", self.profiler.remaining)
+    
     def _on_key_press(self, key):
         """Handle hotkey press events"""
         if self.is_shutting_down:
@@ -43,66 +89,199 @@ class WhisperTyperServer:
             
         try:
             if key == self.hotkey:
+                hotkey_time = time.perf_counter()
+                if self.hotkey_down:
+                    return
+                self.hotkey_down = True
+                
                 with self.recording_lock:
                     if not self.is_recording:
-                        self._start_recording()
+                        self._start_recording(hotkey_time)
+                        return
+                
+                # Stop outside the lock: the recording thread needs it to finish
+                if self.recording_mode == "toggle":
+                    log.info("⏹️ Hotkey pressed - finalizing now...")
+                    self.app.stop_recording(source="hotkey")
         except Exception as e:
-            print(f"⚠️ Hotkey error: {e}")
+            log.warning("⚠️ Hotkey error: %s", e)
     
-    def _start_recording(self):
+    def _on_key_release(self, key):
+        """Handle hotkey release events (push-to-talk)"""
+        if self.is_shutting_down:
+            return False  # Stop listener
+        
+        try:
+            if key == self.hotkey:
+                self.hotkey_down = False
+                if self.recording_mode == "push" and self.is_recording:
+                    log.info("⏹️ Hotkey released - finalizing now...")
+                    self.app.stop_recording(source="release")
+        except Exception as e:
+            log.warning("⚠️ Hotkey error: %s", e)
+    
+    def _handle_control_command(self, command):
+        """Handle a command received on the control socket"""
+        if self.is_shutting_down:
+            return "error shutting down"
+        if self.is_loading:
+            return "error loading model"
+        
+        hotkey_time = time.perf_counter()
+        if command == "toggle":
+            command = "stop" if self.is_recording else "start"
+        
+        with self.recording_lock:
+            if command == "start":
+                if self.is_recording:
+                    return "ok recording"
+                self._start_recording(hotkey_time)
+                return "ok recording"
+            
+            if command == "status":
+                return "ok recording" if self.is_recording else "ok idle"
+            
+            if command == "profile":
+                self.profiler.request()
+                return f"ok profiling {self.profiler.remaining}"
+            
+            if not self.is_recording:
+                return "ok idle"
+        
+        # Stop/abort outside the lock: the recording thread needs it to finish
+        if command == "stop":
+            self.app.stop_recording(source="control")
+            return "ok stopping"
+        
+        self.app.abort_recording()
+        return "ok aborted"
+    
+    def _start_recording(self, hotkey_time=None):
         """Start a recording session in a separate thread"""
         if self.is_recording:
             return
             
         self.is_recording = True
-        print("🎤 Hotkey pressed - starting recording...")
+        log.info("🎤 Hotkey pressed - starting recording...")
         
         # Start recording in separate thread to avoid blocking hotkey listener
-        recording_thread = threading.Thread(target=self._record_session, daemon=True)
+        recording_thread = threading.Thread(target=self._record_session, args=(hotkey_time,),
+                                            name="recording-session", daemon=True)
         recording_thread.start()
     
-    def _record_session(self):
+    def _record_session(self, hotkey_time=None):
         """Handle a single recording session"""
         try:
             # Use the persistent app instance to record
             if self.app:
-                self.app.record_once()
+                self.session_count += 1
+                with self.profiler.session(f"session-{self.session_count}"):
+                    self.app.record_once(hotkey_time)
         except Exception as e:
-            print(f"⚠️ Recording error: {e}")
+            log.warning("⚠️ Recording error: %s", e)
         finally:
             with self.recording_lock:
                 self.is_recording = False
+                self.last_activity = time.monotonic()
+    
+    def _check_idle(self):
+        """Unload the model once nobody has recorded for IDLE_UNLOAD_MINUTES"""
+        if not IDLE_UNLOAD_MINUTES or not self.app:
+            return
+        # Holding the lock keeps a hotkey press from starting a session mid-unload
+        with self.recording_lock:
+            if self.is_recording or not self.app.loaded:
+                return
+            if time.monotonic() - self.last_activity < IDLE_UNLOAD_MINUTES * 60:
+                return
+            log.info("💤 Idle for %s min - unloading model until the next hotkey press...", IDLE_UNLOAD_MINUTES)
+            self.app.unload()
     
     def start(self):
         """Start the server and begin listening for hotkeys"""
-        print("🚀 Starting Whisper Typer Server...")
-        print(f"📝 Model: {self.model_name}")
-        print(f"🔇 Silence threshold: {self.silence_threshold}s")
-        print(f"⌨️ Hotkey: {self.hotkey}")
-        print("Loading Whisper model (this may take a moment)...")
+        log.info("🚀 Starting Whisper Typer Server...")
+        log.info("📝 Model: %s", self.model_name)
+        log.info("⌨️ Hotkey: %s (%s mode)", self.hotkey, self.recording_mode)
+        
+        # Claim the control socket first, so a second instance fails before loading a model
+        control_server = ControlServer(self._handle_control_command)
+        try:
+            control_server.start()
+        except (RuntimeError, OSError) as e:
+            log.error("❌ Fatal error: %s", e)
+            sys.exit(1)
+        self.control_server = control_server
+        self.is_loading = True
+        log.info("🔌 Control socket: %s", self.control_server.socket_path)
+        
+        # Explicit stops replace the silence timeout, which stays only as a safety net
+        silence_threshold = self.silence_threshold
+        if self.recording_mode != "auto":
+            silence_threshold = max(silence_threshold, EXPLICIT_STOP_SILENCE)
+        endpointer = None
+        if ADAPTIVE_ENDPOINTING and self.recording_mode == "auto":
+            endpointer = AdaptiveEndpointer(cache_path(ENDPOINT_STATS), silence_threshold)
+            log.info("🔇 Silence threshold: %ss (adaptive, at most %ss)", endpointer.threshold(), silence_threshold)
+        else:
+            log.info("🔇 Silence threshold: %ss", silence_threshold)
+        log.info("Loading Whisper model (this may take a moment)...")
+        
+        audio_source = None
+        if PREROLL_SECONDS > 0 or IDLE_UNLOAD_MINUTES:
+            # Capturing ourselves also lets speech during a model reload be buffered;
+            # without a pre-roll the microphone is only open during sessions
+            from audio_source import PrerollMicSource  # Deferred: pulls in numpy
+            audio_source = PrerollMicSource(PREROLL_SECONDS)
+        if PREROLL_SECONDS > 0:
+            log.info("🎙️ Pre-roll: %.0fms of audio before each session", PREROLL_SECONDS * 1000)
+        if IDLE_UNLOAD_MINUTES:
+            log.info("💤 Idle unload: after %s min without a session", IDLE_UNLOAD_MINUTES)
         
         try:
             # Initialize the WhisperTyperApp in server mode
-            self.app = WhisperTyperApp(self.model_name, self.silence_threshold, server_mode=True)
+            self.app = WhisperTyperApp(
+                self.model_name,
+                silence_threshold,
+                server_mode=True,
+                timeline_path=cache_path(TIMELINE_LOG),
+                warmup=WARMUP,
+                output=OUTPUT_BACKEND,
+                recording_mode=self.recording_mode,
+                endpointer=endpointer,
+                audio_source=audio_source,
+                autotune_path=cache_path(AUTOTUNE_PROFILE) if AUTOTUNE_PROFILE else None,
+                adaptive_realtime=ADAPTIVE_REALTIME,
+                realtime_mode=REALTIME_MODE,
+                long_dictation=LONG_DICTATION,
+                spill_dir=cache_path(SPILL_DIR) if SPILL_DIR else None,
+            )
             self.app.__enter__()  # Initialize resources
+            self.last_activity = time.monotonic()
+            self.is_loading = False
             
-            print("✅ Model loaded and ready!")
-            print(f"🎧 Server running - press {self.hotkey} to start recording")
-            print("💡 Press Ctrl+C to stop the server")
+            log.info("✅ Model loaded and ready!")
+            if self.recording_mode == "push":
+                log.info("🎧 Server running - hold %s while speaking", self.hotkey)
+            elif self.recording_mode == "toggle":
+                log.info("🎧 Server running - press %s to start recording and again to finish", self.hotkey)
+            else:
+                log.info("🎧 Server running - press %s to start recording", self.hotkey)
+            log.info("💡 Press Ctrl+C to stop the server")
             
             # Start hotkey listener
-            self.hotkey_listener = keyboard.Listener(on_press=self._on_key_press)
+            self.hotkey_listener = keyboard.Listener(on_press=self._on_key_press, on_release=self._on_key_release)
             self.hotkey_listener.start()
             
             # Keep the main thread alive
             while not self.is_shutting_down:
                 time.sleep(0.1)
+                self._check_idle()
                 
         except KeyboardInterrupt:
-            print("\n⚠️ Interrupted by user")
+            log.warning("\n⚠️ Interrupted by user")
             self.shutdown()
         except Exception as e:
-            print(f"❌ Fatal error: {e}")
+            log.error("❌ Fatal error: %s", e)
             self.shutdown()
             sys.exit(1)
     
@@ -112,17 +291,21 @@ class WhisperTyperServer:
             return
             
         self.is_shutting_down = True
-        print("🔄 Shutting down server...")
+        log.info("🔄 Shutting down server...")
         
         # Stop hotkey listener
         if self.hotkey_listener:
             self.hotkey_listener.stop()
         
+        # Stop accepting control commands
+        if self.control_server:
+            self.control_server.stop()
+        
         # Wait for any ongoing recording to finish
         max_wait = 10  # seconds
         wait_count = 0
         while self.is_recording and wait_count < max_wait:
-            print(f"⏳ Waiting for recording to finish... ({wait_count}/{max_wait})")
+            log.info("⏳ Waiting for recording to finish... (%s/%s)", wait_count, max_wait)
             time.sleep(1)
             wait_count += 1
         
@@ -131,14 +314,16 @@ class WhisperTyperServer:
             try:
                 self.app.__exit__(None, None, None)
             except Exception as e:
-                print(f"⚠️ Cleanup error: {e}")
+                log.warning("⚠️ Cleanup error: %s", e)
         
-        print("✅ Server shutdown complete")
+        log.info("✅ Server shutdown complete")
 
 
 def main():
     """Main entry point for server mode"""
-    server = WhisperTyperServer()
+    setup_logging(LOG_LEVEL, LOG_FORMAT)
+    # --profile profiles the first sessions, like SIGUSR1 does later on
+    server = WhisperTyperServer(profile_sessions=PROFILE_SESSIONS if "--profile" in sys.argv[1:] else 0)
     server.start()
 
 
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+
+import argparse
+import sys
+from endpointing import endpoint_report
+from paths import cache_path
+from timeline import load_records, percentile, split_records, summarize
+
+# Configuration
+TIMELINE_LOG = "timeline.jsonl"
+
+
+def main():
+    """Print latency percentiles from recorded session timelines"""
+    parser = argparse.ArgumentParser(description="Summarize session latency timelines")
+    parser.add_argument("path", nargs="?", default=None, help="timeline JSONL file (default: cache directory)")
+    parser.add_argument("--last", type=int, default=0, help="only consider the most recent N sessions")
+    args = parser.parse_args()
+    
+    path = args.path or cache_path(TIMELINE_LOG)
+    all_records = load_records(path)
+    warmups, records = split_records(all_records)
+    unloads, _ = split_records(all_records, kind="unload")
+    if args.last:
+        records = records[-args.last:]
+    
+    if not records:
+        print(f"⚠️ No sessions recorded in {path}")
+        sys.exit(1)
+    
+    print(f"📊 {len(records)} sessions from {path}")
+    print("-" * 60)
+    for metric, stats in summarize(records).items():
+        print(f"{metric:<25} | n={stats['count']:<4} | p50: {stats['p50']:8.1f}ms "
+              f"| p95: {stats['p95']:8.1f}ms | p99: {stats['p99']:8.1f}ms")
+    
+    # First session after start-up vs later ones, to judge the warm-up pass
+    first = [r for r in records if r["attributes"].get("session_index") == 1]
+    later = [r for r in records if r["attributes"].get("session_index", 1) > 1]
+    if first and later:
+        print()
+        for label, group in (("first session", first), ("later sessions", later)):
+            stats = summarize(group).get("time_to_first_word_ms")
+            if stats:
+                print(f"time_to_first_word p50, {label:<15} | n={stats['count']:<4} | {stats['p50']:8.1f}ms")
+    
+    # Stop-to-text per recording mode: silence timeouts vs explicit stops
+    modes = sorted({r["attributes"].get("recording_mode", "auto") for r in records})
+    if modes != ["auto"]:
+        print()
+        for mode in modes:
+            group = [r for r in records if r["attributes"].get("recording_mode", "auto") == mode]
+            summary = summarize(group, ("speech_end_to_typed_ms", "stop_request_to_typed_ms"))
+            for metric, stats in summary.items():
+                print(f"{mode:<6} {metric:<25} | n={stats['count']:<4} | p50: {stats['p50']:8.1f}ms "
+                      f"| p95: {stats['p95']:8.1f}ms")
+    
+    # Shorter thresholds only pay off if they do not cut people off
+    report = endpoint_report(records)
+    if report:
+        print()
+        for mode, stats in report.items():
+            latency = stats["mean_stop_latency_ms"]
+            latency = f"{latency:8.1f}ms" if latency is not None else f"{'n/a':>10}"
+            print(f"{mode:<8} endpointing | n={stats['sessions']:<4} | threshold: {stats['mean_threshold_s']:.2f}s "
+                  f"| stop latency: {latency} | truncated: {stats['truncation_rate']:.1%}")
+    
+    warmup_ms = [e["t_ms"] for r in warmups for e in r["events"] if e["event"] == "warmup_done"]
+    if warmup_ms:
+        print(f"warm-up duration p50{'':<16} | n={len(warmup_ms):<4} | {percentile(warmup_ms, 50):8.1f}ms")
+    
+    # Memory given back by idle unloading; the reload cost shows up as model_reload_ms above
+    unloaded = [e for r in unloads for e in r["events"] if e["event"] == "unloaded"]
+    if unloaded:
+        before = percentile([e["rss_before_mb"] for e in unloaded], 50)
+        after = percentile([e["rss_after_mb"] for e in unloaded], 50)
+        print(f"RSS p50 before/after idle unload{'':<4} | n={len(unloaded):<4} | {before:.0f}MB → {after:.0f}MB")
+
+
+if __name__ == "__main__":
+    main()
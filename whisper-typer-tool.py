@@ -1,25 +1,58 @@
 #!/usr/bin/env python3
 
 import sys
+import time
 from app import WhisperTyperApp
+from endpointing import AdaptiveEndpointer
+from logs import get_logger, setup_logging
+from paths import cache_path
 
 # Configuration
 WHISPER_MODEL = "tiny"
 SILENCE_THRESHOLD = 4    # seconds before auto-stop
+TIMELINE_LOG = "timeline.jsonl"  # Session latency timelines, inside the cache directory
+OUTPUT_BACKEND = "auto"  # Keystroke backend: auto, xtest (X11, batched), pynput
+ADAPTIVE_ENDPOINTING = True  # Learn the silence threshold from your pauses (SILENCE_THRESHOLD is the maximum)
+ENDPOINT_STATS = "endpointing.json"  # Learned pause lengths, inside the cache directory
+AUTOTUNE_PROFILE = "autotune.json"  # Written by whisper-typer-calibrate.py; overrides WHISPER_MODEL when present (None to disable)
+ADAPTIVE_REALTIME = True  # Space realtime passes by measured inference time and CPU load
+REALTIME_MODE = "full"   # tail: decode only the uncommitted end of long dictations (loads a second model copy)
+LONG_DICTATION = False   # Finalize long sessions segment by segment at pauses (loads a second model copy)
+SPILL_DIR = None         # With LONG_DICTATION, keep finalized audio as FLAC in this cache subdirectory (e.g. "dictations")
+LOG_LEVEL = "INFO"       # DEBUG also logs every realtime correction (the typing hot path)
+LOG_FORMAT = "text"      # json: one structured record per line (session, event, duration_ms)
+
+log = get_logger("tool")
+
 
 def main():
     """Main entry point with proper resource management"""
-    print("Loading Whisper model...")
+    if "--import-profile" in sys.argv[1:]:
+        # Report per-module import cost instead of recording
+        from import_profile import print_import_profile
+        print_import_profile(["app"])
+        sys.exit(0)
+    
+    start_time = time.perf_counter()
+    setup_logging(LOG_LEVEL, LOG_FORMAT)
+    log.info("Loading Whisper model...")
+    endpointer = AdaptiveEndpointer(cache_path(ENDPOINT_STATS), SILENCE_THRESHOLD) if ADAPTIVE_ENDPOINTING else None
     try:
-        with WhisperTyperApp(WHISPER_MODEL, SILENCE_THRESHOLD) as app:
-            app.record_once()
+        with WhisperTyperApp(WHISPER_MODEL, SILENCE_THRESHOLD, timeline_path=cache_path(TIMELINE_LOG),
+                             output=OUTPUT_BACKEND, endpointer=endpointer,
+                             autotune_path=cache_path(AUTOTUNE_PROFILE) if AUTOTUNE_PROFILE else None,
+                             adaptive_realtime=ADAPTIVE_REALTIME,
+                             realtime_mode=REALTIME_MODE, long_dictation=LONG_DICTATION,
+                             spill_dir=cache_path(SPILL_DIR) if SPILL_DIR else None) as app:
+            # In one-off mode the "hotkey" is the process start
+            app.record_once(start_time)
     except KeyboardInterrupt:
-        print("\n⚠️ Interrupted by user")
+        log.warning("\n⚠️ Interrupted by user")
     except Exception as e:
-        print(f"Fatal error: {e}")
+        log.error("Fatal error: %s", e)
         sys.exit(1)
     
-    print("✅ Exiting...")
+    log.info("✅ Exiting...")
     sys.exit(0)
 
 